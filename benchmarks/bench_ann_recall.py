@@ -0,0 +1,107 @@
+"""
+Benchmarks IVFVectorStore against the exact NumpyVectorStore.
+
+The data is a mixture of Gaussian clusters, which is closer to real
+embedding sets than uniform noise (on which any partitioning index needs to
+probe most lists to reach high recall). Reports build and train time, the
+size on disk and the time to open a saved index, then recall@10 and
+batched throughput for several `nprobe` values. Run with:
+
+    python benchmarks/bench_ann_recall.py [n] [dim]
+
+e.g. `python benchmarks/bench_ann_recall.py 200000 384`.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from yogurt.documents.base import Document
+from yogurt.vector_stores import IVFVectorStore, NumpyVectorStore
+
+K = 10
+QUERIES = 512
+CHUNK = 50_000
+
+
+def clustered_vectors(rng: np.random.Generator, n: int, dim: int, centers: np.ndarray) -> np.ndarray:
+    labels = rng.integers(len(centers), size=n)
+    noise = rng.standard_normal((n, dim), dtype=np.float32) * 1.0
+    return centers[labels] + noise
+
+
+def documents(offset: int, count: int) -> list[Document]:
+    return [
+        Document.model_construct(id=str(offset + i), content="", metadata={})
+        for i in range(count)
+    ]
+
+
+def throughput(search, queries: np.ndarray) -> tuple[list, float]:
+    start = time.perf_counter()
+    results = []
+    for batch in range(0, len(queries), 64):
+        results.extend(search(queries[batch : batch + 64]))
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def recall(found: list, expected: list) -> float:
+    hits = 0
+    for approximate, exact in zip(found, expected):
+        exact_ids = {r.document.id for r in exact}
+        hits += sum(r.document.id in exact_ids for r in approximate)
+    return hits / (K * len(expected))
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((2_000, dim), dtype=np.float32)
+
+    exact = NumpyVectorStore()
+    index = IVFVectorStore(min_train_size=n)
+    insert_seconds = 0.0
+    for offset in range(0, n, CHUNK):
+        count = min(CHUNK, n - offset)
+        vectors = clustered_vectors(rng, count, dim, centers)
+        batch = documents(offset, count)
+        exact.add_embeddings(batch, vectors)
+        start = time.perf_counter()
+        index.add_embeddings(batch, vectors)
+        insert_seconds += time.perf_counter() - start
+    print(f"{n:,} vectors x {dim} dims, {len(index._centroids)} lists")
+    print(f"  insert + train    {insert_seconds:10.2f} s")
+
+    queries = clustered_vectors(rng, QUERIES, dim, centers)
+    expected, qps = throughput(lambda q: exact.batch_search_by_vector(q, K), queries)
+    print(f"  exact             {qps:10,.0f} queries/s")
+    del exact
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index.save(directory)
+        save_seconds = time.perf_counter() - start
+        size = sum(p.stat().st_size for p in Path(directory).iterdir())
+        start = time.perf_counter()
+        loaded = IVFVectorStore.load(directory)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"  save              {save_seconds:10.2f} s ({size / 2**20:,.0f} MB)")
+        print(f"  load (mmap)       {load_ms:10.2f} ms")
+
+        # Fault the mapped vectors into memory before timing searches.
+        loaded.batch_search_by_vector(queries, K, nprobe=len(loaded._centroids))
+        print(f"\n  {'nprobe':>6}  {'recall@10':>9}  {'queries/s':>10}")
+        for nprobe in (1, 4, 8, 16, 32, 64):
+            found, qps = throughput(
+                lambda q: loaded.batch_search_by_vector(q, K, nprobe=nprobe), queries
+            )
+            print(f"  {nprobe:>6}  {recall(found, expected):>9.3f}  {qps:>10,.0f}")
+        del loaded
+
+
+if __name__ == "__main__":
+    main()
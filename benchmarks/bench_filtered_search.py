@@ -0,0 +1,68 @@
+"""
+Benchmarks metadata-filtered search on NumpyVectorStore and IVFVectorStore.
+
+Each document gets a `tenant` (1,000 values), a `lang` (10 values) and a
+numeric `year`. Filters of decreasing selectivity are timed against an
+unfiltered search, one query at a time. The first filtered search builds
+the metadata index; that cost is reported separately. Run with:
+
+    python benchmarks/bench_filtered_search.py [n] [dim]
+"""
+
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from yogurt.documents.base import Document
+from yogurt.vector_stores import IVFVectorStore, NumpyVectorStore
+
+K = 10
+FILTERS = {
+    "none": None,
+    "tenant (0.1%)": {"tenant": "t42"},
+    "lang (10%)": {"lang": "l3"},
+    "year range (60%)": {"year": {"$gte": 2010}},
+}
+
+
+def p50_ms(search, queries: np.ndarray) -> float:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    documents = [
+        Document.model_construct(
+            id=str(i),
+            content="",
+            metadata={"tenant": f"t{i % 1000}", "lang": f"l{i % 10}", "year": 2000 + i % 25},
+        )
+        for i in range(n)
+    ]
+    queries = rng.standard_normal((30, dim), dtype=np.float32)
+    print(f"{n:,} vectors x {dim} dims")
+
+    for store in (NumpyVectorStore(), IVFVectorStore(min_train_size=n)):
+        store.add_embeddings(documents, vectors)
+        start = time.perf_counter()
+        store.search_by_vector(queries[0], K, {"tenant": "t0"})
+        print(f"\n{type(store).__name__}")
+        print(f"  build metadata index  {time.perf_counter() - start:8.2f} s")
+        for name, filters in FILTERS.items():
+            latency = p50_ms(lambda q: store.search_by_vector(q, K, filters), queries)
+            print(f"  {name:<20}  {latency:8.2f} ms")
+        del store
+
+
+if __name__ == "__main__":
+    main()
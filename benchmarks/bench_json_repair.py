@@ -0,0 +1,187 @@
+"""
+Benchmarks parse_json_markdown on a corpus of truncated and malformed LLM
+outputs.
+
+Compares the previous implementation (regex clean-up passes, then retrying
+json.loads while popping one character at a time) with the single-pass
+tolerant reader used today. For each case the corpus records the value a
+repair should produce, so both speed and how often each parser recovers
+the intended value are reported. Run with:
+
+    python benchmarks/bench_json_repair.py [approx_size_chars]
+"""
+
+import json
+import random
+import re
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+from yogurt.utils.json_parsing import parse_json_markdown
+
+# --- The previous implementation, kept here for comparison ---
+
+
+def _legacy_replace_newline(match: re.Match) -> str:
+    value = match.group(2)
+    value = re.sub(r"\n", r"\\n", value)
+    value = re.sub(r"\r", r"\\r", value)
+    value = re.sub(r"\t", r"\\t", value)
+    value = re.sub(r'(?<!\\)"', r'\\"', value)
+    return match.group(1) + value + match.group(3)
+
+
+def _legacy_partial(s: str) -> Any:
+    try:
+        return json.loads(s, strict=False)
+    except json.JSONDecodeError:
+        pass
+    new_chars, stack = [], []
+    inside, escaped = False, False
+    for char in s:
+        new_char = char
+        if inside:
+            if char == '"' and not escaped:
+                inside = False
+            elif char == "\\":
+                escaped = not escaped
+            else:
+                escaped = False
+        elif char == '"':
+            inside, escaped = True, False
+        elif char == "{":
+            stack.append("}")
+        elif char == "[":
+            stack.append("]")
+        elif char in "}]":
+            if stack and stack[-1] == char:
+                stack.pop()
+            else:
+                return None
+        new_chars.append(new_char)
+    if inside:
+        if escaped:
+            new_chars.pop()
+        new_chars.append('"')
+    stack.reverse()
+    while new_chars:
+        try:
+            return json.loads("".join(new_chars + stack), strict=False)
+        except json.JSONDecodeError:
+            new_chars.pop()
+    return None
+
+
+def legacy_parse_json_markdown(text: str) -> Any:
+    match = re.search(r"```(json)?\s*\n(.*?)\n```", text, re.DOTALL)
+    json_str = match.group(2) if match else text
+    json_str = json_str.strip(" \n\r\t`")
+    json_str = re.sub(
+        r'("action_input"\:\s*")(.*?)(")', _legacy_replace_newline, json_str, flags=re.DOTALL
+    )
+    return _legacy_partial(json_str)
+
+
+# --- Corpus ---
+
+Case = Tuple[str, str, Any]
+"""(category, model output, value a repair should produce)"""
+
+
+def make_document(rng: random.Random, size: int) -> dict:
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+    conversation = []
+    while len(json.dumps(conversation)) < size:
+        content = " ".join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+        conversation.append({"role": rng.choice(["human", "ai"]), "content": content})
+    return {"conversation": conversation, "done": True}
+
+
+def make_corpus(size: int, seed: int = 0) -> List[Case]:
+    rng = random.Random(seed)
+    cases: List[Case] = []
+    for _ in range(20):
+        doc = make_document(rng, size)
+        text = json.dumps(doc, indent=2)
+        cases.append(("valid", text, doc))
+        cases.append(("fenced", f"Here you go:\n```json\n{text}\n```\nAnything else?", doc))
+        cases.append(("unclosed fence", f"```json\n{text}", doc))
+
+        # Cut off mid-stream, right after a complete message.
+        keep = rng.randint(1, len(doc["conversation"]))
+        prefix = json.dumps({"conversation": doc["conversation"][:keep]}, indent=2)
+        cut = prefix.rstrip("]}\n ")
+        cases.append(("truncated", cut, {"conversation": doc["conversation"][:keep]}))
+
+        # Cut off inside a string value.
+        last = doc["conversation"][keep - 1]
+        partial = last["content"][: len(last["content"]) // 2].rstrip()
+        body = json.dumps(
+            {"conversation": doc["conversation"][: keep - 1] + [dict(last, content=partial)]}
+        )
+        cases.append(
+            (
+                "truncated in string",
+                body[: body.rindex(partial) + len(partial)],
+                {"conversation": doc["conversation"][: keep - 1] + [dict(last, content=partial)]},
+            )
+        )
+
+        # Raw newlines and unescaped quotes inside string values.
+        noisy = {
+            "conversation": [
+                dict(m, content=m["content"].replace(" ", "\n", 2)) for m in doc["conversation"]
+            ]
+        }
+        raw = json.dumps(noisy).replace("\\n", "\n")
+        cases.append(("raw newlines", raw, noisy))
+        quoted = {
+            "conversation": [
+                dict(m, content=f'he said "{m["content"][:10]}" then') for m in doc["conversation"]
+            ]
+        }
+        raw = json.dumps(quoted).replace('\\"', '"')
+        cases.append(("unescaped quotes", raw, quoted))
+
+        trailing = json.dumps(doc).replace("}]", "},]")
+        cases.append(("trailing comma", trailing, doc))
+    return cases
+
+
+# --- Harness ---
+
+
+def run(parse: Callable[[str], Any], cases: List[Case]) -> Tuple[float, dict]:
+    recovered: dict = {}
+    start = time.process_time()
+    for category, text, expected in cases:
+        try:
+            ok = parse(text) == expected
+        except Exception:
+            ok = False
+        hits, total = recovered.get(category, (0, 0))
+        recovered[category] = (hits + ok, total + 1)
+    return time.process_time() - start, recovered
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    cases = make_corpus(size)
+    chars = sum(len(text) for _, text, _ in cases)
+    print(f"{len(cases)} cases, {chars:,} chars (~{size:,} chars per document)")
+    results = {}
+    for name, parse in (
+        ("previous", legacy_parse_json_markdown),
+        ("single-pass", parse_json_markdown),
+    ):
+        elapsed, recovered = run(parse, cases)
+        results[name] = elapsed
+        print(f"\n{name}: {elapsed * 1000:,.1f} ms CPU ({chars / elapsed / 1e6:,.2f} M chars/s)")
+        for category, (hits, total) in recovered.items():
+            print(f"  {category:22} recovered {hits:3}/{total}")
+    print(f"\nspeedup: {results['previous'] / results['single-pass']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmarks decoding an Ollama /api/chat NDJSON stream into StreamingChunks.
+
+Compares the previous per-line path (text decode -> iter_lines -> json.loads
+-> validated StreamingChunk) with the byte-level NDJSONDecoder path used by
+OllamaChat today. Both read from an in-memory httpx.Response, so only
+decoding cost is measured. Run with:
+
+    python benchmarks/bench_stream_decode.py [num_tokens]
+"""
+
+import json
+import random
+import sys
+import time
+
+import httpx
+
+from yogurt.llms.ollama import OllamaChat
+from yogurt.output.streaming import StreamingChunk
+from yogurt.utils import ndjson
+from yogurt.utils.ndjson import NDJSONDecoder
+
+
+def make_stream(num_tokens: int, read_size: int = 512) -> list[bytes]:
+    """Builds an NDJSON body split at arbitrary network-sized boundaries."""
+    rng = random.Random(0)
+    words = ["the", " quick", " brown", " fox", " jumps", " over", " lazy", " dog", "\n"]
+    lines = []
+    for _ in range(num_tokens):
+        lines.append(
+            json.dumps(
+                {
+                    "model": "llama3.2:3b",
+                    "created_at": "2025-01-01T00:00:00.000000Z",
+                    "message": {"role": "assistant", "content": rng.choice(words)},
+                    "done": False,
+                }
+            )
+        )
+    lines.append(json.dumps({"model": "llama3.2:3b", "done": True, "eval_count": num_tokens}))
+    body = ("\n".join(lines) + "\n").encode()
+    return [body[i : i + read_size] for i in range(0, len(body), read_size)]
+
+
+def old_path(parts: list[bytes]) -> int:
+    response = httpx.Response(200, content=iter(parts))
+    count = 0
+    for line in response.iter_lines():
+        if line:
+            chunk_data = json.loads(line)
+            message_chunk = chunk_data.get("message", {})
+            StreamingChunk(text=message_chunk.get("content", ""), metadata=chunk_data)
+            count += 1
+    return count
+
+
+def new_path(parts: list[bytes]) -> int:
+    response = httpx.Response(200, content=iter(parts))
+    decoder = NDJSONDecoder()
+    count = 0
+    for data in response.iter_bytes():
+        for value in decoder.feed(data):
+            OllamaChat._to_chunk(value)
+            count += 1
+    for value in decoder.flush():
+        OllamaChat._to_chunk(value)
+        count += 1
+    return count
+
+
+def bench(fn, parts: list[bytes], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        count = fn(parts)
+        best = min(best, time.process_time() - start)
+    return count / best
+
+
+def main() -> None:
+    num_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    parts = make_stream(num_tokens)
+    backend = "orjson" if ndjson.orjson is not None else "json (stdlib)"
+    print(f"{num_tokens} tokens, JSON backend: {backend}")
+    old = bench(old_path, parts)
+    new = bench(new_path, parts)
+    print(f"  {'iter_lines + json.loads + StreamingChunk:':42} {old:12,.0f} tokens/s/core")
+    print(f"  {'NDJSONDecoder + StreamingChunk.trusted:':42} {new:12,.0f} tokens/s/core")
+    print(f"  speedup: {new / old:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
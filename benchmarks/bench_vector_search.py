@@ -0,0 +1,92 @@
+"""
+Benchmarks NumpyVectorStore on random unit vectors at 100k and 1M rows.
+
+Reports the cost of appending the vectors (normalizing included, generating
+them excluded), single-query latency, batched throughput, and for
+comparison a per-query search that fully sorts every score with `argsort`.
+Vectors are added in chunks, so growth of the backing matrix is part of the
+insert time. Run with:
+
+    python benchmarks/bench_vector_search.py [dim] [sizes...]
+
+e.g. `python benchmarks/bench_vector_search.py 384 100000 1000000`.
+"""
+
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from yogurt.documents.base import Document
+from yogurt.vector_stores.numpy_store import NumpyVectorStore, normalize_rows
+
+K = 10
+CHUNK = 50_000
+
+
+def random_vectors(rng: np.random.Generator, n: int, dim: int) -> np.ndarray:
+    return rng.standard_normal((n, dim), dtype=np.float32)
+
+
+def build(n: int, dim: int, rng: np.random.Generator) -> tuple[NumpyVectorStore, float]:
+    store = NumpyVectorStore()
+    elapsed = 0.0
+    for offset in range(0, n, CHUNK):
+        count = min(CHUNK, n - offset)
+        documents = [
+            Document.model_construct(id=str(offset + i), content="", metadata={})
+            for i in range(count)
+        ]
+        vectors = random_vectors(rng, count, dim)
+        start = time.perf_counter()
+        store.add_embeddings(documents, vectors)
+        elapsed += time.perf_counter() - start
+    return store, elapsed
+
+
+def full_sort_search(vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+    scores = vectors @ query
+    return np.argsort(-scores)[:K]
+
+
+def main() -> None:
+    dim = int(sys.argv[1]) if len(sys.argv) > 1 else 384
+    sizes = [int(s) for s in sys.argv[2:]] or [100_000, 1_000_000]
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        store, insert_seconds = build(n, dim, rng)
+        queries = normalize_rows(random_vectors(rng, 256, dim))
+        print(f"\n{n:,} vectors x {dim} dims ({store.vectors.nbytes / 2**20:,.0f} MB)")
+        print(f"  insert            {n / insert_seconds:12,.0f} vectors/s")
+
+        latencies = []
+        for query in queries[:50]:
+            start = time.perf_counter()
+            store.search_by_vector(query, K)
+            latencies.append(time.perf_counter() - start)
+        print(f"  single query p50  {statistics.median(latencies) * 1000:12.2f} ms")
+
+        vectors = store.vectors
+        latencies = []
+        for query in queries[:20]:
+            start = time.perf_counter()
+            full_sort_search(vectors, query)
+            latencies.append(time.perf_counter() - start)
+        print(f"  full argsort p50  {statistics.median(latencies) * 1000:12.2f} ms")
+
+        for batch in (32, 256):
+            start = time.perf_counter()
+            store.batch_search_by_vector(queries[:batch], K)
+            elapsed = time.perf_counter() - start
+            print(f"  batch of {batch:<4}     {batch / elapsed:12,.0f} queries/s")
+
+        # Exact search must agree with the brute-force ranking.
+        expected = full_sort_search(vectors, queries[0]).tolist()
+        found = [int(r.document.id) for r in store.search_by_vector(queries[0], K)]
+        assert found == expected, (found, expected)
+        del store, vectors
+
+
+if __name__ == "__main__":
+    main()
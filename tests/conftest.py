@@ -0,0 +1,147 @@
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+
+class StubOllama:
+    """
+    A fake Ollama host behind an `httpx.MockTransport`. It answers
+    `/api/ps`, `/api/generate` and `/api/embed`, records every request, and
+    fails every request with `status` when that is set. A generate request
+    loads its model.
+    """
+
+    def __init__(self, url: str, models: Optional[List[Any]] = None):
+        self.url = url
+        self.models: List[Any] = list(models or [])
+        self.status: Optional[int] = None
+        self.requests: List[httpx.Request] = []
+
+    @property
+    def generates(self) -> int:
+        return sum(request.url.path == "/api/generate" for request in self.requests)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.status is not None:
+            return httpx.Response(self.status, json={"error": "stub failure"})
+        if request.url.path == "/api/ps":
+            return httpx.Response(
+                200,
+                json={"models": [{"name": m} if isinstance(m, str) else m for m in self.models]},
+            )
+        body: Dict[str, Any] = json.loads(request.content)
+        if request.url.path == "/api/embed":
+            return httpx.Response(
+                200,
+                json={
+                    "model": body["model"],
+                    "embeddings": [
+                        [float(len(text)), 1.0, float(text.count("a"))]
+                        for text in body["input"]
+                    ],
+                },
+            )
+        if request.url.path == "/api/generate":
+            if body["model"] not in self.models:
+                self.models.append(body["model"])
+            return httpx.Response(
+                200,
+                json={
+                    "model": body["model"],
+                    "response": f"from {self.url}",
+                    "done": True,
+                    "load_duration": 2_000_000,
+                },
+            )
+        return httpx.Response(404, json={"error": "not found"})
+
+
+class StubNetwork:
+    """Routes requests to the `StubOllama` registered for their host."""
+
+    def __init__(self) -> None:
+        self.hosts: Dict[str, StubOllama] = {}
+
+    def add(self, url: str, models: Optional[List[Any]] = None) -> StubOllama:
+        host = StubOllama(url, models)
+        self.hosts[url] = host
+        return host
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        host = self.hosts.get(f"{request.url.scheme}://{request.url.netloc.decode()}")
+        if host is None:
+            raise httpx.ConnectError("connection refused", request=request)
+        return host.handle(request)
+
+
+@pytest.fixture
+def stub_network(monkeypatch: pytest.MonkeyPatch) -> StubNetwork:
+    """Sends every httpx client created during the test to stub hosts."""
+    network = StubNetwork()
+    transport = httpx.MockTransport(network.handle)
+
+    class Client(httpx.Client):
+        def __init__(self, *args: Any, **kwargs: Any):
+            kwargs["transport"] = transport
+            super().__init__(*args, **kwargs)
+
+    class AsyncClient(httpx.AsyncClient):
+        def __init__(self, *args: Any, **kwargs: Any):
+            kwargs["transport"] = transport
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "Client", Client)
+    monkeypatch.setattr(httpx, "AsyncClient", AsyncClient)
+    return network
+
+
+VECTOR_COUNT, VECTOR_DIM = 3000, 16
+
+
+def vector_metadata(i: int) -> Dict[str, Any]:
+    return {
+        "tenant": f"t{i % 50}",
+        "year": 2000 + i % 30,
+        "tags": ["a" if i % 2 else "b", "c"],
+        "flag": i % 3 == 0,
+        "nested": {"x": 1},
+    }
+
+
+@pytest.fixture(scope="session")
+def vector_data():
+    """Random vectors, matching documents with metadata, and query vectors."""
+    np = pytest.importorskip("numpy")
+    from yogurt.documents.base import Document
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((VECTOR_COUNT, VECTOR_DIM), dtype=np.float32)
+    documents = [
+        Document(id=str(i), content=f"doc {i}", metadata=vector_metadata(i))
+        for i in range(VECTOR_COUNT)
+    ]
+    queries = rng.standard_normal((5, VECTOR_DIM), dtype=np.float32)
+    return vectors, documents, queries
+
+
+@pytest.fixture(scope="session")
+def brute_force():
+    """
+    Exact cosine top-k over `documents`, skipping None entries and those
+    whose metadata `keep` rejects. Returns the ids and the scores.
+    """
+    np = pytest.importorskip("numpy")
+
+    def search(vectors, documents, query, k, keep=lambda metadata: True):
+        rows = [i for i, doc in enumerate(documents) if doc is not None and keep(doc.metadata)]
+        if not rows:
+            return [], []
+        matrix = vectors[rows] / np.linalg.norm(vectors[rows], axis=1, keepdims=True)
+        scores = matrix @ (query / np.linalg.norm(query))
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [documents[rows[j]].id for j in order], scores[order].tolist()
+
+    return search
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, List
+
+from pydantic import Field, PrivateAttr
+
+from yogurt.llms.base import BaseLLM
+from yogurt.output.base import Generation, LLMResult
+from yogurt.output.streaming import StreamingChunk
+from yogurt.prompts.prompt_value import PromptValue
+
+
+class FakeLLM(BaseLLM):
+    """
+    An LLM that answers "echo: <prompt>" after `delay` seconds, and streams
+    the answer as `chunks`. Prompts starting with "fail" raise RuntimeError.
+    Counts calls and tracks the peak number of calls in flight.
+    """
+
+    model_name: str = "fake"
+    delay: float = 0.0
+    chunks: List[str] = Field(default_factory=lambda: ["hel", "lo"])
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _active: int = PrivateAttr(default=0)
+    _peak: int = PrivateAttr(default=0)
+    _prompts: List[str] = PrivateAttr(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def peak(self) -> int:
+        return self._peak
+
+    @property
+    def prompts(self) -> List[str]:
+        return self._prompts
+
+    def _enter(self, prompt: PromptValue) -> None:
+        with self._lock:
+            self._calls += 1
+            self._active += 1
+            self._peak = max(self._peak, self._active)
+            self._prompts.append(prompt.text)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    @staticmethod
+    def _answer(prompt: PromptValue) -> LLMResult:
+        if prompt.text.startswith("fail"):
+            raise RuntimeError(f"failed: {prompt.text}")
+        return LLMResult(generations=[Generation(text=f"echo: {prompt.text}")])
+
+    def _generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        self._enter(prompt)
+        try:
+            time.sleep(self.delay)
+            return self._answer(prompt)
+        finally:
+            self._leave()
+
+    async def _agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        self._enter(prompt)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._answer(prompt)
+        finally:
+            self._leave()
+
+    def stream(self, prompt: PromptValue, **kwargs: Any) -> Iterator[StreamingChunk]:
+        self._enter(prompt)
+        try:
+            for text in self.chunks:
+                time.sleep(self.delay)
+                yield StreamingChunk(text=text)
+        finally:
+            self._leave()
+
+    async def _astream(
+        self, prompt: PromptValue, **kwargs: Any
+    ) -> AsyncIterator[StreamingChunk]:
+        self._enter(prompt)
+        try:
+            for text in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield StreamingChunk(text=text)
+        finally:
+            self._leave()
+
+
+def prompt(text: str) -> PromptValue:
+    return PromptValue(text=text)
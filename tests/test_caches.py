@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+
+from yogurt.caches import InMemoryCache, SQLiteCache, TieredCache
+from yogurt.output.base import Generation, LLMResult
+
+from fakes import FakeLLM, prompt
+
+
+def result(text: str) -> LLMResult:
+    return LLMResult(generations=[Generation(text=text)])
+
+
+def text(cached) -> str:
+    return cached.generations[0].text if cached is not None else None
+
+
+@pytest.fixture
+def disk(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.db", ttl_seconds=0)
+    yield cache
+    cache.close()
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(maxsize=2, ttl_seconds=0)
+    cache.set("a", result("a"))
+    cache.set("b", result("b"))
+    cache.get("a")
+    cache.set("c", result("c"))
+    assert [text(cache.get(k)) for k in "abc"] == ["a", None, "c"]
+
+
+def test_memory_cache_expires_entries_and_hands_out_copies():
+    cache = InMemoryCache(ttl_seconds=0.05)
+    cache.set("a", result("a"))
+    cache.get("a").generations[0].text = "changed"
+    assert text(cache.get("a")) == "a"
+    time.sleep(0.08)
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_memory_cache_expires_in_caps_the_ttl():
+    cache = InMemoryCache(ttl_seconds=60)
+    cache.set("a", result("a"), expires_in=0.05)
+    cache.set("b", result("b"), expires_in=-1)
+    assert text(cache.get("a")) == "a" and cache.get("b") is None
+    time.sleep(0.08)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_across_connections(tmp_path):
+    first = SQLiteCache(tmp_path / "cache.db", ttl_seconds=0)
+    first.set("a", result("a"))
+    first.close()
+    second = SQLiteCache(tmp_path / "cache.db", ttl_seconds=0)
+    assert text(second.get("a")) == "a" and len(second) == 1
+    second.close()
+
+
+def test_sqlite_cache_expires_entries(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.db", ttl_seconds=0.05)
+    cache.set("a", result("a"))
+    _, expires_at = cache.get_with_expiry("a")
+    assert expires_at == pytest.approx(time.time() + 0.05, abs=0.05)
+    time.sleep(0.08)
+    assert cache.get("a") is None and len(cache) == 0
+    cache.close()
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.db", max_entries=2, ttl_seconds=0)
+    cache.set("a", result("a"))
+    time.sleep(0.01)
+    cache.set("b", result("b"))
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", result("c"))
+    assert [text(cache.get(k)) for k in "abc"] == ["a", None, "c"]
+    cache.close()
+
+
+def test_sqlite_cache_overwrites_do_not_grow_the_count(disk):
+    for i in range(5):
+        disk.set("a", result(str(i)))
+    assert len(disk) == 1 and text(disk.get("a")) == "4"
+    disk.set("b", result("b"))
+    assert len(disk) == 2
+    disk.clear()
+    assert len(disk) == 0
+
+
+def test_tiered_cache_promotes_disk_hits(disk):
+    cache = TieredCache(InMemoryCache(ttl_seconds=0), disk)
+    cache.set("a", result("a"))
+    cache.memory.clear()
+    assert text(cache.get("a")) == "a"
+    disk.clear()
+    assert text(cache.get("a")) == "a"
+
+
+def test_promotion_keeps_the_remaining_disk_ttl(tmp_path):
+    disk = SQLiteCache(tmp_path / "cache.db", ttl_seconds=0.15)
+    cache = TieredCache(InMemoryCache(ttl_seconds=60), disk)
+    cache.set("a", result("a"))
+    cache.memory.clear()
+    time.sleep(0.1)
+
+    assert text(cache.get("a")) == "a"
+    time.sleep(0.08)
+    assert cache.memory.get("a") is None and cache.get("a") is None
+    disk.close()
+
+
+def test_llm_calls_go_through_the_cache(disk):
+    llm = FakeLLM(cache=TieredCache(InMemoryCache(ttl_seconds=0), disk))
+    assert text(llm.generate(prompt("a"))) == "echo: a"
+    assert text(llm.generate(prompt("a"))) == "echo: a"
+    assert text(asyncio.run(llm.agenerate(prompt("a")))) == "echo: a"
+    assert llm.calls == 1
+    llm.generate(prompt("a"), stop=["x"])
+    assert llm.calls == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from yogurt.memory.conversational.convo_memory import ConversationMemory
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def fill(memory: ConversationMemory, count: int) -> None:
+    for i in range(count):
+        memory.save_context({"input": f"question {i}"}, {"output": f"answer {i} ok"})
+
+
+def contents(messages) -> list:
+    return [message.content for message in messages]
+
+
+def test_window_keeps_the_newest_turns():
+    memory = ConversationMemory(window=3, token_counter=words)
+    fill(memory, 5)
+    assert len(memory) == 3
+    assert contents(memory.chat_history)[::2] == ["question 2", "question 3", "question 4"]
+    assert memory.tokens == 3 * (2 + 3)
+    assert [m.role for m in memory.chat_history[:2]] == ["human", "ai"]
+
+
+def test_zero_window_keeps_everything_and_negative_is_rejected():
+    memory = ConversationMemory(window=0)
+    fill(memory, 50)
+    assert len(memory) == 50
+    with pytest.raises(ValueError):
+        ConversationMemory(window=-1)
+
+
+def test_max_tokens_returns_the_newest_turns_that_fit():
+    memory = ConversationMemory(window=10, max_tokens=11, token_counter=words)
+    fill(memory, 4)
+    assert contents(memory.load_memory_variables()["conversation_memory"]) == [
+        "question 2",
+        "answer 2 ok",
+        "question 3",
+        "answer 3 ok",
+    ]
+    assert len(memory.messages(max_tokens=4)) == 0
+    assert len(memory.messages(max_tokens=100)) == 8
+
+
+def test_tokens_are_counted_once_per_message():
+    calls = []
+
+    def counter(text: str) -> int:
+        calls.append(text)
+        return 1
+
+    memory = ConversationMemory(window=2, max_tokens=3, token_counter=counter)
+    fill(memory, 100)
+    memory.messages()
+    assert len(calls) == 200
+    assert memory.tokens == 4
+
+
+def test_evicted_turns_reach_the_hook_in_order():
+    evicted = []
+
+    class Recording(ConversationMemory):
+        def _on_evict(self, turn):
+            evicted.append(turn.input.content)
+
+    memory = Recording(window=2)
+    fill(memory, 4)
+    assert evicted == ["question 0", "question 1"]
+    memory.clear()
+    assert (len(memory), memory.tokens, memory.chat_history) == (0, 0, [])
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yogurt.embeddings import EmbeddingCache  # noqa: E402
+from yogurt.embeddings.cache import content_hash  # noqa: E402
+from yogurt.llms.ollama import OllamaEmbedder  # noqa: E402
+
+HOST = "http://ollama-embed:11434"
+
+
+def expected(text: str) -> list:
+    """The vector the stub host returns for `text`."""
+    return [float(len(text)), 1.0, float(text.count("a"))]
+
+
+def embedded_texts(host) -> list:
+    return [text for r in host.requests for text in json.loads(r.content)["input"]]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    yield cache
+    cache.close()
+
+
+def test_cache_round_trip_is_keyed_by_model(cache):
+    key = content_hash("hello")
+    cache.set_many("m1", [(key, np.array([1.0, 2.0]))])
+
+    found = cache.get_many("m1", [key, content_hash("other"), key])
+    assert list(found) == [key]
+    assert found[key].dtype == np.float32 and found[key].tolist() == [1.0, 2.0]
+    assert cache.get_many("m2", [key]) == {}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.clear("m2")
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_persists_across_connections(tmp_path):
+    path = tmp_path / "embeddings.db"
+    first = EmbeddingCache(path)
+    first.set_many("m", [(content_hash("a"), np.ones(3))])
+    first.close()
+
+    second = EmbeddingCache(path)
+    assert second.get_many("m", [content_hash("a")])[content_hash("a")].tolist() == [1.0] * 3
+    second.close()
+
+
+def test_embedder_batches_dedupes_and_caches(stub_network, cache):
+    host = stub_network.add(HOST)
+    texts = [f"text {i} " + "a" * (i % 4) for i in range(50)] + ["text 1 a"] * 5
+
+    with OllamaEmbedder(model="m", host=HOST, cache=cache, batch_size=8) as embedder:
+        vectors = embedder.embed_documents(texts)
+        assert vectors.dtype == np.float32 and vectors.shape == (55, 3)
+        assert vectors.tolist() == [expected(text) for text in texts]
+        assert len(host.requests) == 7
+        assert sorted(embedded_texts(host)) == sorted(set(texts))
+
+        host.requests.clear()
+        again = embedder.embed_documents(texts + ["new"])
+        assert np.array_equal(again[:-1], vectors)
+        assert embedded_texts(host) == ["new"]
+
+        assert embedder.embed_query("abc").tolist() == expected("abc")
+        assert embedder.embed_documents([]).shape == (0, 0)
+
+
+def test_async_embedder_reuses_the_cache_of_the_sync_one(stub_network, cache):
+    host = stub_network.add(HOST)
+    texts = [f"doc {i}" for i in range(20)]
+    with OllamaEmbedder(model="m", host=HOST, cache=cache, batch_size=4) as embedder:
+        embedder.embed_documents(texts[:10])
+
+    async def run() -> "np.ndarray":
+        async with OllamaEmbedder(
+            model="m", host=HOST, cache=cache, batch_size=4, max_concurrency=2
+        ) as embedder:
+            return await embedder.aembed_documents(texts)
+
+    host.requests.clear()
+    vectors = asyncio.run(run())
+    assert vectors.tolist() == [expected(text) for text in texts]
+    assert sorted(embedded_texts(host)) == sorted(texts[10:])
+
+
+def test_embedder_rejects_a_short_response(stub_network, monkeypatch):
+    host = stub_network.add(HOST)
+    handle = host.handle
+
+    def drop_last(request):
+        response = handle(request)
+        body = response.json()
+        body["embeddings"] = body["embeddings"][:-1]
+        return httpx.Response(200, json=body)
+
+    monkeypatch.setattr(host, "handle", drop_last)
+    with OllamaEmbedder(model="m", host=HOST) as embedder:
+        with pytest.raises(ValueError, match="Expected 2 embeddings"):
+            embedder.embed_documents(["a", "b"])
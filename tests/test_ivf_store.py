@@ -0,0 +1,153 @@
+import os
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yogurt.documents.base import Document  # noqa: E402
+from yogurt.vector_stores import IVFVectorStore  # noqa: E402
+
+K = 10
+
+
+def ids(results) -> list:
+    return [r.document.id for r in results]
+
+
+@pytest.fixture
+def store(vector_data):
+    vectors, documents, _ = vector_data
+    store = IVFVectorStore(min_train_size=1000)
+    store.add_embeddings(documents, vectors)
+    return store
+
+
+def test_probing_every_list_is_exact(store, vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    assert store.is_trained and len(store) == len(documents)
+    for query, results in zip(queries, store.batch_search_by_vector(queries, K, nprobe=10**6)):
+        expected_ids, expected_scores = brute_force(vectors, documents, query, K)
+        assert ids(results) == expected_ids
+        assert [r.score for r in results] == pytest.approx(expected_scores, abs=1e-5)
+
+
+def test_probing_few_lists_keeps_most_neighbors(store, vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    recall = []
+    for query in queries:
+        expected, _ = brute_force(vectors, documents, query, K)
+        recall.append(len(set(ids(store.search_by_vector(query, K))) & set(expected)) / K)
+    assert np.mean(recall) >= 0.5
+
+
+def test_untrained_store_searches_exactly(vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    store = IVFVectorStore(min_train_size=10**6)
+    store.add_embeddings(documents[:500], vectors[:500])
+    assert not store.is_trained
+    assert ids(store.search_by_vector(queries[0], K)) == brute_force(
+        vectors, documents[:500], queries[0], K
+    )[0]
+
+
+def test_deletes_and_replacements_before_and_after_merge(store, vector_data):
+    vectors, _, _ = vector_data
+    assert store.delete(["5", "6", "unknown"]) == 2
+    store.add_embeddings([Document(id="7", content="new")], vectors[:1])
+    assert store.get("5") is None and store.get("7").content == "new"
+    assert len(store) == len(vectors) - 2
+    for _ in range(2):
+        found = ids(store.search_by_vector(vectors[5], 5, nprobe=10**6))
+        assert "5" not in found and "6" not in found
+        assert store.search_by_vector(vectors[0], 1, nprobe=10**6)[0].document.id in {"0", "7"}
+        store.merge()
+
+
+def test_save_and_load_round_trip(tmp_path, store, vector_data):
+    vectors, documents, queries = vector_data
+    store.delete(["5"])
+    store.add_embeddings([Document(id="new", content="new")], vectors[:1])
+    store.save(tmp_path)
+
+    loaded = IVFVectorStore.load(tmp_path)
+    assert len(loaded) == len(documents)
+    assert loaded.get("5") is None and loaded.get("new").content == "new"
+    assert loaded.get("100").metadata == documents[100].metadata
+    assert [ids(r) for r in loaded.batch_search_by_vector(queries, K)] == [
+        ids(r) for r in store.batch_search_by_vector(queries, K)
+    ]
+
+
+def test_loaded_store_keeps_its_ids_after_another_save(tmp_path, store, vector_data):
+    _, _, queries = vector_data
+    store.save(tmp_path)
+    reader = IVFVectorStore.load(tmp_path)
+
+    store.delete([str(i) for i in range(100)])
+    store.merge()
+    store.save(tmp_path)
+
+    assert reader.get("0").content == "doc 0"
+    assert len(reader.search_by_vector(queries[0], K)) == K
+
+
+def test_empty_and_small_stores_save_and_load(tmp_path):
+    empty = IVFVectorStore()
+    assert empty.search_by_vector([1.0, 0.0], 3) == []
+    empty.save(tmp_path / "empty")
+    assert len(IVFVectorStore.load(tmp_path / "empty")) == 0
+
+    small = IVFVectorStore()
+    small.add_embeddings([Document(id="a", content="a")], [[1.0, 0.0]])
+    small.save(tmp_path / "small")
+    assert ids(IVFVectorStore.load(tmp_path / "small").search_by_vector([1.0, 0.0], 3)) == ["a"]
+
+
+def test_saves_publish_whole_versions(tmp_path, vector_data):
+    vectors, documents, _ = vector_data
+    small = IVFVectorStore(min_train_size=100)
+    small.add_embeddings(documents[:200], vectors[:200])
+    large = IVFVectorStore(min_train_size=100)
+    large.add_embeddings(documents[:1000], vectors[:1000])
+    small.save(tmp_path)
+    first = IVFVectorStore.load(tmp_path)
+
+    stop = threading.Event()
+
+    def save_repeatedly():
+        while not stop.is_set():
+            large.save(tmp_path)
+            small.save(tmp_path)
+
+    saver = threading.Thread(target=save_repeatedly)
+    saver.start()
+    try:
+        for _ in range(50):
+            loaded = IVFVectorStore.load(tmp_path)
+            assert len(loaded) in (200, 1000)
+            assert len(loaded._main) == len(loaded._main_docs.ids()) == len(loaded)
+    finally:
+        stop.set()
+        saver.join()
+
+    versions = [p.name for p in tmp_path.iterdir() if p.is_dir()]
+    assert len(versions) == 2 and sorted(os.listdir(tmp_path)) == sorted(
+        versions + ["current.json"]
+    )
+    assert first.get("0").content == "doc 0" and len(first) == 200
+
+
+def test_unversioned_indexes_load_and_are_upgraded(tmp_path, store):
+    store.save(tmp_path)
+    (version,) = [p for p in tmp_path.iterdir() if p.is_dir()]
+    for file in version.iterdir():
+        file.rename(tmp_path / file.name)
+    version.rmdir()
+    (tmp_path / "current.json").unlink()
+
+    loaded = IVFVectorStore.load(tmp_path)
+    assert len(loaded) == len(store)
+    loaded.save(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_file()) == ["current.json"]
+    assert len(IVFVectorStore.load(tmp_path)) == len(store)
@@ -0,0 +1,78 @@
+import json
+import random
+
+import pytest
+
+from yogurt.utils.json_stream import JsonStreamReader
+
+DOC = {
+    "conversation": [
+        {"role": "human", "content": 'hi "there"\né \U0001f600 \\ / tab\t'},
+        {"role": "ai", "content": "x" * 50},
+    ],
+    "numbers": [1, -2.5e3, True, False, None, {}, []],
+    "nested": {"a": {"b": [[1], [2, {"c": "d"}]]}},
+}
+
+
+def feed_in_pieces(reader: JsonStreamReader, text: str, rng: random.Random) -> list:
+    events, i = [], 0
+    while i < len(text):
+        size = rng.randint(1, 7)
+        events += reader.feed(text[i : i + size])
+        i += size
+    return events
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_random_splits_match_json_loads(ensure_ascii):
+    text = "```json\n" + json.dumps(DOC, indent=2, ensure_ascii=ensure_ascii) + "\n```"
+    rng = random.Random(0)
+    for _ in range(100):
+        reader = JsonStreamReader(
+            watch=[("conversation", "*")], deltas=[("conversation", "*", "content")]
+        )
+        events = feed_in_pieces(reader, text, rng)
+
+        assert reader.done and reader.value == DOC
+        assert [e.value for e in events if e.kind == "value"] == DOC["conversation"]
+        deltas = "".join(
+            e.value for e in events if e.kind == "delta" and e.path == ("conversation", 0, "content")
+        )
+        assert deltas == DOC["conversation"][0]["content"]
+
+
+def test_surrogate_pair_split_at_every_point():
+    text = json.dumps({"s": "a\U0001f600b"})
+    assert "\\ud83d\\ude00" in text
+    for cut in range(len(text) + 1):
+        reader = JsonStreamReader(deltas=[("s",)])
+        events = reader.feed(text[:cut]) + reader.feed(text[cut:])
+        assert reader.value == {"s": "a\U0001f600b"}
+        assert "".join(e.value for e in events if e.kind == "delta") == "a\U0001f600b"
+
+
+def test_lone_surrogates_become_replacement_characters():
+    reader = JsonStreamReader()
+    reader.feed('{"s": "\\ud83dx", "t": "\\ude00", "u": "\\ud83d"}')
+    assert reader.value == {"s": "�x", "t": "�", "u": "�"}
+
+
+def test_finish_closes_truncated_input():
+    reader = JsonStreamReader()
+    reader.feed('{"a": [1, 2, {"b": "unterm')
+    assert reader.finish() == {"a": [1, 2, {"b": "unterm"}]}
+
+
+def test_every_truncation_finishes_without_error():
+    text = json.dumps(DOC)
+    for cut in range(len(text)):
+        reader = JsonStreamReader()
+        reader.feed(text[:cut])
+        reader.finish()
+
+
+def test_repair_quotes_keeps_inner_quotes():
+    reader = JsonStreamReader(repair_quotes=True)
+    reader.feed('{"a": "say "hi" now", "b": 1}')
+    assert reader.finish() == {"a": 'say "hi" now', "b": 1}
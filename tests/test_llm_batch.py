@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from yogurt.config.config import YogurtSettings, get_settings, set_settings
+from yogurt.llms.ollama import OllamaLLM
+from yogurt.utils.concurrency import bounded_as_completed, bounded_gather
+
+from fakes import FakeLLM, prompt
+
+
+def texts(results) -> list:
+    return [r.generations[0].text if not isinstance(r, Exception) else "error" for r in results]
+
+
+def test_batch_keeps_input_order_and_bounds_threads():
+    llm = FakeLLM(delay=0.02)
+    results = llm.batch([prompt(str(i)) for i in range(12)], max_concurrency=3)
+    assert texts(results) == [f"echo: {i}" for i in range(12)]
+    assert llm.peak == 3
+
+
+def test_batch_returns_exceptions_in_place_by_default():
+    llm = FakeLLM()
+    results = llm.batch([prompt("a"), prompt("fail"), prompt("b")])
+    assert texts(results) == ["echo: a", "error", "echo: b"]
+    assert isinstance(results[1], RuntimeError)
+    with pytest.raises(RuntimeError):
+        llm.batch([prompt("a"), prompt("fail")], return_exceptions=False)
+
+
+def test_abatch_bounds_requests_in_flight():
+    llm = FakeLLM(delay=0.01)
+    results = asyncio.run(llm.abatch([prompt(str(i)) for i in range(20)], max_concurrency=4))
+    assert texts(results) == [f"echo: {i}" for i in range(20)]
+    assert llm.peak == 4
+
+
+def test_abatch_accepts_async_iterables():
+    async def prompts():
+        for i in range(5):
+            yield prompt(str(i))
+
+    results = asyncio.run(FakeLLM().abatch(prompts(), max_concurrency=2))
+    assert texts(results) == [f"echo: {i}" for i in range(5)]
+
+
+def test_abatch_as_completed_yields_fast_results_first():
+    llm = FakeLLM()
+
+    async def slow_first(p):
+        await asyncio.sleep(0.05 if p.text == "slow" else 0)
+        return await llm.agenerate(p)
+
+    async def run():
+        return [
+            index
+            async for index, _ in bounded_as_completed(
+                slow_first, [prompt("slow"), prompt("a"), prompt("b")], 3
+            )
+        ]
+
+    order = asyncio.run(run())
+    assert order[-1] == 0 and sorted(order) == [0, 1, 2]
+
+    async def collect():
+        return [
+            (index, texts([result])[0])
+            async for index, result in llm.abatch_as_completed([prompt("x"), prompt("fail")])
+        ]
+
+    assert sorted(asyncio.run(collect())) == [(0, "echo: x"), (1, "error")]
+
+
+def test_inputs_are_pulled_lazily():
+    pulled = []
+
+    def items():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    async def run():
+        stream = bounded_as_completed(asyncio.sleep, items(), 4)
+        await anext(stream)
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert len(pulled) <= 5
+
+
+def test_closing_early_cancels_calls_in_flight():
+    cancelled = []
+
+    async def work(i):
+        try:
+            await asyncio.sleep(0 if i == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return i
+
+    async def run():
+        stream = bounded_as_completed(work, range(4), 4)
+        assert await anext(stream) == (0, 0)
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert sorted(cancelled) == [1, 2, 3]
+
+
+def test_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        asyncio.run(bounded_gather(asyncio.sleep, [0], 0))
+
+
+def test_batch_concurrency_resolution():
+    previous = get_settings()
+    set_settings(YogurtSettings(max_concurrent_requests=7))
+    try:
+        assert FakeLLM().batch_concurrency() == 7
+        assert FakeLLM(max_concurrency=3).batch_concurrency() == 3
+        assert FakeLLM(max_concurrency=3).batch_concurrency(5) == 5
+        assert OllamaLLM(max_connections=2).batch_concurrency(50) == 2
+    finally:
+        set_settings(previous)
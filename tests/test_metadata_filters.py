@@ -0,0 +1,99 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yogurt.documents.base import Document  # noqa: E402
+from yogurt.vector_stores import IVFVectorStore, MetadataIndex, NumpyVectorStore  # noqa: E402
+
+K = 10
+
+FILTERS = [
+    ({"tenant": "t7"}, lambda m: m["tenant"] == "t7"),
+    (
+        {"tenant": {"$in": ["t1", "t2"]}, "year": {"$gte": 2010, "$lt": 2015}},
+        lambda m: m["tenant"] in ("t1", "t2") and 2010 <= m["year"] < 2015,
+    ),
+    ({"tags": "a"}, lambda m: "a" in m["tags"]),
+    ({"tenant": {"$ne": "t3"}}, lambda m: m["tenant"] != "t3"),
+    ({"flag": True}, lambda m: m["flag"] is True),
+    ({"flag": 1}, lambda m: False),
+    ({"year": {"$gt": 2028}}, lambda m: m["year"] > 2028),
+    ({"missing": 5}, lambda m: False),
+]
+
+
+def ids(results) -> list:
+    return [r.document.id for r in results]
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [NumpyVectorStore, lambda: IVFVectorStore(min_train_size=1000, nprobe=10**6)],
+    ids=["numpy", "ivf"],
+)
+def test_filtered_search_matches_brute_force(make_store, vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    documents = list(documents)
+    store = make_store()
+    store.add_embeddings(documents, vectors)
+
+    def check():
+        for filters, keep in FILTERS:
+            for query in queries[:2]:
+                expected, _ = brute_force(vectors, documents, query, K, keep)
+                assert ids(store.search_by_vector(query, K, filters)) == expected, filters
+
+    check()
+    deleted = [str(i) for i in range(0, len(documents), 7)]
+    assert store.delete(deleted + ["unknown"]) == len(deleted)
+    for i in range(0, len(documents), 7):
+        documents[i] = None
+    check()
+
+    documents[1] = Document(
+        id="1", content="", metadata={"tenant": "t7", "year": 1990, "tags": [], "flag": False}
+    )
+    store.add_embeddings([documents[1]], vectors[1:2])
+    check()
+
+
+def test_untrained_ivf_store_answers_filtered_searches(vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    store = IVFVectorStore(min_train_size=10**6)
+    store.add_embeddings(documents[:500], vectors[:500])
+    assert not store.is_trained
+
+    filters, keep = FILTERS[0]
+    expected, _ = brute_force(vectors, documents[:500], queries[0], K, keep)
+    assert ids(store.search_by_vector(queries[0], K, filters)) == expected
+
+
+def test_metadata_index_masks():
+    index = MetadataIndex()
+    index.add(0, {"a": 1, "tags": ["x", "y"]})
+    index.add(1, {"a": 2.5, "tags": ["y"]})
+    index.add(2, {"a": "text"})
+    assert index.match({"tags": "y"}, 3).tolist() == [True, True, False]
+    assert index.match({"a": {"$gte": 1, "$lt": 2}}, 3).tolist() == [True, False, False]
+    assert index.match({"a": {"$in": ["text", 2.5]}}, 3).tolist() == [False, True, True]
+    index.remove(0)
+    assert index.match({"tags": "x"}, 3).tolist() == [False, False, False]
+
+
+def test_metadata_index_rejects_unknown_operators_and_fields():
+    with pytest.raises(ValueError):
+        MetadataIndex().match({"a": {"$foo": 1}}, 3)
+    with pytest.raises(ValueError):
+        MetadataIndex(["a"]).match({"b": 1}, 3)
+
+
+def test_broad_filters_still_return_k_results(vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    store = IVFVectorStore(min_train_size=1000, nprobe=1)
+    store.add_embeddings(documents, vectors)
+    # 60 matches, more than one list holds, but only about one per list.
+    filters, keep = FILTERS[0]
+    results = store.batch_search_by_vector(queries, K, filters)
+    for query, found in zip(queries, results):
+        expected, _ = brute_force(vectors, documents, query, K, keep)
+        assert ids(found) == expected
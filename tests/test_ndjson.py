@@ -0,0 +1,38 @@
+import json
+import random
+
+from yogurt.output.streaming import StreamingChunk
+from yogurt.utils.ndjson import NDJSONDecoder
+
+LINES = [
+    {"response": "hé", "done": False},
+    {"response": "\U0001f600 \"quoted\"\n", "done": False},
+    {"response": "", "done": True, "eval_count": 3},
+]
+
+
+def test_random_splits_decode_every_line():
+    data = b"".join(json.dumps(line, ensure_ascii=False).encode() + b"\n" for line in LINES)
+    rng = random.Random(0)
+    for _ in range(50):
+        decoder, values, i = NDJSONDecoder(), [], 0
+        while i < len(data):
+            size = rng.randint(1, 9)
+            values += decoder.feed(data[i : i + size])
+            i += size
+        assert values + decoder.flush() == LINES
+
+
+def test_blank_lines_and_unterminated_tail():
+    decoder = NDJSONDecoder()
+    assert decoder.feed(b'{"a": 1}\n\r\n\n{"b"') == [{"a": 1}]
+    assert decoder.feed(b": 2}") == []
+    assert decoder.flush() == [{"b": 2}]
+    assert decoder.flush() == []
+
+
+def test_trusted_chunks_equal_validated_ones():
+    chunk = StreamingChunk.trusted(text="hi", metadata={"done": False})
+    assert chunk == StreamingChunk(text="hi", metadata={"done": False})
+    assert chunk.model_fields_set == {"text", "metadata"}
+    assert chunk.model_dump() == {"text": "hi", "metadata": {"done": False}}
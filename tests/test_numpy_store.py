@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yogurt.documents.base import Document  # noqa: E402
+from yogurt.vector_stores import NumpyVectorStore  # noqa: E402
+
+K = 10
+
+
+def ids(results) -> list:
+    return [r.document.id for r in results]
+
+
+def test_search_matches_brute_force(vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    store = NumpyVectorStore(initial_capacity=16)
+    for start in range(0, len(documents), 700):
+        store.add_embeddings(documents[start : start + 700], vectors[start : start + 700])
+    assert len(store) == len(documents)
+
+    for query, results in zip(queries, store.batch_search_by_vector(queries, K)):
+        expected_ids, expected_scores = brute_force(vectors, documents, query, K)
+        assert ids(results) == expected_ids
+        assert [r.score for r in results] == pytest.approx(expected_scores, abs=1e-5)
+    assert ids(store.search_by_vector(queries[0], K)) == ids(
+        store.batch_search_by_vector(queries[:1], K)[0]
+    )
+
+
+def test_delete_and_replace_keep_results_exact(vector_data, brute_force):
+    vectors, documents, queries = vector_data
+    documents = list(documents[:500])
+    vectors = vectors[:500].copy()
+    store = NumpyVectorStore()
+    store.add_embeddings(documents, vectors)
+
+    assert store.delete(["3", "7", "unknown"]) == 2
+    documents[3] = documents[7] = None
+    vectors[10] = queries[0]
+    documents[10] = Document(id="10", content="replaced")
+    store.add_embeddings([documents[10]], vectors[10:11])
+
+    assert len(store) == 498 and store.get("3") is None
+    assert store.get("10").content == "replaced"
+    for query in queries:
+        assert ids(store.search_by_vector(query, K)) == brute_force(vectors, documents, query, K)[0]
+    assert store.search_by_vector(queries[0], 1)[0].document.id == "10"
+
+
+def test_edge_cases():
+    store = NumpyVectorStore()
+    assert store.search_by_vector([1.0, 0.0], 3) == []
+    store.add_embeddings([Document(id="a", content="a")], [[1.0, 0.0]])
+    assert store.search_by_vector([1.0, 0.0], 0) == []
+    assert len(store.search_by_vector([1.0, 0.0], 5)) == 1
+    with pytest.raises(ValueError):
+        store.search_by_vector([1.0, 0.0, 0.0], 1)
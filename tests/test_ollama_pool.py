@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+
+from yogurt.llms.ollama import OllamaLLM, OllamaPool
+from yogurt.llms.ollama.pool import spread_across_hosts
+from yogurt.prompts.prompt_value import PromptValue
+
+A, B, C = "http://ollama-a:11434", "http://ollama-b:11434", "http://ollama-c:11434"
+
+
+def test_select_prefers_hosts_with_the_model_loaded():
+    pool = OllamaPool([A, B], cold_penalty=2)
+    pool.mark_loaded(B, ["llama3"])
+    assert pool.select("llama3") == B
+    assert pool.select("llama3:latest") == B
+
+
+def test_lease_balances_outstanding_requests():
+    pool = OllamaPool([A, B, C])
+    with pool.lease("m") as first, pool.lease("m") as second, pool.lease("m") as third:
+        assert {first, second, third} == {A, B, C}
+        assert sorted(s.outstanding for s in pool.status()) == [1, 1, 1]
+    assert [s.outstanding for s in pool.status()] == [0, 0, 0]
+
+
+def test_spread_across_hosts_avoids_hosts_already_leased():
+    pool = OllamaPool([A, B])
+    pool.mark_loaded(A, ["m"])
+    with spread_across_hosts():
+        with pool.lease("m") as first:
+            pass
+        with pool.lease("m") as second:
+            pass
+    assert (first, second) == (A, B)
+
+
+def test_lease_ejects_a_host_after_repeated_failures():
+    pool = OllamaPool([A, B], failure_threshold=2)
+    request = httpx.Request("GET", A)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            with pool.lease("m", exclude={B}):
+                raise httpx.ConnectError("refused", request=request)
+    assert [s.healthy for s in pool.status()] == [False, True]
+    assert all(pool.select("m") == B for _ in range(4))
+
+
+def test_client_errors_do_not_count_against_the_host():
+    pool = OllamaPool([A], failure_threshold=1)
+    request = httpx.Request("POST", A)
+    error = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        with pool.lease("m"):
+            raise error
+    assert pool.status()[0].healthy
+
+
+def test_check_health_against_stub_hosts(stub_network):
+    stub_network.add(A, models=["llama3", {"model": "phi3:mini"}, {"size": 1}, {"name": None}])
+    stub_network.add(B).status = 500
+    pool = OllamaPool([A, B, C], failure_threshold=1)
+
+    statuses = pool.check_health()
+
+    assert [s.healthy for s in statuses] == [True, False, False]
+    assert statuses[0].loaded_models == ["llama3:latest", "phi3:mini"]
+    assert all(s.last_checked is not None for s in statuses)
+
+    stub_network.add(C)
+    stub_network.hosts[B].status = None
+    assert all(s.healthy for s in asyncio.run(pool.acheck_health()))
+
+
+def test_llm_requests_spread_over_stub_hosts(stub_network):
+    hosts = [stub_network.add(url) for url in (A, B, C)]
+    pool = OllamaPool([A, B, C], cold_penalty=0)
+    with OllamaLLM(model_name="m", pool=pool) as llm:
+        texts = {llm.generate(PromptValue(text=str(i))).generations[0].text for i in range(6)}
+    assert texts == {f"from {url}" for url in (A, B, C)}
+    assert [host.generates for host in hosts] == [2, 2, 2]
+    assert all(s.loaded_models == ["m:latest"] for s in pool.status())
+
+
+def test_llm_routes_around_a_dead_host(stub_network):
+    stub_network.add(A)
+    pool = OllamaPool([A, B], failure_threshold=1, cold_penalty=0)
+
+    async def run() -> list:
+        async with OllamaLLM(model_name="m", pool=pool) as llm:
+            return await llm.abatch([PromptValue(text=str(i)) for i in range(8)], max_concurrency=1)
+
+    results = asyncio.run(run())
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert len(failures) == 1 and isinstance(failures[0], httpx.ConnectError)
+    assert [s.healthy for s in pool.status()] == [True, False]
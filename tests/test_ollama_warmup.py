@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from yogurt.llms.ollama import ModelWarmer, OllamaPool, WarmupConfig
+
+A, B, C = "http://ollama-a:11434", "http://ollama-b:11434", "http://ollama-c:11434"
+
+
+def test_warmer_rejects_hosts_outside_the_pool():
+    with pytest.raises(ValueError, match="not in the attached pool"):
+        ModelWarmer(WarmupConfig(hosts=[C], models=["m"]), pool=OllamaPool([A, B]))
+
+
+def test_warmer_marks_models_loaded_in_the_pool(stub_network):
+    stub_network.add(A)
+    pool = OllamaPool([A, B])
+    warmer = ModelWarmer(WarmupConfig(hosts=[A], models=["m"]), pool=pool)
+
+    (metric,) = warmer.warm()
+    assert metric.error is None and metric.load_seconds == pytest.approx(0.002)
+    assert pool.status()[0].loaded_models == ["m:latest"]
+
+    assert asyncio.run(warmer.awarm(only_missing=True)) == []
+    assert warmer.loaded == {A: ["m:latest"]}
+
+
+def test_warm_records_failures_without_marking_the_model_loaded(stub_network):
+    stub_network.add(A).status = 500
+    pool = OllamaPool([A])
+    warmer = ModelWarmer(WarmupConfig(models=["m"]), pool=pool)
+
+    (metric,) = warmer.warm()
+    assert metric.error is not None and not metric.was_loaded
+    assert pool.status()[0].loaded_models == []
+    assert list(warmer.metrics) == [metric]
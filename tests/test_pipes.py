@@ -0,0 +1,124 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+from yogurt.pipes import BasePipe
+from yogurt.pipes.graph import DAGPipe, SequentialPipe
+
+
+class FnPipe(BasePipe):
+    """Computes its outputs from its inputs with `fn`, after `delay` seconds."""
+
+    def __init__(
+        self,
+        inputs: List[str],
+        outputs: List[str],
+        fn: Callable[..., Any],
+        delay: float = 0.0,
+    ):
+        self._inputs = inputs
+        self._outputs = outputs
+        self.fn = fn
+        self.delay = delay
+        self.seen: List[Dict[str, Any]] = []
+
+    @property
+    def input_keys(self) -> List[str]:
+        return self._inputs
+
+    @property
+    def output_keys(self) -> List[str]:
+        return self._outputs
+
+    def run(self, **kwargs: Any) -> Any:
+        self.seen.append(kwargs)
+        time.sleep(self.delay)
+        return self.fn(**kwargs)
+
+    async def arun(self, **kwargs: Any) -> Any:
+        self.seen.append(kwargs)
+        await asyncio.sleep(self.delay)
+        return self.fn(**kwargs)
+
+    def stream(self, **kwargs: Any) -> Any:
+        yield self.run(**kwargs)
+
+    async def astream(self, **kwargs: Any) -> Any:
+        yield await self.arun(**kwargs)
+
+
+def fan_out(delay: float, max_concurrency=None) -> DAGPipe:
+    """Four independent lookups of `q`, then one node joining them."""
+    nodes = {
+        f"look{i}": FnPipe(["q"], [f"r{i}"], lambda q, i=i: f"{q}{i}", delay)
+        for i in range(4)
+    }
+    nodes["join"] = FnPipe(
+        [f"r{i}" for i in range(4)], ["answer"], lambda **r: "+".join(sorted(r.values()))
+    )
+    return DAGPipe(nodes, output_keys=["answer"], max_concurrency=max_concurrency)
+
+
+def test_independent_nodes_run_concurrently():
+    dag = fan_out(0.05)
+    start = time.perf_counter()
+    assert asyncio.run(dag.arun(q="x")) == {"answer": "x0+x1+x2+x3"}
+    assert dag.run(q="y") == {"answer": "y0+y1+y2+y3"}
+    assert time.perf_counter() - start < 0.3
+    assert dag.input_keys == ["q"]
+
+
+def test_timings_show_waits_for_concurrency_slots():
+    result = asyncio.run(fan_out(0.02, max_concurrency=1).aexecute(q="x"))
+    assert [t.node for t in result.timings][-1] == "join"
+    assert sum(t.wait_ms > 10 for t in result.timings) == 3
+    assert result.critical_path_ms >= 80
+
+
+def test_stream_yields_nodes_as_they_finish():
+    nodes = {
+        "slow": FnPipe(["q"], ["a"], lambda q: 1, 0.05),
+        "fast": FnPipe(["q"], ["b"], lambda q: 2),
+    }
+
+    async def collect():
+        return [result.node async for result in DAGPipe(nodes).astream(q=0)]
+
+    assert asyncio.run(collect()) == ["fast", "slow"]
+    assert [result.node for result in DAGPipe(nodes).stream(q=0)] == ["fast", "slow"]
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="produced by both"):
+        DAGPipe([FnPipe([], ["a"], dict), FnPipe([], ["a"], dict)])
+    with pytest.raises(ValueError, match="cycle"):
+        DAGPipe({"x": FnPipe(["b"], ["a"], dict), "y": FnPipe(["a"], ["b"], dict)})
+    with pytest.raises(ValueError, match="Unknown node"):
+        DAGPipe({"x": FnPipe([], ["a"], dict)}, depends_on={"x": ["missing"]})
+    with pytest.raises(ValueError, match="Missing inputs"):
+        fan_out(0).run()
+
+
+def test_results_must_name_their_outputs():
+    single = DAGPipe([FnPipe(["q"], ["a"], lambda q: q * 2)])
+    assert single.run(q=2) == {"a": 4}
+    double = DAGPipe([FnPipe(["q"], ["a", "b"], lambda q: q)])
+    with pytest.raises(TypeError):
+        double.run(q=2)
+
+
+def test_sequential_steps_may_reuse_output_keys():
+    first = FnPipe(["text"], ["text"], lambda text: text.strip())
+    second = FnPipe(
+        ["text"], ["text", "length"], lambda text: {"text": text.upper(), "length": len(text)}
+    )
+    everything = FnPipe([], ["done"], lambda **state: sorted(state))
+    pipe = SequentialPipe([first, second, everything])
+
+    assert pipe.input_keys == ["text"]
+    assert pipe.output_keys == ["done", "length", "text"]
+    assert pipe.run(text="  hi ") == {"done": ["length", "text"], "length": 2, "text": "HI"}
+    assert second.seen == [{"text": "hi"}]
+    assert everything.seen == [{"text": "HI", "length": 2}]
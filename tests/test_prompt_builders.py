@@ -0,0 +1,83 @@
+import pytest
+
+from yogurt.prompts.builders import ChatPromptBuilder, CompiledTemplate, PromptBuilder
+
+TEMPLATES = [
+    "Hello {name}!",
+    "{a}{b} and {a}",
+    "{{literal}} {user.name} {items[1]} {value!r} {score:.2f}",
+    "no fields",
+]
+
+
+class User:
+    name = "ada"
+
+
+VALUES = {
+    "name": "ada",
+    "a": 1,
+    "b": "x",
+    "user": User(),
+    "items": ["p", "q"],
+    "value": "v",
+    "score": 0.5,
+}
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_compiled_templates_render_like_str_format(template):
+    compiled = CompiledTemplate(template)
+    assert compiled.render(VALUES) == template.format_map(VALUES)
+    assert compiled.is_static == (template == "no fields")
+
+
+def test_partial_bakes_values_into_the_text():
+    compiled = CompiledTemplate("{greeting}, {name}. {greeting}!")
+    bound = compiled.partial(greeting="Hi")
+    assert bound.variables == ["name"]
+    assert bound.render({"name": "Bo"}) == "Hi, Bo. Hi!"
+    assert bound.partial(name="Al").is_static
+    assert compiled.variables == ["greeting", "name"]
+
+
+def test_invalid_templates_and_missing_values():
+    with pytest.raises(ValueError):
+        CompiledTemplate("{} positional")
+    with pytest.raises(KeyError):
+        CompiledTemplate("{name}").render({})
+    with pytest.raises(KeyError):
+        PromptBuilder("{name}", cache_size=4).format_prompt()
+
+
+def test_render_cache_is_an_lru_keyed_by_inputs():
+    builder = PromptBuilder("Q: {q}", cache_size=2)
+    first = builder.format_prompt(q="a")
+    assert builder.format_prompt(q="a") is first
+    builder.format_prompt(q="b")
+    builder.format_prompt(q="c")
+    assert builder.format_prompt(q="a") is not first
+    assert (builder.cache.hits, builder.cache.misses, len(builder.cache)) == (1, 4, 2)
+    assert builder.format_prompt(q=["unhashable"]).text == "Q: ['unhashable']"
+
+
+def test_equal_values_of_different_types_are_cached_apart():
+    builder = PromptBuilder("{flag}", cache_size=8)
+    assert [builder.format_prompt(flag=v).text for v in (True, 1, 1.0)] == ["True", "1", "1.0"]
+    assert [p.text for p in builder.format_prompts([{"flag": 1.0}, {"flag": True}])] == [
+        "1.0",
+        "True",
+    ]
+
+
+def test_chat_builder_reuses_static_messages():
+    builder = ChatPromptBuilder("You are {role}.", "{question}").partial(role="terse")
+    first, second = builder.format_prompts([{"question": "a"}, {"question": "b"}])
+    assert builder.input_variables == ["question"]
+    assert first.messages[0] is second.messages[0]
+    assert first.messages[0].content == "You are terse."
+    assert [m.content for m in second.messages] == ["You are terse.", "b"]
+
+    cached = ChatPromptBuilder("sys", "{question}", cache_size=4)
+    assert cached.format_prompt(question=1).messages[1].content == "1"
+    assert cached.format_prompt(question=True).messages[1].content == "True"
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+from pydantic import PrivateAttr
+
+from yogurt.llms.ollama import OllamaLLM, OllamaPool
+from yogurt.llms.resilience import (
+    FirstTokenTimeoutError,
+    HedgePolicy,
+    ResilientLLM,
+    RetryPolicy,
+)
+from yogurt.prompts.prompt_value import PromptValue
+
+from fakes import FakeLLM, prompt
+
+A, B = "http://ollama-a:11434", "http://ollama-b:11434"
+NO_BACKOFF = RetryPolicy(initial_backoff=0, jitter=False)
+
+
+class SlowFirstLLM(FakeLLM):
+    """A FakeLLM whose first async call stalls for a second before answering."""
+
+    _started: int = PrivateAttr(default=0)
+
+    async def _stall(self) -> None:
+        self._started += 1
+        if self._started == 1:
+            await asyncio.sleep(1)
+
+    async def _agenerate(self, prompt, **kwargs):
+        await self._stall()
+        return await super()._agenerate(prompt, **kwargs)
+
+    async def _astream(self, prompt, **kwargs):
+        await self._stall()
+        async for chunk in super()._astream(prompt, **kwargs):
+            yield chunk
+
+
+def flaky_ollama(network) -> OllamaLLM:
+    """An LLM whose preferred host, A, answers 503 while B is healthy."""
+    network.hosts[A].status = 503
+    pool = OllamaPool([A, B], failure_threshold=10)
+    pool.mark_loaded(A, ["m"])
+    return OllamaLLM(model_name="m", pool=pool)
+
+
+@pytest.fixture
+def hosts(stub_network):
+    return [stub_network.add(A), stub_network.add(B)]
+
+
+def test_sync_retries_land_on_another_host(stub_network, hosts):
+    with flaky_ollama(stub_network) as ollama:
+        llm = ResilientLLM(llm=ollama, retry=NO_BACKOFF)
+        assert llm.generate(PromptValue(text="hi")).generations[0].text == f"from {B}"
+    with flaky_ollama(stub_network) as ollama:
+        llm = ResilientLLM(llm=ollama, retry=NO_BACKOFF)
+        assert [chunk.text for chunk in llm.stream(PromptValue(text="hi"))] == [f"from {B}"]
+    assert [host.generates for host in hosts] == [2, 2]
+
+
+def test_async_retries_land_on_another_host(stub_network, hosts):
+    async def run():
+        async with flaky_ollama(stub_network) as ollama:
+            llm = ResilientLLM(llm=ollama, retry=NO_BACKOFF)
+            result = await llm.agenerate(PromptValue(text="hi"))
+        async with flaky_ollama(stub_network) as ollama:
+            llm = ResilientLLM(llm=ollama, retry=NO_BACKOFF)
+            chunks = [chunk.text async for chunk in llm.astream(PromptValue(text="hi"))]
+        return result.generations[0].text, chunks, llm.stats().retries
+
+    assert asyncio.run(run()) == (f"from {B}", [f"from {B}"], 1)
+    assert [host.generates for host in hosts] == [2, 2]
+
+
+def test_permanent_errors_are_not_retried(stub_network, hosts):
+    with flaky_ollama(stub_network) as ollama:
+        hosts[0].status = 400
+        llm = ResilientLLM(llm=ollama, retry=NO_BACKOFF)
+        with pytest.raises(httpx.HTTPStatusError):
+            llm.generate(PromptValue(text="hi"))
+        with pytest.raises(httpx.HTTPStatusError):
+            list(llm.stream(PromptValue(text="hi")))
+    assert hosts[1].generates == 0
+    assert llm.stats().retries == 0
+
+
+def test_backoff_grows_and_is_capped():
+    policy = RetryPolicy(initial_backoff=0.1, max_backoff=0.5, jitter=False)
+    assert [policy.backoff(i) for i in range(4)] == [0.1, 0.2, 0.4, 0.5]
+    jittered = RetryPolicy(initial_backoff=0.1)
+    assert all(0 <= jittered.backoff(2) <= 0.4 for _ in range(20))
+
+
+def test_slow_request_is_hedged():
+    llm = ResilientLLM(llm=SlowFirstLLM(), hedge=HedgePolicy(initial_delay=0.02))
+    result = asyncio.run(asyncio.wait_for(llm.agenerate(prompt("x")), 0.5))
+    assert result.generations[0].text == "echo: x"
+    stats = llm.stats()
+    assert (stats.hedges_launched, stats.hedges_won, stats.hedge_win_rate) == (1, 1, 1.0)
+    assert llm.llm.calls == 1
+
+
+def test_stalled_stream_times_out_and_is_retried():
+    async def collect(llm):
+        return [chunk.text async for chunk in llm.astream(prompt("x"))]
+
+    llm = ResilientLLM(llm=SlowFirstLLM(), first_token_timeout=0.02, retry=NO_BACKOFF)
+    assert asyncio.run(asyncio.wait_for(collect(llm), 0.5)) == ["hel", "lo"]
+    assert (llm.stats().first_token_timeouts, llm.stats().retries) == (1, 1)
+
+    llm = ResilientLLM(
+        llm=FakeLLM(delay=0.2),
+        first_token_timeout=0.02,
+        retry=RetryPolicy(max_attempts=1),
+    )
+    with pytest.raises(FirstTokenTimeoutError):
+        asyncio.run(collect(llm))
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yogurt.caches import SemanticCache  # noqa: E402
+from yogurt.embeddings.base import BaseEmbedder  # noqa: E402
+from yogurt.messages.base import HumanMessage, SystemMessage  # noqa: E402
+from yogurt.output.base import Generation, LLMResult  # noqa: E402
+from yogurt.prompts.prompt_value import PromptValue  # noqa: E402
+
+from fakes import FakeLLM  # noqa: E402
+
+VECTORS = {
+    "capital of france": [1.0, 0.0, 0.0],
+    "france capital?": [0.99, 0.1, 0.0],
+    "weather today": [0.0, 1.0, 0.0],
+    "opposite": [-1.0, 0.0, 0.0],
+}
+
+
+class TableEmbedder(BaseEmbedder):
+    """Looks texts up in VECTORS and counts the lookups."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return VECTORS[text]
+
+
+def prompt(text: str, system: str = "") -> PromptValue:
+    messages = [SystemMessage(content=system)] if system else []
+    return PromptValue(messages=messages + [HumanMessage(content=text)])
+
+
+def result(text: str) -> LLMResult:
+    return LLMResult(generations=[Generation(text=text)])
+
+
+def text(cached) -> str:
+    return cached.generations[0].text if cached is not None else None
+
+
+PAYLOAD = {"model": "m"}
+
+
+def test_similar_prompts_hit_and_distant_ones_miss():
+    cache = SemanticCache(TableEmbedder(), similarity_threshold=0.95, ttl_seconds=0)
+    assert cache.lookup(prompt("capital of france"), PAYLOAD) is None
+    cache.update(prompt("capital of france"), PAYLOAD, result("Paris"))
+
+    assert text(cache.lookup(prompt("france capital?"), PAYLOAD)) == "Paris"
+    assert cache.lookup(prompt("weather today"), PAYLOAD) is None
+
+    stats = cache.stats()
+    assert (stats.lookups, stats.hits, stats.misses) == (3, 1, 2)
+    assert stats.recent_similarities == pytest.approx([0.995, 0.0], abs=0.01)
+    cache.reset_stats()
+    assert cache.stats().lookups == 0
+
+
+def test_update_reuses_the_vector_from_the_lookup():
+    embedder = TableEmbedder()
+    cache = SemanticCache(embedder, ttl_seconds=0)
+    cache.lookup(prompt("weather today"), PAYLOAD)
+    cache.update(prompt("weather today"), PAYLOAD, result("sunny"))
+    assert embedder.calls == 1
+
+
+def test_scopes_are_separated_by_model_and_system_prompt():
+    cache = SemanticCache(TableEmbedder(), ttl_seconds=0)
+    cache.update(prompt("capital of france", "be brief"), PAYLOAD, result("Paris"))
+    assert text(cache.lookup(prompt("capital of france", "be brief"), PAYLOAD)) == "Paris"
+    assert cache.lookup(prompt("capital of france"), PAYLOAD) is None
+    assert cache.lookup(prompt("capital of france", "be brief"), {"model": "other"}) is None
+
+
+def test_expired_entries_are_never_served():
+    cache = SemanticCache(TableEmbedder(), similarity_threshold=-1.0, ttl_seconds=0.05)
+    cache.update(prompt("capital of france"), PAYLOAD, result("Paris"))
+    assert text(cache.lookup(prompt("opposite"), PAYLOAD)) == "Paris"
+    time.sleep(0.08)
+
+    assert cache.lookup(prompt("capital of france"), PAYLOAD) is None
+    assert cache.stats().recent_similarities == pytest.approx([-1.0])
+
+
+def test_full_scopes_overwrite_their_oldest_entries():
+    cache = SemanticCache(TableEmbedder(), max_entries_per_scope=2, ttl_seconds=0)
+    for name in ("capital of france", "weather today", "opposite"):
+        cache.update(prompt(name), PAYLOAD, result(name))
+    assert text(cache.lookup(prompt("weather today"), PAYLOAD)) == "weather today"
+    assert cache.lookup(prompt("capital of france"), PAYLOAD) is None
+
+
+def test_invalid_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        SemanticCache(TableEmbedder(), similarity_threshold=1.5)
+    with pytest.raises(ValueError):
+        SemanticCache(TableEmbedder(), max_entries_per_scope=0)
+
+
+def test_llm_serves_paraphrases_from_the_cache():
+    llm = FakeLLM(cache=SemanticCache(TableEmbedder(), ttl_seconds=0))
+    first = llm.generate(prompt("capital of france"))
+    second = asyncio.run(llm.agenerate(prompt("france capital?")))
+    assert text(first) == text(second) and llm.calls == 1
+    second.generations[0].text = "changed"
+    assert text(llm.generate(prompt("capital of france"))) == text(first)
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from yogurt.utils.concurrency import SingleFlight
+
+from fakes import FakeLLM, prompt
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        assert not flight.in_flight("k")
+        return results
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_errors_reach_every_caller():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            *(flight.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_upstream_is_cancelled_only_with_its_last_caller():
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled and flight.in_flight("k")
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled == [1] and not flight.in_flight("k")
+
+    asyncio.run(run())
+
+
+def test_caller_after_a_cancel_starts_a_fresh_call():
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "fresh"
+
+    async def run():
+        flight = SingleFlight()
+        waiter = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        # The waiter is gone, but the upstream task is still unwinding.
+        assert waiter.cancelled() and not flight.in_flight("k")
+        return await flight.do("k", fast)
+
+    assert asyncio.run(run()) == "fresh"
+
+
+def test_streams_fan_out_to_late_subscribers():
+    starts = []
+
+    async def source():
+        starts.append(1)
+        for item in ("a", "b", "c"):
+            await asyncio.sleep(0.005)
+            yield item
+
+    async def collect(flight, delay):
+        await asyncio.sleep(delay)
+        return [item async for item in flight.stream("k", source)]
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(collect(flight, 0), collect(flight, 0.008))
+
+    assert asyncio.run(run()) == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(starts) == 1
+
+
+def test_stream_errors_reach_every_subscriber():
+    async def source():
+        yield "a"
+        await asyncio.sleep(0.005)
+        raise RuntimeError("boom")
+
+    async def collect(flight, items):
+        async for item in flight.stream("k", source):
+            items.append(item)
+
+    async def run():
+        flight = SingleFlight()
+        seen = [[], []]
+        results = await asyncio.gather(
+            *(collect(flight, items) for items in seen), return_exceptions=True
+        )
+        return seen, results
+
+    seen, results = asyncio.run(run())
+    assert seen == [["a"], ["a"]]
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.parametrize("coalesce", [True, False])
+def test_llm_coalesces_identical_requests(coalesce):
+    llm = FakeLLM(delay=0.01, coalesce_requests=coalesce)
+
+    async def texts():
+        return [chunk.text async for chunk in llm.astream(prompt("same"))]
+
+    async def run():
+        results = await asyncio.gather(
+            *(llm.agenerate(prompt("same")) for _ in range(4)), llm.agenerate(prompt("other"))
+        )
+        streams = await asyncio.gather(*(texts() for _ in range(3)))
+        return results, streams
+
+    results, streams = asyncio.run(run())
+    assert [r.generations[0].text for r in results] == ["echo: same"] * 4 + ["echo: other"]
+    assert streams == [["hel", "lo"]] * 3
+    assert llm.calls == (2 + 1 if coalesce else 5 + 3)
@@ -0,0 +1,145 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from yogurt.memory.conversational.sqlite_memory import SQLiteConversationStore
+from yogurt.messages.base import AIMessage, HumanMessage
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "memory.db"
+
+
+def contents(memory) -> list:
+    return [message.content for message in memory.chat_history]
+
+
+def disk_size(path) -> int:
+    """The database file plus its write-ahead log."""
+    wal = path.with_name(path.name + "-wal")
+    return path.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
+
+
+def test_turns_survive_a_restart(path):
+    with SQLiteConversationStore(path, flush_interval=0.01) as store:
+        for i in range(5):
+            store.memory("s1").save_context({"q": f"hello {i}"}, {"a": f"reply {i}"})
+        store.memory("s2").add_turn(HumanMessage(content="x"), AIMessage(content="y"))
+
+    with SQLiteConversationStore(path, window=2) as store:
+        assert sorted(store.sessions()) == ["s1", "s2"]
+        memory = store.memory("s1")
+        assert contents(memory) == ["hello 3", "reply 3", "hello 4", "reply 4"]
+        assert isinstance(memory.chat_history[0], HumanMessage)
+        assert isinstance(memory.chat_history[1], AIMessage)
+
+
+def test_evicted_sessions_reload_queued_turns(path):
+    with SQLiteConversationStore(path, max_sessions=1, flush_interval=10.0) as store:
+        store.memory("a").save_context({"q": "1"}, {"a": "2"})
+        store.memory("b").save_context({"q": "3"}, {"a": "4"})
+        assert contents(store.memory("a")) == ["1", "2"]
+        assert store.stats()["hot_sessions"] == 1
+
+
+def test_async_memory_and_flush(path):
+    async def run(store: SQLiteConversationStore) -> None:
+        memory = await store.amemory("s")
+        memory.save_context({"q": "x"}, {"a": "y"})
+        await store.aflush()
+
+    with SQLiteConversationStore(path) as store:
+        asyncio.run(run(store))
+        assert store.stats()["unwritten_turns"] == 0
+    with SQLiteConversationStore(path) as store:
+        assert contents(store.memory("s")) == ["x", "y"]
+
+
+def test_compact_keeps_the_newest_turns_and_shrinks_the_file(path):
+    with SQLiteConversationStore(path, retain_turns=3, flush_interval=0.01) as store:
+        for i in range(2000):
+            store.memory(f"s{i % 2}").save_context({"q": "q" * 200}, {"a": f"reply {i}"})
+        store.flush()
+        size = disk_size(path)
+
+        assert store.compact() == 2000 - 6
+        assert disk_size(path) < size / 10
+        store.evict("s1")
+        assert contents(store.memory("s1"))[-1] == "reply 1999"
+        assert len(store.memory("s1").chat_history) == 6
+
+
+def test_delete_removes_a_session(path):
+    with SQLiteConversationStore(path) as store:
+        store.memory("a").save_context({"q": "1"}, {"a": "2"})
+        store.flush()
+        store.delete("a")
+        assert store.sessions() == []
+        assert contents(store.memory("a")) == []
+
+
+def test_failed_batches_are_dropped_and_reported(path, monkeypatch):
+    store = SQLiteConversationStore(path, flush_interval=0.01, max_retries=2)
+    attempts = []
+
+    def failing_write(rows):
+        attempts.append(len(rows))
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_write", failing_write)
+    store.memory("a").save_context({"q": "1"}, {"a": "2"})
+
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        store.flush()
+    assert len(attempts) == 3
+    assert store.dropped_turns == 1
+    assert store.stats()["unwritten_turns"] == 0
+    store.flush()
+
+    store.memory("a").save_context({"q": "3"}, {"a": "4"})
+    with pytest.raises(sqlite3.OperationalError):
+        store.close()
+
+
+def test_saving_does_not_wait_for_the_database(path):
+    with SQLiteConversationStore(path, flush_interval=0.01) as store:
+        memory = store.memory("a")
+        with store._db_lock:
+            memory.save_context({"q": "1"}, {"a": "2"})
+            time.sleep(0.05)  # The writer is now blocked on the connection.
+            start = time.perf_counter()
+            memory.save_context({"q": "3"}, {"a": "4"})
+            assert store.memory("a") is memory
+            assert store.stats()["unwritten_turns"] >= 1
+            assert time.perf_counter() - start < 0.05
+        store.flush()
+        store.evict("a")
+        assert contents(store.memory("a")) == ["1", "2", "3", "4"]
+
+
+def test_loading_a_session_leaves_dropped_batches_to_flush(path, monkeypatch):
+    store = SQLiteConversationStore(path, flush_interval=0.01, max_retries=0)
+    write = store._write
+    failing = True
+
+    def flaky_write(rows):
+        if failing:
+            raise sqlite3.OperationalError("disk I/O error")
+        write(rows)
+
+    monkeypatch.setattr(store, "_write", flaky_write)
+    store.memory("a").save_context({"q": "1"}, {"a": "2"})
+    store._queue.join()
+    assert store.dropped_turns == 1
+    failing = False
+
+    store.memory("b").save_context({"q": "3"}, {"a": "4"})
+    store.evict("b")
+    assert contents(store.memory("b")) == ["3", "4"]
+    assert contents(asyncio.run(store.amemory("c"))) == []
+    with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+        store.flush()
+    store.close()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from yogurt.memory.conversational.summary_memory import SummarizingMemory
+from yogurt.prompts.builders import PromptBuilder
+
+from fakes import FakeLLM
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def memory_for(
+    llm: FakeLLM, template: str = "{summary} | {new_lines}", **kwargs
+) -> SummarizingMemory:
+    return SummarizingMemory(llm, window=2, prompt=PromptBuilder(template), **kwargs)
+
+
+def save(memory: SummarizingMemory, i: int) -> None:
+    memory.save_context({"input": f"q{i}"}, {"output": f"a{i}"})
+
+
+def test_evicted_turns_are_summarized_in_the_background():
+    llm = FakeLLM(delay=0.05)
+    memory = memory_for(llm)
+
+    async def run():
+        start = time.perf_counter()
+        for i in range(3):
+            save(memory, i)
+        assert time.perf_counter() - start < 0.04
+        assert memory.pending == 1 and memory.summary == ""
+        await memory.aflush()
+
+    asyncio.run(run())
+    assert memory.pending == 0
+    assert memory.summary == "echo: (empty) | human: q0\nai: a0"
+    variables = memory.load_memory_variables()
+    assert variables["conversation_summary"] == memory.summary
+    messages = variables["conversation_memory"]
+    assert [m.role for m in messages] == ["system", "human", "ai", "human", "ai"]
+    assert messages[0].content == memory.summary
+
+
+def test_turns_evicted_during_a_summary_join_the_next_pass():
+    llm = FakeLLM(delay=0.05)
+    memory = memory_for(llm)
+
+    async def run():
+        for i in range(3):
+            save(memory, i)
+        await asyncio.sleep(0.01)
+        save(memory, 3)
+        save(memory, 4)
+        await memory.aflush()
+
+    asyncio.run(run())
+    assert llm.calls == 2
+    assert llm.prompts[1] == (
+        "echo: (empty) | human: q0\nai: a0 | human: q1\nai: a1\nhuman: q2\nai: a2"
+    )
+
+
+def test_failed_summaries_keep_their_turns():
+    memory = memory_for(FakeLLM(), template="fail {new_lines}")
+
+    async def run():
+        for i in range(4):
+            save(memory, i)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert memory.pending == 2 and isinstance(memory.last_error, RuntimeError)
+    with pytest.raises(RuntimeError):
+        memory.flush()
+    assert memory.pending == 2 and memory.summary == ""
+
+
+def test_outside_a_loop_turns_wait_for_flush():
+    llm = FakeLLM()
+    memory = memory_for(llm)
+    for i in range(4):
+        save(memory, i)
+    assert memory.pending == 2 and llm.calls == 0
+    memory.flush()
+    assert memory.pending == 0 and llm.calls == 1
+    assert memory.summary.endswith("human: q1\nai: a1")
+
+
+def test_clear_drops_a_summary_still_in_flight():
+    memory = memory_for(FakeLLM(delay=0.05))
+
+    async def run():
+        for i in range(3):
+            save(memory, i)
+        await asyncio.sleep(0.01)
+        memory.clear()
+        await memory.aflush()
+
+    asyncio.run(run())
+    assert (memory.summary, memory.pending, len(memory)) == ("", 0, 0)
+
+
+def test_summary_counts_against_the_token_budget():
+    memory = memory_for(FakeLLM(), token_counter=words, max_tokens=6)
+    for i in range(4):
+        save(memory, i)
+    memory.flush()
+    summary_tokens = words(memory.summary)
+    assert len(memory.messages(max_tokens=summary_tokens + 2)) == 3
+    assert len(memory.messages(max_tokens=summary_tokens + 4)) == 5
@@ -0,0 +1,15 @@
+from .base import BaseLLMCache, ExactMatchCache
+from .memory import InMemoryCache
+from .semantic import SemanticCache, SemanticCacheStats
+from .sqlite import SQLiteCache
+from .tiered import TieredCache
+
+__all__ = [
+    "BaseLLMCache",
+    "ExactMatchCache",
+    "InMemoryCache",
+    "SemanticCache",
+    "SemanticCacheStats",
+    "SQLiteCache",
+    "TieredCache",
+]
@@ -0,0 +1,94 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from yogurt.config.config import get_settings
+from yogurt.output.base import LLMResult
+from yogurt.prompts.prompt_value import PromptValue
+from yogurt.utils.hashing import stable_hash
+
+
+class BaseLLMCache(ABC):
+    """
+    Interface for caching LLM results in front of `BaseLLM.generate`.
+
+    Implementations receive both the prompt and the LLM's identifying payload
+    (model, messages or prompt, options, tools), so they can key on the exact
+    request or on something looser, such as the prompt's meaning.
+    """
+
+    @abstractmethod
+    def lookup(self, prompt: PromptValue, payload: Dict[str, Any]) -> Optional[LLMResult]:
+        """Returns a cached result for the request, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def update(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        """Stores the result for the request."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        pass
+
+    async def alookup(
+        self, prompt: PromptValue, payload: Dict[str, Any]
+    ) -> Optional[LLMResult]:
+        """Asynchronous `lookup`. Override when the lookup does blocking I/O."""
+        return self.lookup(prompt, payload)
+
+    async def aupdate(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        """Asynchronous `update`. Override when the update does blocking I/O."""
+        self.update(prompt, payload, result)
+
+
+class ExactMatchCache(BaseLLMCache):
+    """
+    A cache keyed on a stable hash of the full request payload. Subclasses
+    only implement storage through `get` and `set`.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = get_settings().cache_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        """Seconds an entry stays valid. 0 means entries never expire."""
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        return stable_hash(payload)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[LLMResult]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, result: LLMResult) -> None:
+        pass
+
+    def lookup(self, prompt: PromptValue, payload: Dict[str, Any]) -> Optional[LLMResult]:
+        return self.get(self.make_key(payload))
+
+    def update(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        self.set(self.make_key(payload), result)
+
+
+class BlockingExactMatchCache(ExactMatchCache):
+    """An exact-match cache whose storage blocks, so async calls use a thread."""
+
+    async def alookup(
+        self, prompt: PromptValue, payload: Dict[str, Any]
+    ) -> Optional[LLMResult]:
+        return await asyncio.to_thread(self.lookup, prompt, payload)
+
+    async def aupdate(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        await asyncio.to_thread(self.update, prompt, payload, result)
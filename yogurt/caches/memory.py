@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from yogurt.caches.base import ExactMatchCache
+from yogurt.output.base import LLMResult
+
+
+class InMemoryCache(ExactMatchCache):
+    """An in-process LRU cache with TTL expiry."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[float] = None):
+        super().__init__(ttl_seconds=ttl_seconds)
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, LLMResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[LLMResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Hand out copies so callers cannot mutate the cached entry.
+        return result.model_copy(deep=True)
+
+    def set(
+        self, key: str, result: LLMResult, expires_in: Optional[float] = None
+    ) -> None:
+        """
+        Stores `result`. `expires_in` caps the entry's lifetime below
+        `ttl_seconds`, e.g. for an entry promoted from a slower tier.
+        """
+        lifetimes = [t for t in (self.ttl_seconds or None, expires_in) if t is not None]
+        expires_at = time.monotonic() + min(lifetimes) if lifetimes else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, result.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
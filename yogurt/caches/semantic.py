@@ -0,0 +1,233 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from yogurt.caches.base import BaseLLMCache
+from yogurt.config.config import get_settings
+from yogurt.embeddings.base import BaseEmbedder, Embedding
+from yogurt.output.base import LLMResult
+from yogurt.prompts.prompt_value import PromptValue
+from yogurt.utils.hashing import stable_hash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SemanticCacheStats(BaseModel):
+    """A snapshot of semantic cache effectiveness, for tuning the threshold."""
+
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    mean_hit_similarity: Optional[float] = None
+    """Average similarity of the entries that were served."""
+    recent_similarities: List[float] = Field(default_factory=list)
+    """Best similarity found by recent lookups, hit or miss, oldest first."""
+
+
+class _ScopeIndex:
+    """
+    Normalized embeddings for one (model, system prompt) scope, stored as a
+    contiguous float32 matrix. Once `capacity` is reached the oldest entries
+    are overwritten in place.
+    """
+
+    def __init__(self, dim: int, capacity: int):
+        self.capacity = capacity
+        self.vectors = np.zeros((min(capacity, 64), dim), dtype=np.float32)
+        self.expires_at = np.zeros(len(self.vectors), dtype=np.float64)
+        self.results: List[Optional[LLMResult]] = [None] * len(self.vectors)
+        self.size = 0
+        self.next_slot = 0
+
+    def search(self, query: "np.ndarray", now: float) -> Tuple[int, float]:
+        """The best live slot and its similarity, or (-1, -inf) if none is live."""
+        if self.size == 0:
+            return -1, -np.inf
+        scores = self.vectors[: self.size] @ query
+        expires_at = self.expires_at[: self.size]
+        scores[(expires_at > 0) & (expires_at < now)] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            return -1, -np.inf
+        return best, float(scores[best])
+
+    def add(self, vector: "np.ndarray", result: LLMResult, expires_at: float) -> None:
+        if self.size < self.capacity and self.size == len(self.vectors):
+            grown = min(self.capacity, len(self.vectors) * 2)
+            vectors = np.zeros((grown, self.vectors.shape[1]), dtype=np.float32)
+            vectors[: self.size] = self.vectors
+            expiries = np.zeros(grown, dtype=np.float64)
+            expiries[: self.size] = self.expires_at
+            self.vectors, self.expires_at = vectors, expiries
+            self.results.extend([None] * (grown - len(self.results)))
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.expires_at[slot] = expires_at
+        self.results[slot] = result
+        self.size = max(self.size, slot + 1)
+        self.next_slot = (slot + 1) % self.capacity
+
+
+class SemanticCache(BaseLLMCache):
+    """
+    A cache that serves a stored result when a new prompt is close enough in
+    meaning to one seen before.
+
+    Prompts are embedded with `embedder` and compared by cosine similarity
+    against earlier prompts sent with the same model and system prompt. A
+    lookup is a single matrix-vector product over that scope's entries. Use
+    `stats()` to see how often the cache hits and how close misses were.
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        similarity_threshold: float = 0.95,
+        max_entries_per_scope: int = 10_000,
+        ttl_seconds: Optional[float] = None,
+        stats_window: int = 1000,
+    ):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for SemanticCache. Install with `pip install numpy`."
+            )
+        if not -1.0 <= similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be between -1.0 and 1.0")
+        if max_entries_per_scope < 1:
+            raise ValueError("max_entries_per_scope must be at least 1")
+        if ttl_seconds is None:
+            ttl_seconds = get_settings().cache_ttl_seconds
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.max_entries_per_scope = max_entries_per_scope
+        self.ttl_seconds = ttl_seconds
+        self._scopes: Dict[str, _ScopeIndex] = {}
+        self._lock = threading.Lock()
+        # Lookups are normally followed by an update for the same prompt on a
+        # miss, so recent query vectors are kept to avoid embedding twice.
+        self._recent_vectors: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lookups = 0
+        self._hits = 0
+        self._hit_similarity_sum = 0.0
+        self._similarities: Deque[float] = deque(maxlen=stats_window)
+
+    @staticmethod
+    def _split_prompt(prompt: PromptValue) -> Tuple[str, str]:
+        """Returns the prompt's (system prompt, text to embed)."""
+        messages = prompt.to_messages()
+        if not messages:
+            return "", prompt.to_string()
+        system = "\n".join(m.content for m in messages if m.role == "system")
+        text = "\n".join(m.content for m in messages if m.role != "system")
+        return system, text
+
+    @staticmethod
+    def _scope_key(payload: Dict[str, Any], system: str) -> str:
+        return stable_hash({"model": payload.get("model"), "system": system})
+
+    @staticmethod
+    def _normalize(embedding: Embedding) -> "np.ndarray":
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _remember(self, scope: str, text: str, vector: "np.ndarray") -> None:
+        self._recent_vectors[(scope, text)] = vector
+        if len(self._recent_vectors) > 256:
+            self._recent_vectors.popitem(last=False)
+
+    def _search(self, scope: str, text: str, vector: "np.ndarray") -> Optional[LLMResult]:
+        with self._lock:
+            self._remember(scope, text, vector)
+            self._lookups += 1
+            index = self._scopes.get(scope)
+            if index is None:
+                return None
+            slot, similarity = index.search(vector, time.time())
+            if slot >= 0:
+                self._similarities.append(similarity)
+            if slot < 0 or similarity < self.similarity_threshold:
+                return None
+            self._hits += 1
+            self._hit_similarity_sum += similarity
+            result = index.results[slot]
+        return result.model_copy(deep=True)
+
+    def _store(self, scope: str, vector: "np.ndarray", result: LLMResult) -> None:
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            index = self._scopes.get(scope)
+            if index is None:
+                index = _ScopeIndex(len(vector), self.max_entries_per_scope)
+                self._scopes[scope] = index
+            index.add(vector, result.model_copy(deep=True), expires_at)
+
+    def lookup(self, prompt: PromptValue, payload: Dict[str, Any]) -> Optional[LLMResult]:
+        system, text = self._split_prompt(prompt)
+        scope = self._scope_key(payload, system)
+        vector = self._normalize(self.embedder.embed_query(text))
+        return self._search(scope, text, vector)
+
+    async def alookup(
+        self, prompt: PromptValue, payload: Dict[str, Any]
+    ) -> Optional[LLMResult]:
+        system, text = self._split_prompt(prompt)
+        scope = self._scope_key(payload, system)
+        vector = self._normalize(await self.embedder.aembed_query(text))
+        return self._search(scope, text, vector)
+
+    def update(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        system, text = self._split_prompt(prompt)
+        scope = self._scope_key(payload, system)
+        with self._lock:
+            vector = self._recent_vectors.pop((scope, text), None)
+        if vector is None:
+            vector = self._normalize(self.embedder.embed_query(text))
+        self._store(scope, vector, result)
+
+    async def aupdate(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        system, text = self._split_prompt(prompt)
+        scope = self._scope_key(payload, system)
+        with self._lock:
+            vector = self._recent_vectors.pop((scope, text), None)
+        if vector is None:
+            vector = self._normalize(await self.embedder.aembed_query(text))
+        self._store(scope, vector, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+            self._recent_vectors.clear()
+
+    def stats(self) -> SemanticCacheStats:
+        """Returns hit/miss counts and recent similarity scores."""
+        with self._lock:
+            misses = self._lookups - self._hits
+            return SemanticCacheStats(
+                lookups=self._lookups,
+                hits=self._hits,
+                misses=misses,
+                hit_rate=self._hits / self._lookups if self._lookups else 0.0,
+                mean_hit_similarity=(
+                    self._hit_similarity_sum / self._hits if self._hits else None
+                ),
+                recent_similarities=list(self._similarities),
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._lookups = 0
+            self._hits = 0
+            self._hit_similarity_sum = 0.0
+            self._similarities.clear()
@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from yogurt.caches.base import BlockingExactMatchCache
+from yogurt.output.base import LLMResult
+
+
+class SQLiteCache(BlockingExactMatchCache):
+    """
+    An on-disk cache backed by SQLite, so results survive restarts and can be
+    shared by several worker processes.
+
+    Entries expire after `ttl_seconds`; once the table grows past
+    `max_entries`, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".yogurt_cache.db",
+        max_entries: int = 100_000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        super().__init__(ttl_seconds=ttl_seconds)
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        """Entries in the table, counting expired ones not yet removed."""
+        with self._lock:
+            return self._size
+
+    def get(self, key: str) -> Optional[LLMResult]:
+        found = self.get_with_expiry(key)
+        return found[0] if found is not None else None
+
+    def get_with_expiry(self, key: str) -> Optional[Tuple[LLMResult, float]]:
+        """
+        Like `get`, but also returns the Unix time at which the entry
+        expires, or 0 if it never does.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return LLMResult.model_validate_json(value), expires_at
+
+    def set(self, key: str, result: LLMResult) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else 0.0
+        value = result.model_dump_json()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            if exists is None:
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drops expired rows, then the least recently used ones over the limit."""
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE expires_at > 0 AND expires_at < ?", (now,)
+        )
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT "
+            "max(0, (SELECT COUNT(*) FROM llm_cache) - ?))",
+            (self.max_entries,),
+        )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
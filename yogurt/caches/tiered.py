@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from yogurt.caches.base import ExactMatchCache
+from yogurt.caches.memory import InMemoryCache
+from yogurt.caches.sqlite import SQLiteCache
+from yogurt.output.base import LLMResult
+from yogurt.prompts.prompt_value import PromptValue
+
+
+class TieredCache(ExactMatchCache):
+    """
+    An exact-match cache with an in-process LRU tier in front of an optional
+    SQLite tier. Disk hits are promoted into memory with the time they have
+    left on disk, so promotion never extends an entry's life; writes go to
+    both.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[InMemoryCache] = None,
+        disk: Optional[SQLiteCache] = None,
+    ):
+        self.memory = memory if memory is not None else InMemoryCache()
+        self.disk = disk
+        super().__init__(ttl_seconds=self.memory.ttl_seconds)
+
+    def _promote(
+        self, key: str, found: Optional[Tuple[LLMResult, float]]
+    ) -> Optional[LLMResult]:
+        if found is None:
+            return None
+        result, expires_at = found
+        expires_in = expires_at - time.time() if expires_at else None
+        self.memory.set(key, result, expires_in=expires_in)
+        return result
+
+    def get(self, key: str) -> Optional[LLMResult]:
+        result = self.memory.get(key)
+        if result is None and self.disk is not None:
+            result = self._promote(key, self.disk.get_with_expiry(key))
+        return result
+
+    def set(self, key: str, result: LLMResult) -> None:
+        self.memory.set(key, result)
+        if self.disk is not None:
+            self.disk.set(key, result)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    async def alookup(
+        self, prompt: PromptValue, payload: Dict[str, Any]
+    ) -> Optional[LLMResult]:
+        key = self.make_key(payload)
+        result = self.memory.get(key)
+        if result is None and self.disk is not None:
+            found = await asyncio.to_thread(self.disk.get_with_expiry, key)
+            result = self._promote(key, found)
+        return result
+
+    async def aupdate(
+        self, prompt: PromptValue, payload: Dict[str, Any], result: LLMResult
+    ) -> None:
+        key = self.make_key(payload)
+        self.memory.set(key, result)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, result)
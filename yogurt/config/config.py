@@ -32,3 +32,20 @@ class YogurtSettings(BaseModel):
     metrics_endpoint: Optional[str] = None
     security_policy: Optional[str] = None
     max_input_length: Optional[int] = Field(default=2048)
+
+
+_settings: Optional[YogurtSettings] = None
+
+
+def get_settings() -> YogurtSettings:
+    """Returns the active settings, creating the defaults on first access."""
+    global _settings
+    if _settings is None:
+        _settings = YogurtSettings()
+    return _settings
+
+
+def set_settings(settings: YogurtSettings) -> None:
+    """Replaces the active settings, e.g. with ones from `load_settings`."""
+    global _settings
+    _settings = settings
@@ -0,0 +1,13 @@
+SUMMARY_SYSTEM = (
+    "You maintain a running summary of a conversation. Fold the new lines into "
+    "the current summary and reply with the updated summary only. Keep names, "
+    "facts, decisions and open questions; drop pleasantries. Be concise."
+)
+
+SUMMARY_HUMAN = """Current summary:
+{summary}
+
+New lines of conversation:
+{new_lines}
+
+Updated summary:"""
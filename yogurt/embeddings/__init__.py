@@ -1,7 +1,9 @@
 from .base import BaseEmbedder, Embedding, Embeddings
+from .cache import EmbeddingCache
 
 __all__ = [
     "Embedding",
     "Embeddings",
     "BaseEmbedder",
+    "EmbeddingCache",
 ]
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, TypeAlias
 
@@ -15,3 +16,11 @@ class BaseEmbedder(ABC):
     @abstractmethod
     def embed_query(self, text: str) -> Embedding:
         pass
+
+    async def aembed_documents(self, texts: List[str]) -> Embeddings:
+        """Asynchronously embeds documents. Runs the sync method in a thread by default."""
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> Embedding:
+        """Asynchronously embeds a query. Runs the sync method in a thread by default."""
+        return await asyncio.to_thread(self.embed_query, text)
@@ -0,0 +1,96 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_SELECT_CHUNK = 500
+"""Keys looked up per query, below SQLite's bound-parameter limit."""
+
+
+def content_hash(text: str) -> bytes:
+    """The SHA-256 digest of `text`, which identifies it in the cache."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    A persistent embedding cache backed by SQLite, keyed by model name and
+    content hash, so unchanged text is never embedded twice by the same
+    model, across runs and across worker processes.
+
+    Vectors are stored as raw float32 bytes. Entries never expire, since an
+    embedding only changes with the model; call `clear` after replacing a
+    model under the same name.
+    """
+
+    def __init__(self, path: Union[str, Path] = ".yogurt_embeddings.db"):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for EmbeddingCache. Install with `pip install numpy`."
+            )
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "model TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, hash)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def get_many(self, model: str, keys: List[bytes]) -> Dict[bytes, "np.ndarray"]:
+        """The cached vectors among `keys`, as read-only float32 arrays."""
+        found: Dict[bytes, "np.ndarray"] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _SELECT_CHUNK):
+                chunk = unique[start : start + _SELECT_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embedding_cache WHERE model = ? AND hash IN "
+                    f"({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def set_many(self, model: str, items: Iterable[Tuple[bytes, "np.ndarray"]]) -> None:
+        rows = [
+            (model, key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (model, hash, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def clear(self, model: Optional[str] = None) -> None:
+        """Drops every entry, or only those of `model`."""
+        with self._lock:
+            if model is None:
+                self._conn.execute("DELETE FROM embedding_cache")
+            else:
+                self._conn.execute("DELETE FROM embedding_cache WHERE model = ?", (model,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,5 +1,10 @@
 from .base import BaseLLM
+from .resilience import HedgePolicy, ResilienceStats, ResilientLLM, RetryPolicy
 
 __all__ = [
     "BaseLLM",
+    "HedgePolicy",
+    "ResilienceStats",
+    "ResilientLLM",
+    "RetryPolicy",
 ]
@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Iterator, List
-from pydantic import Field, BaseModel, field_validator
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from pydantic import Field, BaseModel, PrivateAttr, field_validator
 
+from yogurt.caches.base import BaseLLMCache
+from yogurt.config.config import get_settings
 from yogurt.messages.base import HumanMessage
 from yogurt.output.streaming import StreamingChunk
 from yogurt.output.base import LLMResult
 from yogurt.prompts.prompt_value import PromptValue
 from yogurt.callback_handlers.base import BaseCallbackHandler
+from yogurt.tracing.base import Tracer, get_tracer
+from yogurt.utils.concurrency import SingleFlight, bounded_as_completed, bounded_gather
+from yogurt.utils.hashing import stable_hash
 
 
 class BaseLLM(BaseModel, ABC):
@@ -21,8 +37,35 @@ class BaseLLM(BaseModel, ABC):
     temperature: float = Field(default=0.7, description="The sampling temperature.")
     model_name: str = "default-model"
     callbacks: List[BaseCallbackHandler] = Field(default_factory=list, exclude=True)
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Default concurrency limit for batch calls. Falls back to "
+            "`YogurtSettings.max_concurrent_requests`."
+        ),
+    )
+    tracer: Optional[Tracer] = Field(
+        default=None,
+        exclude=True,
+        description="Tracer for request spans. Defaults to the process-wide tracer.",
+    )
+    cache: Optional[BaseLLMCache] = Field(
+        default=None,
+        exclude=True,
+        description="Response cache consulted when `YogurtSettings.cache_enabled`.",
+    )
+    coalesce_requests: bool = Field(
+        default=False,
+        description=(
+            "Share one upstream request between concurrent `agenerate`/`astream` "
+            "calls with an identical payload."
+        ),
+    )
     model_config = {"arbitrary_types_allowed": True}
 
+    _single_flight: SingleFlight = PrivateAttr(default_factory=SingleFlight)
+
     @abstractmethod
     def _generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
         """Core logic for model generation. Must be implemented by subclasses."""
@@ -32,9 +75,47 @@ class BaseLLM(BaseModel, ABC):
     #     """Generates a response from a structured PromptValue."""
     #     pass
 
+    async def _agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        """Core async generation logic. Raises error if not implemented."""
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support async generation."
+        )
+
+    def _identifying_payload(self, prompt: PromptValue, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Returns everything that determines the model's response to `prompt`.
+        Used to key caches, so subclasses should return the full request
+        payload they would send.
+        """
+        return {
+            "llm": self.__class__.__name__,
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "prompt": prompt.model_dump(),
+            "kwargs": kwargs,
+        }
+
+    def _get_tracer(self) -> Tracer:
+        return self.tracer if self.tracer is not None else get_tracer()
+
+    def _active_cache(self) -> Optional[BaseLLMCache]:
+        if self.cache is not None and get_settings().cache_enabled:
+            return self.cache
+        return None
+
     def generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
         """Generates a response from a structured PromptValue."""
-        return self._generate(prompt, **kwargs)
+        cache = self._active_cache()
+        if cache is None:
+            return self._generate(prompt, **kwargs)
+
+        payload = self._identifying_payload(prompt, **kwargs)
+        cached = cache.lookup(prompt, payload)
+        if cached is not None:
+            return cached
+        result = self._generate(prompt, **kwargs)
+        cache.update(prompt, payload, result)
+        return result
 
     def invoke(self, input_str: str, **kwargs: Any) -> str:
         """Generates a response from a simple string input."""
@@ -50,10 +131,31 @@ class BaseLLM(BaseModel, ABC):
         )
 
     async def agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
-        """Asynchronously generates a response. Raises error if not implemented."""
-        raise NotImplementedError(
-            f"{self.__class__.__name__} does not support async generation."
-        )
+        """
+        Asynchronously generates a response from a structured PromptValue.
+
+        With `coalesce_requests`, concurrent calls with an identical payload
+        share one upstream request and all receive the same result object.
+        """
+        cache = self._active_cache()
+        if cache is None and not self.coalesce_requests:
+            return await self._agenerate(prompt, **kwargs)
+
+        payload = self._identifying_payload(prompt, **kwargs)
+        if cache is not None:
+            cached = await cache.alookup(prompt, payload)
+            if cached is not None:
+                return cached
+
+        async def call() -> LLMResult:
+            result = await self._agenerate(prompt, **kwargs)
+            if cache is not None:
+                await cache.aupdate(prompt, payload, result)
+            return result
+
+        if not self.coalesce_requests:
+            return await call()
+        return await self._single_flight.do(stable_hash(payload), call)
 
     async def ainvoke(self, input_str: str, **kwargs: Any) -> str:
         """Asynchronously generates a response from a string."""
@@ -61,15 +163,110 @@ class BaseLLM(BaseModel, ABC):
         result = await self.agenerate(prompt, **kwargs)
         return result.generations[0].text
 
-    async def astream(
+    async def _astream(
         self, prompt: PromptValue, **kwargs: Any
     ) -> AsyncIterator[StreamingChunk]:
-        """Asynchronously streams response chunks. Raises error if not implemented."""
+        """Core async streaming logic. Raises error if not implemented."""
         raise NotImplementedError(
             f"{self.__class__.__name__} does not support async streaming."
         )
         yield
 
+    async def astream(
+        self, prompt: PromptValue, **kwargs: Any
+    ) -> AsyncIterator[StreamingChunk]:
+        """
+        Asynchronously streams response chunks.
+
+        With `coalesce_requests`, concurrent streams with an identical payload
+        share one upstream stream and every caller receives every chunk.
+        """
+        if not self.coalesce_requests:
+            async for chunk in self._astream(prompt, **kwargs):
+                yield chunk
+            return
+
+        key = stable_hash(self._identifying_payload(prompt, **kwargs))
+        async for chunk in self._single_flight.stream(
+            key, lambda: self._astream(prompt, **kwargs)
+        ):
+            yield chunk
+
+    # --- Batch methods ---
+    def batch_concurrency(self, max_concurrency: Optional[int] = None) -> int:
+        """Resolves the concurrency limit used by the batch methods."""
+        return (
+            max_concurrency
+            or self.max_concurrency
+            or get_settings().max_concurrent_requests
+        )
+
+    def batch(
+        self,
+        prompts: Iterable[PromptValue],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> List[LLMResult | Exception]:
+        """
+        Generates responses for many prompts on a bounded thread pool.
+
+        Results are returned in input order. With `return_exceptions` (the
+        default), a failed prompt puts its exception in its slot instead of
+        failing the whole batch.
+        """
+
+        def call(prompt: PromptValue) -> LLMResult | Exception:
+            try:
+                return self.generate(prompt, **kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(
+            max_workers=self.batch_concurrency(max_concurrency)
+        ) as executor:
+            return list(executor.map(call, prompts))
+
+    async def abatch(
+        self,
+        prompts: Iterable[PromptValue] | AsyncIterable[PromptValue],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> List[LLMResult | Exception]:
+        """
+        Asynchronously generates responses for many prompts with at most
+        `max_concurrency` requests in flight, returning them in input order.
+        """
+        return await bounded_gather(
+            lambda prompt: self.agenerate(prompt, **kwargs),
+            prompts,
+            self.batch_concurrency(max_concurrency),
+            return_exceptions=return_exceptions,
+        )
+
+    async def abatch_as_completed(
+        self,
+        prompts: Iterable[PromptValue] | AsyncIterable[PromptValue],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[int, LLMResult | Exception]]:
+        """
+        Like `abatch`, but yields `(index, result)` pairs as soon as each
+        prompt finishes. Prompts are pulled lazily, so large generators are
+        never fully materialized.
+        """
+        async for index, result in bounded_as_completed(
+            lambda prompt: self.agenerate(prompt, **kwargs),
+            prompts,
+            self.batch_concurrency(max_concurrency),
+            return_exceptions=return_exceptions,
+        ):
+            yield index, result
+
     @field_validator("temperature")
     @classmethod
     def check_temperature(cls, v: float) -> float:
@@ -1,4 +1,18 @@
 from .base import OllamaLLM
 from .chat import OllamaChat
+from .embeddings import OllamaEmbedder
+from .pool import OllamaPool
+from .session import OllamaSession
+from .warmup import ColdStartMetric, ModelWarmer, WarmupConfig, WarmupModel
 
-__all__ = ["OllamaLLM", "OllamaChat"]
+__all__ = [
+    "OllamaLLM",
+    "OllamaChat",
+    "OllamaEmbedder",
+    "OllamaPool",
+    "OllamaSession",
+    "ColdStartMetric",
+    "ModelWarmer",
+    "WarmupConfig",
+    "WarmupModel",
+]
@@ -1,18 +1,89 @@
+import asyncio
 import httpx
-import json
-from typing import Any, AsyncIterator, Iterator, List, Optional
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from pydantic import Field, PrivateAttr
 
 from yogurt.llms.base import BaseLLM
+from yogurt.llms.ollama.client import client_registry
+from yogurt.llms.ollama.pool import OllamaPool
 from yogurt.output.base import Generation, LLMResult
+from yogurt.output.streaming import StreamingChunk
 from yogurt.prompts.prompt_value import PromptValue
 from yogurt.messages.base import HumanMessage
+from yogurt.tracing.base import NOOP_TRACE, Trace
 from yogurt.types.api import APIRequest, APIResponse
+from yogurt.utils.ndjson import NDJSONDecoder
+
+T = TypeVar("T")
+
+
+class _StreamTimer:
+    """
+    Decodes and parses stream bytes, timing both when the trace is enabled.
+    Time to first byte is recorded when the first bytes arrive.
+    """
+
+    __slots__ = ("trace", "start", "first", "decode_time", "parse_time", "count")
+
+    def __init__(self, trace: Trace, start: float):
+        self.trace = trace
+        self.start = start
+        self.first = True
+        self.decode_time = 0.0
+        self.parse_time = 0.0
+        self.count = 0
+
+    def decode(self, decoder: NDJSONDecoder, data: bytes) -> List[Dict[str, Any]]:
+        if self.first:
+            self.first = False
+            self.trace.add_span(
+                "time_to_first_byte", self.start, time.perf_counter() - self.start
+            )
+        if not self.trace.enabled:
+            return decoder.feed(data)
+        t0 = time.perf_counter()
+        values = decoder.feed(data)
+        self.decode_time += time.perf_counter() - t0
+        self.count += len(values)
+        return values
+
+    def parse(self, value: Dict[str, Any], parse: Callable[[Dict[str, Any]], T]) -> T:
+        if not self.trace.enabled:
+            return parse(value)
+        t0 = time.perf_counter()
+        result = parse(value)
+        self.parse_time += time.perf_counter() - t0
+        return result
+
+    def finish(self) -> None:
+        if self.trace.enabled:
+            self.trace.add_span("decode", self.start, self.decode_time, lines=self.count)
+            self.trace.add_span("parse", self.start, self.parse_time, lines=self.count)
+
 
 class OllamaLLM(BaseLLM):
     """
     An LLM class that integrates with an Ollama service via direct API calls
     to the /api/generate endpoint. This class is best for simple, non-chat
     completions.
+
+    Requests go through long-lived, connection-pooled httpx clients that are
+    shared by every OllamaLLM pointing at the same host. Use the instance as a
+    (async) context manager, or call `close()`/`aclose()`, to release them.
+    Attach an `OllamaPool` to spread requests across several hosts.
     """
 
     model_config = {
@@ -20,11 +91,265 @@ class OllamaLLM(BaseLLM):
     }
 
     host: str = "http://localhost:11434"
+    timeout: float = Field(default=120.0, gt=0, description="Request timeout in seconds.")
+    connect_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds allowed to establish a connection. Defaults to `timeout`.",
+    )
+    read_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds allowed between received bytes, including the wait for the "
+            "first one. Defaults to `timeout`."
+        ),
+    )
+    max_connections: int = Field(
+        default=100, ge=1, description="Maximum concurrent connections to the host."
+    )
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Idle connections kept open for reuse."
+    )
+    keepalive_expiry: float = Field(
+        default=30.0, ge=0, description="Seconds an idle connection is kept alive."
+    )
+    keep_alive: Optional[Union[str, float]] = Field(
+        default=None,
+        description=(
+            "How long Ollama keeps the model loaded after a request, e.g. '30m' "
+            "or seconds; -1 keeps it loaded. Defaults to the server setting."
+        ),
+    )
+
+    pool: Optional[OllamaPool] = Field(
+        default=None,
+        exclude=True,
+        description="Routes requests across several hosts. Overrides `host` when set.",
+    )
+
+    _clients: Dict[str, httpx.Client] = PrivateAttr(default_factory=dict)
+    _async_clients: Dict[str, httpx.AsyncClient] = PrivateAttr(default_factory=dict)
+    _async_loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """The connection pool limits used for this LLM's clients."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeouts(self) -> httpx.Timeout:
+        """The per-phase timeouts applied to every request."""
+        return httpx.Timeout(
+            self.timeout,
+            connect=self.connect_timeout or self.timeout,
+            read=self.read_timeout or self.timeout,
+        )
 
-    def _build_payload(self, prompt: PromptValue, stream: bool, **kwargs: Any) -> dict:
+    def _get_client(self, host: str) -> httpx.Client:
+        """Lazily acquires the shared sync client for `host`."""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = client_registry.acquire(host, self.limits)
+            self._clients[host] = client
+        return client
+
+    def _get_async_client(self, host: str) -> httpx.AsyncClient:
+        """Lazily acquires the shared async client for `host` on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            if self._async_loop is not None:
+                # The previous loop is gone (e.g. a second `asyncio.run`), so
+                # only the references are dropped; the clients cannot be awaited.
+                for old_host in self._async_clients:
+                    client_registry.detach_async(old_host, self.limits, self._async_loop)
+            self._async_clients = {}
+            self._async_loop = loop
+        client = self._async_clients.get(host)
+        if client is None or client.is_closed:
+            client = client_registry.acquire_async(host, self.limits)
+            self._async_clients[host] = client
+        return client
+
+    @contextmanager
+    def _route(self) -> Iterator[str]:
+        """
+        Yields the host for the next request. With a pool attached, the
+        request counts as outstanding on that host until the block exits.
+        """
+        if self.pool is None:
+            yield self.host
+            return
+        with self.pool.lease(self.model_name) as host:
+            yield host
+
+    def close(self) -> None:
+        """Releases this LLM's references to the shared sync clients."""
+        for host in self._clients:
+            client_registry.release(host, self.limits)
+        self._clients = {}
+
+    async def aclose(self) -> None:
+        """Releases this LLM's references to the shared sync and async clients."""
+        for host in self._async_clients:
+            await client_registry.release_async(host, self.limits, loop=self._async_loop)
+        self._async_clients = {}
+        self._async_loop = None
+        self.close()
+
+    def __enter__(self) -> "OllamaLLM":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "OllamaLLM":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def batch_concurrency(self, max_concurrency: Optional[int] = None) -> int:
+        """
+        Caps batch concurrency at the connection pool size, so batches share
+        the pooled connections instead of queueing inside httpx.
+        """
+        return min(super().batch_concurrency(max_concurrency), self.max_connections)
+
+    def _post(
+        self, path: str, payload: Dict[str, Any], trace: Trace = NOOP_TRACE
+    ) -> Dict[str, Any]:
+        """Sends a non-streaming request and returns the decoded JSON body."""
+        trace.capture("request", payload)
+        with self._route() as host:
+            request = APIRequest(method="POST", url=f"{host}{path}", body=payload)
+            with trace.span("network_wait", url=request.url):
+                response = self._get_client(host).request(
+                    method=request.method,
+                    url=request.url,
+                    json=request.body,
+                    timeout=self.timeouts,
+                )
+                response.raise_for_status()
+            with trace.span("decode"):
+                body = response.json()
+        api_response = APIResponse(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            body=body,
+        )
+        trace.capture("response", api_response.body)
+        return api_response.body
+
+    async def _apost(
+        self, path: str, payload: Dict[str, Any], trace: Trace = NOOP_TRACE
+    ) -> Dict[str, Any]:
+        """Asynchronously sends a non-streaming request and returns the JSON body."""
+        trace.capture("request", payload)
+        with self._route() as host:
+            request = APIRequest(method="POST", url=f"{host}{path}", body=payload)
+            with trace.span("network_wait", url=request.url):
+                response = await self._get_async_client(host).request(
+                    method=request.method,
+                    url=request.url,
+                    json=request.body,
+                    timeout=self.timeouts,
+                )
+                response.raise_for_status()
+            with trace.span("decode"):
+                body = response.json()
+        api_response = APIResponse(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            body=body,
+        )
+        trace.capture("response", api_response.body)
+        return api_response.body
+
+    def _stream_lines(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        parse: Callable[[Dict[str, Any]], T],
+        trace: Trace = NOOP_TRACE,
+    ) -> Iterator[T]:
+        """
+        Sends a streaming request, decodes the NDJSON body straight from the
+        raw bytes and yields each value converted by `parse`.
+        """
+        trace.capture("request", payload)
+        with self._route() as host:
+            request = APIRequest(method="POST", url=f"{host}{path}", body=payload)
+            start = time.perf_counter()
+            with self._get_client(host).stream(
+                method=request.method,
+                url=request.url,
+                json=request.body,
+                timeout=self.timeouts,
+            ) as response:
+                trace.add_span(
+                    "network_wait", start, time.perf_counter() - start, url=request.url
+                )
+                response.raise_for_status()
+                timer = _StreamTimer(trace, start)
+                decoder = NDJSONDecoder()
+                for data in response.iter_bytes():
+                    for value in timer.decode(decoder, data):
+                        yield timer.parse(value, parse)
+                for value in decoder.flush():
+                    yield timer.parse(value, parse)
+                timer.finish()
+
+    async def _astream_lines(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        parse: Callable[[Dict[str, Any]], T],
+        trace: Trace = NOOP_TRACE,
+    ) -> AsyncIterator[T]:
+        """Async version of `_stream_lines`."""
+        trace.capture("request", payload)
+        with self._route() as host:
+            request = APIRequest(method="POST", url=f"{host}{path}", body=payload)
+            start = time.perf_counter()
+            async with self._get_async_client(host).stream(
+                method=request.method,
+                url=request.url,
+                json=request.body,
+                timeout=self.timeouts,
+            ) as response:
+                trace.add_span(
+                    "network_wait", start, time.perf_counter() - start, url=request.url
+                )
+                response.raise_for_status()
+                timer = _StreamTimer(trace, start)
+                decoder = NDJSONDecoder()
+                async for data in response.aiter_bytes():
+                    for value in timer.decode(decoder, data):
+                        yield timer.parse(value, parse)
+                for value in decoder.flush():
+                    yield timer.parse(value, parse)
+                timer.finish()
+
+    def _build_payload(
+        self,
+        prompt: PromptValue,
+        stream: bool,
+        context: Optional[List[int]] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+        raw: bool = True,
+        **kwargs: Any,
+    ) -> dict:
         """
         Helper to construct the JSON payload for the Ollama /api/generate endpoint.
-        Uses raw mode to prevent server-side templating.
+        Uses raw mode by default to prevent server-side templating. `context` is
+        the token array returned by an earlier response, continuing that
+        conversation; the server ignores it in raw mode, so pass `raw=False`
+        along with it.
         """
         full_prompt_str = prompt.to_string()
 
@@ -32,39 +357,31 @@ class OllamaLLM(BaseLLM):
             "model": self.model_name,
             "prompt": full_prompt_str,
             "stream": stream,
-            "raw": True,
+            "raw": raw,
             "options": {"temperature": self.temperature, **kwargs},
         }
+        if context:
+            payload["context"] = context
+        if keep_alive is None:
+            keep_alive = self.keep_alive
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
         return payload
 
+    def _identifying_payload(self, prompt: PromptValue, **kwargs: Any) -> Dict[str, Any]:
+        return self._build_payload(prompt, stream=False, **kwargs)
+
     def _generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
         """Generates a response using the /api/generate endpoint."""
-        payload = self._build_payload(prompt, stream=False, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/generate",
-            body=payload
-        )
-
-        print("\n--- Sending Payload to Ollama /api/generate ---")
-        print(json.dumps(request.body, indent=2))
-        print("---------------------------------")
-
-        with httpx.Client() as client:
-            response = client.request(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120
-            )
-            response.raise_for_status()
-            api_response = APIResponse(
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                body=response.json()
-            )
-        data = api_response.body
+        with self._get_tracer().start_trace("ollama.generate", model=self.model_name) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_payload(prompt, stream=False, **kwargs)
+            data = self._post("/api/generate", payload, trace)
+            with trace.span("parse"):
+                return self._to_result(data)
 
+    @staticmethod
+    def _to_result(data: Dict[str, Any]) -> LLMResult:
         generation = Generation(
             text=data.get("response", ""),
             metadata=data,
@@ -76,54 +393,45 @@ class OllamaLLM(BaseLLM):
         result = self.generate(prompt, **kwargs)
         return result.generations[0].text
 
-    def stream(self, prompt: PromptValue, **kwargs: Any) -> Iterator[dict]:
-        """Streams response chunks from the /api/generate endpoint."""
-        payload = self._build_payload(prompt, stream=True, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/generate",
-            body=payload
+    @staticmethod
+    def _to_chunk(chunk_data: Dict[str, Any]) -> StreamingChunk:
+        return StreamingChunk.trusted(
+            text=chunk_data.get("response", ""),
+            metadata=chunk_data,
         )
-        with httpx.Client() as client:
-            with client.stream(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120
-            ) as response:
-                for chunk in response.iter_lines():
-                    if chunk:
-                        yield json.loads(chunk)
-
-    async def agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
-        payload = self._build_payload(prompt, stream=False, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/generate",
-            body=payload
-        )
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120
-            )
-            response.raise_for_status()
-            api_response = APIResponse(
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                body=await response.json()
-            )
-        data = api_response.body
 
-        generation = Generation(
-            text=data.get("response", ""),
-            metadata=data,
-        )
-        return LLMResult(generations=[generation], llm_output=data)
+    def stream(self, prompt: PromptValue, **kwargs: Any) -> Iterator[StreamingChunk]:
+        """Streams response chunks from the /api/generate endpoint."""
+        with self._get_tracer().start_trace(
+            "ollama.generate.stream", model=self.model_name
+        ) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_payload(prompt, stream=True, **kwargs)
+            yield from self._stream_lines("/api/generate", payload, self._to_chunk, trace)
+
+    async def _agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        with self._get_tracer().start_trace("ollama.generate", model=self.model_name) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_payload(prompt, stream=False, **kwargs)
+            data = await self._apost("/api/generate", payload, trace)
+            with trace.span("parse"):
+                return self._to_result(data)
+
+    async def _astream(
+        self, prompt: PromptValue, **kwargs: Any
+    ) -> AsyncIterator[StreamingChunk]:
+        """Asynchronously streams response chunks from the /api/generate endpoint."""
+        with self._get_tracer().start_trace(
+            "ollama.generate.stream", model=self.model_name
+        ) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_payload(prompt, stream=True, **kwargs)
+            async for chunk in self._astream_lines(
+                "/api/generate", payload, self._to_chunk, trace
+            ):
+                yield chunk
 
     async def ainvoke(self, input_str: str, **kwargs: Any) -> str:
         prompt = PromptValue(text=input_str)
         result = await self.agenerate(prompt, **kwargs)
-        return result.generations[0].text
\ No newline at end of file
+        return result.generations[0].text
@@ -1,5 +1,3 @@
-import httpx
-import json
 from typing import Any, AsyncIterator, Iterator, List, Optional, Dict
 
 # Inherit from the base OllamaLLM class
@@ -9,7 +7,6 @@ from yogurt.output.streaming import StreamingChunk
 from yogurt.prompts.prompt_value import PromptValue
 from yogurt.messages.base import AIMessage
 from yogurt.tools.base import BaseTool
-from yogurt.types.api import APIRequest, APIResponse
 
 
 class OllamaChat(OllamaLLM):
@@ -38,36 +35,24 @@ class OllamaChat(OllamaLLM):
 
         if tools:
             payload["tools"] = [tool.get_schema() for tool in tools]
-        
-        print("\n--- Sending Payload to Ollama /api/chat ---")
-        print(json.dumps(payload, indent=2))
-        print("---------------------------------")
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
         return payload
 
+    def _identifying_payload(self, prompt: PromptValue, **kwargs: Any) -> Dict[str, Any]:
+        return self._build_chat_payload(prompt, stream=False, **kwargs)
+
     def _generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
         """Generates a chat completion using the /api/chat endpoint."""
-        payload = self._build_chat_payload(prompt, stream=False, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/chat",
-            body=payload,
-        )
-
-        with httpx.Client() as client:
-            response = client.request(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120,
-            )
-            response.raise_for_status()
-            api_response = APIResponse(
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                body=response.json(),
-            )
-        data = api_response.body
+        with self._get_tracer().start_trace("ollama.chat", model=self.model_name) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_chat_payload(prompt, stream=False, **kwargs)
+            data = self._post("/api/chat", payload, trace)
+            with trace.span("parse"):
+                return self._to_result(data)
 
+    @staticmethod
+    def _to_result(data: Dict[str, Any]) -> LLMResult:
         ai_message_data = data.get("message", {})
         ai_message = AIMessage(content=ai_message_data.get("content", ""))
 
@@ -77,83 +62,42 @@ class OllamaChat(OllamaLLM):
         )
         return LLMResult(generations=[generation], llm_output=data)
 
+    @staticmethod
+    def _to_chunk(chunk_data: Dict[str, Any]) -> StreamingChunk:
+        message_chunk = chunk_data.get("message", {})
+        return StreamingChunk.trusted(
+            text=message_chunk.get("content", ""),
+            metadata=chunk_data,
+        )
+
     def stream(self, prompt: PromptValue, **kwargs: Any) -> Iterator[StreamingChunk]:
         """Streams a chat completion from the /api/chat endpoint."""
-        payload = self._build_chat_payload(prompt, stream=True, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/chat",
-            body=payload,
-        )
-        with httpx.Client() as client:
-            with client.stream(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120
-            ) as response:
-                response.raise_for_status()
-                for line in response.iter_lines():
-                    if line:
-                        chunk_data = json.loads(line)
-                        message_chunk = chunk_data.get("message", {})
-                        yield StreamingChunk(
-                            text=message_chunk.get("content", ""),
-                            metadata=chunk_data,
-                        )
+        with self._get_tracer().start_trace(
+            "ollama.chat.stream", model=self.model_name
+        ) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_chat_payload(prompt, stream=True, **kwargs)
+            yield from self._stream_lines("/api/chat", payload, self._to_chunk, trace)
 
-    async def agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+    async def _agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
         """Asynchronously generates a chat completion using the /api/chat endpoint."""
-        payload = self._build_chat_payload(prompt, stream=False, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/chat",
-            body=payload,
-        )
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120,
-            )
-            response.raise_for_status()
-            api_response = APIResponse(
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                body=await response.json(),
-            )
-        data = api_response.body
+        with self._get_tracer().start_trace("ollama.chat", model=self.model_name) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_chat_payload(prompt, stream=False, **kwargs)
+            data = await self._apost("/api/chat", payload, trace)
+            with trace.span("parse"):
+                return self._to_result(data)
 
-        ai_message_data = data.get("message", {})
-        ai_message = AIMessage(content=ai_message_data.get("content", ""))
-
-        generation = Generation(text=ai_message.content, metadata=data)
-        return LLMResult(generations=[generation], llm_output=data)
-
-    async def astream(
+    async def _astream(
         self, prompt: PromptValue, **kwargs: Any
     ) -> AsyncIterator[StreamingChunk]:
         """Asynchronously streams a chat completion from the /api/chat endpoint."""
-        payload = self._build_chat_payload(prompt, stream=True, **kwargs)
-        request = APIRequest(
-            method="POST",
-            url=f"{self.host}/api/chat",
-            body=payload,
-        )
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                method=request.method,
-                url=request.url,
-                json=request.body,
-                timeout=120,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line:
-                        chunk_data = json.loads(line)
-                        message_chunk = chunk_data.get("message", {})
-                        yield StreamingChunk(
-                            text=message_chunk.get("content", ""),
-                            metadata=chunk_data,
-                        )
+        with self._get_tracer().start_trace(
+            "ollama.chat.stream", model=self.model_name
+        ) as trace:
+            with trace.span("payload_build"):
+                payload = self._build_chat_payload(prompt, stream=True, **kwargs)
+            async for chunk in self._astream_lines(
+                "/api/chat", payload, self._to_chunk, trace
+            ):
+                yield chunk
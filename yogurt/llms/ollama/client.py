@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+ClientKey = Tuple[str, Optional[int], Optional[int], Optional[float]]
+
+
+class _SharedClient:
+    """A pooled client plus the number of LLM instances currently using it."""
+
+    def __init__(self, client: httpx.Client | httpx.AsyncClient):
+        self.client = client
+        self.refs = 0
+
+
+class OllamaClientRegistry:
+    """
+    Process-wide registry of pooled httpx clients, shared per host.
+
+    Every LLM that talks to the same host with the same pool limits gets the
+    same underlying client, so keep-alive connections are reused across pipes
+    instead of each request paying for a fresh TCP handshake. Clients are
+    reference counted and closed once the last user releases them.
+
+    Async clients are bound to the event loop that created them, so they are
+    tracked per loop as well as per host.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[ClientKey, _SharedClient] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, _SharedClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @staticmethod
+    def key(host: str, limits: httpx.Limits) -> ClientKey:
+        return (
+            host.rstrip("/"),
+            limits.max_connections,
+            limits.max_keepalive_connections,
+            limits.keepalive_expiry,
+        )
+
+    def acquire(self, host: str, limits: httpx.Limits) -> httpx.Client:
+        """Returns the shared sync client for `host`, creating it if needed."""
+        key = self.key(host, limits)
+        with self._lock:
+            shared = self._clients.get(key)
+            if shared is None or shared.client.is_closed:
+                shared = _SharedClient(httpx.Client(limits=limits))
+                self._clients[key] = shared
+            shared.refs += 1
+            return shared.client
+
+    def release(self, host: str, limits: httpx.Limits) -> None:
+        """Drops one reference to the sync client, closing it when unused."""
+        key = self.key(host, limits)
+        with self._lock:
+            shared = self._clients.get(key)
+            if shared is None:
+                return
+            shared.refs -= 1
+            if shared.refs > 0:
+                return
+            del self._clients[key]
+        shared.client.close()
+
+    def acquire_async(self, host: str, limits: httpx.Limits) -> httpx.AsyncClient:
+        """
+        Returns the shared async client for `host` on the running event loop.
+        Must be called from within a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        key = self.key(host, limits)
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            shared = clients.get(key)
+            if shared is None or shared.client.is_closed:
+                shared = _SharedClient(httpx.AsyncClient(limits=limits))
+                clients[key] = shared
+            shared.refs += 1
+            return shared.client
+
+    def detach_async(
+        self, host: str, limits: httpx.Limits, loop: asyncio.AbstractEventLoop
+    ) -> Optional[httpx.AsyncClient]:
+        """
+        Drops one reference to the async client bound to `loop` without
+        closing it. Returns the client if this was the last reference.
+        """
+        key = self.key(host, limits)
+        with self._lock:
+            clients = self._async_clients.get(loop, {})
+            shared = clients.get(key)
+            if shared is None:
+                return None
+            shared.refs -= 1
+            if shared.refs > 0:
+                return None
+            del clients[key]
+            return shared.client
+
+    async def release_async(
+        self,
+        host: str,
+        limits: httpx.Limits,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        """Drops one reference to the async client, closing it when unused."""
+        running = asyncio.get_running_loop()
+        client = self.detach_async(host, limits, loop or running)
+        # A client from a loop that has since closed cannot be awaited on;
+        # its connections died with the loop.
+        if client is not None and (loop is None or loop is running):
+            await client.aclose()
+
+
+client_registry = OllamaClientRegistry()
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from yogurt.embeddings.base import BaseEmbedder
+from yogurt.embeddings.cache import EmbeddingCache, content_hash
+from yogurt.llms.ollama.base import OllamaLLM
+from yogurt.llms.ollama.pool import OllamaPool
+from yogurt.utils.concurrency import bounded_as_completed, bounded_map_threaded
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_Batch = List[Tuple[bytes, str]]
+
+
+class OllamaEmbedder(BaseEmbedder):
+    """
+    Embeds text with an Ollama embedding model through the /api/embed
+    endpoint, returning float32 arrays.
+
+    `embed_documents` splits its input into requests of `batch_size` texts
+    and sends up to `max_concurrency` of them at once, over the same shared,
+    connection-pooled clients (and optional `OllamaPool`) as `OllamaLLM`.
+    Repeated texts within a call are embedded once. With a `cache`, texts
+    this model has embedded before are served from disk, and each batch is
+    cached as soon as it returns, so an interrupted job resumes where it
+    stopped.
+    """
+
+    def __init__(
+        self,
+        model: str = "nomic-embed-text",
+        host: str = "http://localhost:11434",
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 64,
+        max_concurrency: Optional[int] = None,
+        truncate: bool = True,
+        keep_alive: Optional[Union[str, float]] = None,
+        timeout: float = 120.0,
+        max_connections: int = 100,
+        pool: Optional[OllamaPool] = None,
+    ):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for OllamaEmbedder. Install with `pip install numpy`."
+            )
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.model = model
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.truncate = truncate
+        # Only used as the transport: shared clients, pool routing and timeouts.
+        self._llm = OllamaLLM(
+            model_name=model,
+            host=host,
+            timeout=timeout,
+            max_connections=max_connections,
+            keep_alive=keep_alive,
+            pool=pool,
+        )
+
+    def close(self) -> None:
+        self._llm.close()
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
+
+    def __enter__(self) -> "OllamaEmbedder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "OllamaEmbedder":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _payload(self, texts: List[str]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": self.model, "input": texts, "truncate": self.truncate}
+        if self._llm.keep_alive is not None:
+            payload["keep_alive"] = self._llm.keep_alive
+        return payload
+
+    @staticmethod
+    def _to_vectors(body: Dict[str, Any], expected: int) -> "np.ndarray":
+        vectors = np.asarray(body.get("embeddings", []), dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != expected:
+            raise ValueError(
+                f"Expected {expected} embeddings from /api/embed, got shape {vectors.shape}"
+            )
+        return vectors
+
+    def _plan(self, texts: List[str]) -> Tuple[List[bytes], Dict[bytes, "np.ndarray"], List[_Batch]]:
+        """
+        Hashes `texts` and looks them up in the cache. Returns the keys in
+        input order, the vectors found, and batches of what is left.
+        """
+        keys = [content_hash(text) for text in texts]
+        found = self.cache.get_many(self.model, keys) if self.cache is not None else {}
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        items = list(missing.items())
+        batches = [
+            items[start : start + self.batch_size]
+            for start in range(0, len(items), self.batch_size)
+        ]
+        return keys, found, batches
+
+    def _store(self, batch: _Batch, vectors: "np.ndarray", found: Dict[bytes, "np.ndarray"]) -> None:
+        keys = [key for key, _ in batch]
+        found.update(zip(keys, vectors))
+        if self.cache is not None:
+            self.cache.set_many(self.model, zip(keys, vectors))
+
+    @staticmethod
+    def _assemble(keys: List[bytes], found: Dict[bytes, "np.ndarray"]) -> "np.ndarray":
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def _embed_batch(self, batch: _Batch) -> "np.ndarray":
+        body = self._llm._post("/api/embed", self._payload([text for _, text in batch]))
+        return self._to_vectors(body, len(batch))
+
+    async def _aembed_batch(self, batch: _Batch) -> "np.ndarray":
+        body = await self._llm._apost("/api/embed", self._payload([text for _, text in batch]))
+        return self._to_vectors(body, len(batch))
+
+    def embed_documents(self, texts: List[str]) -> "np.ndarray":
+        """Embeds `texts` into a `(len(texts), dim)` float32 array."""
+        keys, found, batches = self._plan(texts)
+        if len(batches) == 1:
+            self._store(batches[0], self._embed_batch(batches[0]), found)
+        elif batches:
+            limit = self._llm.batch_concurrency(self.max_concurrency)
+            for index, vectors in bounded_map_threaded(self._embed_batch, batches, limit):
+                self._store(batches[index], vectors, found)
+        return self._assemble(keys, found)
+
+    def embed_query(self, text: str) -> "np.ndarray":
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> "np.ndarray":
+        keys, found, batches = (
+            await asyncio.to_thread(self._plan, texts) if self.cache is not None else self._plan(texts)
+        )
+        limit = self._llm.batch_concurrency(self.max_concurrency)
+        async for index, vectors in bounded_as_completed(self._aembed_batch, batches, limit):
+            if self.cache is not None:
+                await asyncio.to_thread(self._store, batches[index], vectors, found)
+            else:
+                self._store(batches[index], vectors, found)
+        return self._assemble(keys, found)
+
+    async def aembed_query(self, text: str) -> "np.ndarray":
+        return (await self.aembed_documents([text]))[0]
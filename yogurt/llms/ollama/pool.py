@@ -0,0 +1,277 @@
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Set
+
+import httpx
+from pydantic import BaseModel, Field
+
+
+class HostStatus(BaseModel):
+    """A point-in-time view of one host in an OllamaPool."""
+
+    host: str
+    healthy: bool
+    outstanding: int
+    consecutive_failures: int
+    loaded_models: List[str] = Field(default_factory=list)
+    last_checked: Optional[float] = None
+    """Unix timestamp of the last health check."""
+
+
+class _Host:
+    __slots__ = (
+        "url",
+        "healthy",
+        "outstanding",
+        "failures",
+        "loaded_models",
+        "last_checked",
+    )
+
+    def __init__(self, url: str):
+        self.url = url
+        self.healthy = True
+        self.outstanding = 0
+        self.failures = 0
+        self.loaded_models: Set[str] = set()
+        self.last_checked: Optional[float] = None
+
+
+_leased_hosts: ContextVar[Optional[Set[str]]] = ContextVar(
+    "ollama_leased_hosts", default=None
+)
+
+
+@contextmanager
+def spread_across_hosts() -> Iterator[None]:
+    """
+    Makes pool leases inside the block prefer hosts not yet leased in it, so
+    retries and hedged duplicates of one request land on different hosts.
+    Tasks started inside the block share it.
+    """
+    token = _leased_hosts.set(set())
+    try:
+        yield
+    finally:
+        _leased_hosts.reset(token)
+
+
+def model_key(name: str) -> str:
+    """Normalizes a model name the way Ollama does, e.g. `llama3` -> `llama3:latest`."""
+    return name if ":" in name else f"{name}:latest"
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """
+    Whether an error says something about the host rather than the request:
+    transport errors and 5xx responses count, 4xx responses do not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class OllamaPool:
+    """
+    Routes requests across several Ollama hosts.
+
+    Each request goes to the healthy host with the fewest outstanding
+    requests. Hosts that do not have the model loaded are charged an extra
+    `cold_penalty`, so warm hosts are preferred until they are that much
+    busier. A host is ejected after `failure_threshold` consecutive failures
+    and re-admitted when a health check succeeds. Health checks poll
+    `/api/ps`, which also refreshes which models each host has loaded.
+
+    Attach a pool to `OllamaLLM` or `OllamaChat` via their `pool` field.
+    Background checks run on asyncio between `start()` and `stop()`;
+    `check_health()` runs one round synchronously.
+    """
+
+    def __init__(
+        self,
+        hosts: List[str],
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 2.0,
+        failure_threshold: int = 3,
+        cold_penalty: int = 2,
+    ):
+        if not hosts:
+            raise ValueError("OllamaPool needs at least one host")
+        self._hosts = [_Host(host.rstrip("/")) for host in hosts]
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.failure_threshold = failure_threshold
+        self.cold_penalty = cold_penalty
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def hosts(self) -> List[str]:
+        return [host.url for host in self._hosts]
+
+    def status(self) -> List[HostStatus]:
+        with self._lock:
+            return [
+                HostStatus(
+                    host=host.url,
+                    healthy=host.healthy,
+                    outstanding=host.outstanding,
+                    consecutive_failures=host.failures,
+                    loaded_models=sorted(host.loaded_models),
+                    last_checked=host.last_checked,
+                )
+                for host in self._hosts
+            ]
+
+    def _get(self, url: str) -> _Host:
+        for host in self._hosts:
+            if host.url == url:
+                return host
+        raise KeyError(url)
+
+    def _select(self, model: str, exclude: Set[str]) -> _Host:
+        healthy = [h for h in self._hosts if h.healthy] or self._hosts
+        candidates = [h for h in healthy if h.url not in exclude] or healthy
+        # Rotating the starting point spreads ties across hosts.
+        offset = next(self._rotation) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        key = model_key(model)
+        return min(
+            rotated,
+            key=lambda h: h.outstanding
+            + (0 if key in h.loaded_models else self.cold_penalty),
+        )
+
+    def select(self, model: str, exclude: Optional[Set[str]] = None) -> str:
+        """
+        Returns the host a request for `model` would be routed to now.
+        Hosts in `exclude` are only chosen if no other healthy host is left.
+        """
+        with self._lock:
+            return self._select(model, exclude or set()).url
+
+    @contextmanager
+    def lease(self, model: str, exclude: Optional[Set[str]] = None) -> Iterator[str]:
+        """
+        Picks a host for `model` and counts the request as outstanding on it
+        until the block exits. The outcome is recorded for ejection.
+        """
+        leased = _leased_hosts.get()
+        if leased:
+            exclude = leased | (exclude or set())
+        with self._lock:
+            host = self._select(model, exclude or set())
+            host.outstanding += 1
+        if leased is not None:
+            leased.add(host.url)
+        try:
+            yield host.url
+        except BaseException as e:
+            if is_host_failure(e):
+                self.record_failure(host.url)
+            raise
+        else:
+            self.record_success(host.url, model)
+        finally:
+            with self._lock:
+                host.outstanding -= 1
+
+    def record_success(self, url: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            host = self._get(url)
+            host.failures = 0
+            host.healthy = True
+            if model:
+                host.loaded_models.add(model_key(model))
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            host = self._get(url)
+            host.failures += 1
+            if host.failures >= self.failure_threshold:
+                host.healthy = False
+
+    def mark_loaded(self, url: str, models: List[str]) -> None:
+        """Replaces what the pool believes `url` has loaded."""
+        with self._lock:
+            self._get(url).loaded_models = {model_key(m) for m in models}
+
+    def _apply_health(self, url: str, body: Optional[dict]) -> None:
+        with self._lock:
+            host = self._get(url)
+            host.last_checked = time.time()
+            if not isinstance(body, dict):
+                host.failures += 1
+                if host.failures >= self.failure_threshold:
+                    host.healthy = False
+                return
+            host.failures = 0
+            host.healthy = True
+            names = (
+                model.get("name") or model.get("model")
+                for model in body.get("models") or []
+                if isinstance(model, dict)
+            )
+            # Entries without a name are skipped rather than failing the check.
+            host.loaded_models = {model_key(name) for name in names if isinstance(name, str)}
+
+    def check_health(self) -> List[HostStatus]:
+        """Runs one round of health checks synchronously."""
+        with httpx.Client(timeout=self.health_check_timeout) as client:
+            for url in self.hosts:
+                try:
+                    response = client.get(f"{url}/api/ps")
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError):
+                    body = None
+                self._apply_health(url, body)
+        return self.status()
+
+    async def acheck_health(self) -> List[HostStatus]:
+        """Runs one round of health checks against all hosts concurrently."""
+        async with httpx.AsyncClient(timeout=self.health_check_timeout) as client:
+
+            async def check(url: str) -> None:
+                try:
+                    response = await client.get(f"{url}/api/ps")
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError):
+                    body = None
+                self._apply_health(url, body)
+
+            await asyncio.gather(*(check(url) for url in self.hosts))
+        return self.status()
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await self.acheck_health()
+            await asyncio.sleep(self.health_check_interval)
+
+    async def start(self) -> None:
+        """Starts background health checks on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_health_checks())
+
+    async def stop(self) -> None:
+        """Stops background health checks."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "OllamaPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
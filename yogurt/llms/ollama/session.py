@@ -0,0 +1,233 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+from yogurt.llms.ollama.base import OllamaLLM
+from yogurt.output.base import LLMResult
+from yogurt.output.streaming import StreamingChunk
+from yogurt.prompts.prompt_value import PromptValue
+
+
+class OllamaSession:
+    """
+    A multi-turn conversation on /api/generate that reuses Ollama's KV cache.
+
+    Every completion returns a `context` token array covering the prompt and
+    the response. The session sends it back with the next prompt, so the
+    server only evaluates the new tokens instead of re-reading the whole
+    conversation. `keep_alive` is sent with every call to keep the model
+    loaded between turns; `unload()` releases it early.
+
+    Session requests are not sent in raw mode, since Ollama only accepts and
+    returns `context` when it applies the model's prompt template itself.
+
+    When the server rejects the context, or the LLM's model has changed
+    since it was produced, the session sends the full transcript instead,
+    with turns joined by `separator`, and continues from the context of
+    that response.
+
+    Calls on one session must not overlap.
+    """
+
+    def __init__(
+        self,
+        llm: OllamaLLM,
+        keep_alive: Optional[Union[str, float]] = "30m",
+        separator: str = "\n\n",
+    ):
+        self.llm = llm
+        self.keep_alive = keep_alive
+        self.separator = separator
+        self.turns: List[Tuple[str, str]] = []
+        """(prompt, response) pairs in order, used to rebuild the full prompt."""
+        self.context_reuses = 0
+        self.full_prompts = 0
+        self._context: Optional[List[int]] = None
+        self._context_model: Optional[str] = None
+
+    @property
+    def context(self) -> Optional[List[int]]:
+        """The token array that the next call continues from, if usable."""
+        if self._context and self._context_model == self.llm.model_name:
+            return self._context
+        return None
+
+    def transcript(self) -> str:
+        return self.separator.join(
+            part for prompt, response in self.turns for part in (prompt, response)
+        )
+
+    def reset(self) -> None:
+        """Forgets the conversation. The model stays loaded."""
+        self.turns = []
+        self._context = None
+        self._context_model = None
+
+    @staticmethod
+    def _text(prompt: Union[str, PromptValue]) -> str:
+        return prompt if isinstance(prompt, str) else prompt.to_string()
+
+    def _payload(
+        self, text: str, stream: bool, use_context: bool, **kwargs: Any
+    ) -> Dict[str, Any]:
+        context = self.context if use_context else None
+        if context is None and self.turns:
+            text = self.transcript() + self.separator + text
+        return self.llm._build_payload(
+            PromptValue(text=text),
+            stream=stream,
+            context=context,
+            keep_alive=self.keep_alive,
+            raw=False,
+            **kwargs,
+        )
+
+    def _record(
+        self, text: str, response: str, data: Dict[str, Any], payload: Dict[str, Any]
+    ) -> None:
+        if "context" in payload:
+            self.context_reuses += 1
+        else:
+            self.full_prompts += 1
+        self.turns.append((text, response))
+        self._context = data.get("context")
+        self._context_model = self.llm.model_name
+
+    def _should_fall_back(self, error: Exception, payload: Dict[str, Any]) -> bool:
+        """A request carrying a context failed with an HTTP error response."""
+        if "context" not in payload or not isinstance(error, httpx.HTTPStatusError):
+            return False
+        self._context = None
+        return True
+
+    def generate(self, prompt: Union[str, PromptValue], **kwargs: Any) -> LLMResult:
+        """Sends the next turn and returns the model's response."""
+        text = self._text(prompt)
+        with self.llm._get_tracer().start_trace(
+            "ollama.session", model=self.llm.model_name
+        ) as trace:
+            payload = self._payload(text, stream=False, use_context=True, **kwargs)
+            try:
+                data = self.llm._post("/api/generate", payload, trace)
+            except Exception as e:
+                if not self._should_fall_back(e, payload):
+                    raise
+                payload = self._payload(text, stream=False, use_context=False, **kwargs)
+                data = self.llm._post("/api/generate", payload, trace)
+            trace.set("context_reused", "context" in payload)
+        result = OllamaLLM._to_result(data)
+        self._record(text, result.generations[0].text, data, payload)
+        return result
+
+    async def agenerate(
+        self, prompt: Union[str, PromptValue], **kwargs: Any
+    ) -> LLMResult:
+        """Asynchronously sends the next turn and returns the model's response."""
+        text = self._text(prompt)
+        with self.llm._get_tracer().start_trace(
+            "ollama.session", model=self.llm.model_name
+        ) as trace:
+            payload = self._payload(text, stream=False, use_context=True, **kwargs)
+            try:
+                data = await self.llm._apost("/api/generate", payload, trace)
+            except Exception as e:
+                if not self._should_fall_back(e, payload):
+                    raise
+                payload = self._payload(text, stream=False, use_context=False, **kwargs)
+                data = await self.llm._apost("/api/generate", payload, trace)
+            trace.set("context_reused", "context" in payload)
+        result = OllamaLLM._to_result(data)
+        self._record(text, result.generations[0].text, data, payload)
+        return result
+
+    def stream(
+        self, prompt: Union[str, PromptValue], **kwargs: Any
+    ) -> Iterator[StreamingChunk]:
+        """
+        Streams the next turn. The turn is recorded once the final chunk has
+        arrived; an abandoned stream leaves the session unchanged.
+        """
+        text = self._text(prompt)
+        with self.llm._get_tracer().start_trace(
+            "ollama.session.stream", model=self.llm.model_name
+        ) as trace:
+            payload = self._payload(text, stream=True, use_context=True, **kwargs)
+            chunks = self.llm._stream_lines(
+                "/api/generate", payload, OllamaLLM._to_chunk, trace
+            )
+            try:
+                first = next(chunks, None)
+            except Exception as e:
+                if not self._should_fall_back(e, payload):
+                    raise
+                payload = self._payload(text, stream=True, use_context=False, **kwargs)
+                chunks = self.llm._stream_lines(
+                    "/api/generate", payload, OllamaLLM._to_chunk, trace
+                )
+                first = next(chunks, None)
+            trace.set("context_reused", "context" in payload)
+            if first is None:
+                return
+            parts = [first.text]
+            last = first
+            try:
+                yield first
+                for chunk in chunks:
+                    parts.append(chunk.text)
+                    last = chunk
+                    yield chunk
+            finally:
+                chunks.close()
+        self._record(text, "".join(parts), last.metadata, payload)
+
+    async def astream(
+        self, prompt: Union[str, PromptValue], **kwargs: Any
+    ) -> AsyncIterator[StreamingChunk]:
+        """Async version of `stream`."""
+        text = self._text(prompt)
+        with self.llm._get_tracer().start_trace(
+            "ollama.session.stream", model=self.llm.model_name
+        ) as trace:
+            payload = self._payload(text, stream=True, use_context=True, **kwargs)
+            chunks = self.llm._astream_lines(
+                "/api/generate", payload, OllamaLLM._to_chunk, trace
+            )
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                await chunks.aclose()
+                if not self._should_fall_back(e, payload):
+                    raise
+                payload = self._payload(text, stream=True, use_context=False, **kwargs)
+                chunks = self.llm._astream_lines(
+                    "/api/generate", payload, OllamaLLM._to_chunk, trace
+                )
+                try:
+                    first = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return
+            trace.set("context_reused", "context" in payload)
+            parts = [first.text]
+            last = first
+            try:
+                yield first
+                async for chunk in chunks:
+                    parts.append(chunk.text)
+                    last = chunk
+                    yield chunk
+            finally:
+                await chunks.aclose()
+        self._record(text, "".join(parts), last.metadata, payload)
+
+    def _unload_payload(self) -> Dict[str, Any]:
+        return {"model": self.llm.model_name, "keep_alive": 0}
+
+    def unload(self) -> None:
+        """Asks the server to unload the model now instead of after `keep_alive`."""
+        self.llm._post("/api/generate", self._unload_payload())
+
+    async def aunload(self) -> None:
+        """Async version of `unload`."""
+        await self.llm._apost("/api/generate", self._unload_payload())
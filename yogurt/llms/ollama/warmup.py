@@ -0,0 +1,316 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+from pydantic import BaseModel, Field, field_validator
+
+from yogurt.llms.ollama.client import client_registry
+from yogurt.llms.ollama.pool import OllamaPool, model_key
+from yogurt.tracing.base import Tracer, get_tracer
+from yogurt.utils.concurrency import bounded_gather
+
+
+class WarmupModel(BaseModel):
+    """One model to preload, and how."""
+
+    name: str
+    keep_alive: Union[str, float] = Field(
+        default=-1, description="How long to keep the model loaded; -1 pins it."
+    )
+    warm_prompt: str = Field(
+        default="Hi", description="Cheap prompt run once so the KV cache is allocated."
+    )
+
+
+class WarmupConfig(BaseModel):
+    """
+    Models to preload at startup. Load from a file with
+    `load_settings(WarmupConfig, "warmup.yaml")`; a model may be given as a
+    plain name or as a mapping with the fields of `WarmupModel`.
+    """
+
+    hosts: List[str] = Field(
+        default_factory=list,
+        description="Hosts to warm. Defaults to the pool's hosts, else localhost.",
+    )
+    models: List[WarmupModel] = Field(default_factory=list)
+    concurrency: int = Field(default=2, ge=1, description="Models loaded at once.")
+    timeout: float = Field(
+        default=600.0, gt=0, description="Seconds allowed for a load and warm prompt."
+    )
+    refresh_interval: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds between background checks that re-warm evicted models.",
+    )
+
+    @field_validator("models", mode="before")
+    @classmethod
+    def _names_to_models(cls, value: Any) -> Any:
+        if isinstance(value, list):
+            return [{"name": item} if isinstance(item, str) else item for item in value]
+        return value
+
+
+class ColdStartMetric(BaseModel):
+    """The outcome of warming one model on one host."""
+
+    host: str
+    model: str
+    was_loaded: bool
+    """Whether the model was already resident before warming."""
+    wall_seconds: float
+    """Time from sending the warm prompt to its response."""
+    load_seconds: Optional[float] = None
+    """Time the server spent loading the model, from its `load_duration`."""
+    timestamp: float
+    error: Optional[str] = None
+
+
+class ModelWarmer:
+    """
+    Preloads models on Ollama hosts so the first real request is not a cold
+    start.
+
+    For each configured model and host, `warm()` sends a one-token warm
+    prompt with the model's `keep_alive`, which loads the weights, allocates
+    the KV cache and pins the model. Cold-start time is recorded for every
+    warm in `metrics` and emitted as an `ollama.warmup` trace. Loaded models
+    are read from `/api/ps`; with a pool attached, its view of which host has
+    which model loaded is kept up to date.
+
+    Between `start()` and `stop()` a background task re-checks the hosts
+    every `refresh_interval` and re-warms models that were evicted.
+
+    Requests go through the shared clients of `client_registry`; the default
+    `limits` match `OllamaLLM`'s, so warming reuses the LLMs' connections.
+    """
+
+    def __init__(
+        self,
+        config: WarmupConfig,
+        pool: Optional[OllamaPool] = None,
+        tracer: Optional[Tracer] = None,
+        history: int = 1000,
+        limits: Optional[httpx.Limits] = None,
+    ):
+        self.config = config
+        self.pool = pool
+        self.tracer = tracer
+        self.limits = limits or httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+        )
+        self.hosts = [
+            host.rstrip("/")
+            for host in config.hosts or (pool.hosts if pool else ["http://localhost:11434"])
+        ]
+        if pool is not None:
+            unknown = sorted(set(self.hosts) - set(pool.hosts))
+            if unknown:
+                raise ValueError(f"Warmup hosts {unknown} are not in the attached pool")
+        self.metrics: Deque[ColdStartMetric] = deque(maxlen=history)
+        self.loaded: Dict[str, List[str]] = {}
+        """Models each host reported as loaded at the last check."""
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_tracer(self) -> Tracer:
+        return self.tracer if self.tracer is not None else get_tracer()
+
+    @contextmanager
+    def _client(self, host: str) -> Iterator[httpx.Client]:
+        client = client_registry.acquire(host, self.limits)
+        try:
+            yield client
+        finally:
+            client_registry.release(host, self.limits)
+
+    @asynccontextmanager
+    async def _aclient(self, host: str) -> AsyncIterator[httpx.AsyncClient]:
+        client = client_registry.acquire_async(host, self.limits)
+        try:
+            yield client
+        finally:
+            await client_registry.release_async(host, self.limits)
+
+    @staticmethod
+    def _warm_payload(model: WarmupModel) -> Dict[str, Any]:
+        return {
+            "model": model.name,
+            "prompt": model.warm_prompt,
+            "stream": False,
+            "keep_alive": model.keep_alive,
+            "options": {"num_predict": 1},
+        }
+
+    def _record(
+        self,
+        host: str,
+        model: WarmupModel,
+        was_loaded: bool,
+        start: float,
+        body: Optional[Dict[str, Any]],
+        error: Optional[BaseException],
+    ) -> ColdStartMetric:
+        wall = time.perf_counter() - start
+        load_ns = (body or {}).get("load_duration")
+        metric = ColdStartMetric(
+            host=host,
+            model=model.name,
+            was_loaded=was_loaded,
+            wall_seconds=wall,
+            load_seconds=load_ns / 1e9 if load_ns is not None else None,
+            timestamp=time.time(),
+            error=repr(error) if error is not None else None,
+        )
+        self.metrics.append(metric)
+        with self._get_tracer().start_trace(
+            "ollama.warmup", model=model.name, host=host, was_loaded=was_loaded
+        ) as trace:
+            trace.add_span("warm", start, wall)
+            if metric.load_seconds is not None:
+                trace.add_span("load", start, metric.load_seconds)
+            if error is not None:
+                trace.set("error", metric.error)
+        if error is None and self.pool is not None:
+            self.pool.record_success(host, model.name)
+        return metric
+
+    def _apply_loaded(self, host: str, body: Optional[Dict[str, Any]]) -> None:
+        if not isinstance(body, dict):
+            return
+        entries = [m for m in body.get("models") or [] if isinstance(m, dict)]
+        names = (m.get("name") or m.get("model") for m in entries)
+        models = [name for name in names if isinstance(name, str)]
+        self.loaded[host] = [model_key(m) for m in models]
+        if self.pool is not None:
+            self.pool.mark_loaded(host, models)
+
+    def _missing(self, only_missing: bool) -> List[Tuple[str, WarmupModel, bool]]:
+        """The (host, model, was_loaded) pairs to warm."""
+        pairs = []
+        for host in self.hosts:
+            loaded = set(self.loaded.get(host, ()))
+            for model in self.config.models:
+                was_loaded = model_key(model.name) in loaded
+                if not (only_missing and was_loaded):
+                    pairs.append((host, model, was_loaded))
+        return pairs
+
+    # --- Sync ---
+    def refresh(self) -> Dict[str, List[str]]:
+        """Reads the loaded models of every host from `/api/ps`."""
+        for host in self.hosts:
+            with self._client(host) as client:
+                try:
+                    response = client.get(f"{host}/api/ps", timeout=10.0)
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError):
+                    body = None
+            self._apply_loaded(host, body)
+        return self.loaded
+
+    def warm(self, only_missing: bool = False) -> List[ColdStartMetric]:
+        """Loads and warms every configured model on every host, one at a time."""
+        self.refresh()
+        results = []
+        for host, model, was_loaded in self._missing(only_missing):
+            start = time.perf_counter()
+            body, error = None, None
+            with self._client(host) as client:
+                try:
+                    response = client.post(
+                        f"{host}/api/generate",
+                        json=self._warm_payload(model),
+                        timeout=self.config.timeout,
+                    )
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError) as e:
+                    error = e
+            results.append(self._record(host, model, was_loaded, start, body, error))
+        self.refresh()
+        return results
+
+    # --- Async ---
+    async def arefresh(self) -> Dict[str, List[str]]:
+        """Reads the loaded models of every host from `/api/ps`, concurrently."""
+
+        async def check(host: str) -> None:
+            async with self._aclient(host) as client:
+                try:
+                    response = await client.get(f"{host}/api/ps", timeout=10.0)
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError):
+                    body = None
+            self._apply_loaded(host, body)
+
+        await asyncio.gather(*(check(host) for host in self.hosts))
+        return self.loaded
+
+    async def awarm(self, only_missing: bool = False) -> List[ColdStartMetric]:
+        """
+        Loads and warms every configured model on every host, at most
+        `config.concurrency` at a time. With `only_missing`, models the hosts
+        already have loaded are skipped.
+        """
+        await self.arefresh()
+
+        async def warm_one(item: Tuple[str, WarmupModel, bool]) -> ColdStartMetric:
+            host, model, was_loaded = item
+            start = time.perf_counter()
+            body, error = None, None
+            async with self._aclient(host) as client:
+                try:
+                    response = await client.post(
+                        f"{host}/api/generate",
+                        json=self._warm_payload(model),
+                        timeout=self.config.timeout,
+                    )
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError) as e:
+                    error = e
+            return self._record(host, model, was_loaded, start, body, error)
+
+        results = await bounded_gather(
+            warm_one, self._missing(only_missing), self.config.concurrency
+        )
+        await self.arefresh()
+        return results
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.refresh_interval)
+            await self.awarm(only_missing=True)
+
+    async def start(self) -> List[ColdStartMetric]:
+        """
+        Warms all configured models, then keeps re-warming evicted ones in
+        the background. Returns the metrics of the initial warm.
+        """
+        results = await self.awarm()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return results
+
+    async def stop(self) -> None:
+        """Stops the background re-warming."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "ModelWarmer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
@@ -0,0 +1,366 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import httpx
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from yogurt.llms.base import BaseLLM
+from yogurt.llms.ollama.pool import spread_across_hosts
+from yogurt.output.base import LLMResult
+from yogurt.output.streaming import StreamingChunk
+from yogurt.prompts.prompt_value import PromptValue
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class FirstTokenTimeoutError(TimeoutError):
+    """Raised when a stream produces no chunk within `first_token_timeout`."""
+
+
+class RetryPolicy(BaseModel):
+    """Exponential backoff with full jitter for transient failures."""
+
+    max_attempts: int = Field(default=3, ge=1, description="Attempts including the first.")
+    initial_backoff: float = Field(default=0.2, ge=0, description="Seconds before the first retry.")
+    max_backoff: float = Field(default=5.0, ge=0)
+    multiplier: float = Field(default=2.0, ge=1.0)
+    jitter: bool = Field(
+        default=True,
+        description="Sleep a random fraction of the backoff so retries do not synchronize.",
+    )
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (0-based)."""
+        delay = min(self.max_backoff, self.initial_backoff * self.multiplier**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """
+        Transport errors, timeouts, 408/429 and 5xx responses are retried;
+        anything else is assumed to fail again the same way.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+class HedgePolicy(BaseModel):
+    """
+    When to send a duplicate request.
+
+    If the first response (or first streamed chunk) has not arrived after
+    the `percentile` of recently observed latencies, a second request is
+    sent and whichever answers first is used. Until `min_samples` latencies
+    have been seen, `initial_delay` is used instead.
+    """
+
+    percentile: float = Field(default=0.95, gt=0, lt=1)
+    initial_delay: float = Field(default=1.0, gt=0)
+    min_delay: float = Field(default=0.05, ge=0)
+    max_delay: float = Field(default=30.0, gt=0)
+    max_hedges: int = Field(default=1, ge=1, description="Duplicates sent per attempt.")
+    min_samples: int = Field(default=20, ge=1)
+    window: int = Field(default=500, ge=1, description="Latencies kept for the percentile.")
+
+
+class ResilienceStats(BaseModel):
+    """Counters for a ResilientLLM since creation or the last `reset_stats()`."""
+
+    requests: int = 0
+    retries: int = 0
+    hedges_launched: int = 0
+    hedges_won: int = 0
+    first_token_timeouts: int = 0
+
+    @property
+    def hedge_win_rate(self) -> float:
+        """Share of launched hedges that answered before the original request."""
+        return self.hedges_won / self.hedges_launched if self.hedges_launched else 0.0
+
+
+class _LatencyWindow:
+    """The most recent latencies, for percentile-based hedge delays."""
+
+    def __init__(self, size: int):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def delay(self, policy: HedgePolicy) -> float:
+        if len(self._samples) < policy.min_samples:
+            return policy.initial_delay
+        ordered = sorted(self._samples)
+        value = ordered[min(len(ordered) - 1, int(policy.percentile * len(ordered)))]
+        return min(policy.max_delay, max(policy.min_delay, value))
+
+
+class ResilientLLM(BaseLLM):
+    """
+    Wraps another LLM with retries, a first-token timeout and hedging.
+
+    Failed calls are retried with `retry` when the error is transient.
+    Streams are only retried until their first chunk has been yielded, so
+    callers never see a chunk twice. With `hedge`, a slow async call gets a
+    duplicate request and the loser is cancelled. Retries and duplicates of
+    an `OllamaLLM` with a pool go to a different host where one is healthy,
+    otherwise to the same host over another pooled connection. Hedging only
+    applies to `agenerate`/`astream`.
+
+    The wrapped LLM is called through its `_generate`/`_agenerate`/`_astream`
+    hooks, so configure caching and request coalescing on this wrapper.
+    """
+
+    llm: BaseLLM
+    retry: RetryPolicy = Field(default_factory=RetryPolicy)
+    hedge: Optional[HedgePolicy] = None
+    first_token_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds an async stream may take to produce its first chunk.",
+    )
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _counters: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _latencies: Dict[str, _LatencyWindow] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _inherit_model_name(self) -> "ResilientLLM":
+        if "model_name" not in self.model_fields_set:
+            self.model_name = self.llm.model_name
+        return self
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def stats(self) -> ResilienceStats:
+        with self._lock:
+            return ResilienceStats(**self._counters)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters = {}
+
+    def _identifying_payload(self, prompt: PromptValue, **kwargs: Any) -> Dict[str, Any]:
+        return self.llm._identifying_payload(prompt, **kwargs)
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt + 1 >= self.retry.max_attempts or not self.retry.is_retryable(error):
+            return False
+        self._count("retries")
+        return True
+
+    # --- Sync ---
+    def _generate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        self._count("requests")
+        attempt = 0
+        with spread_across_hosts():
+            while True:
+                try:
+                    return self.llm._generate(prompt, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                time.sleep(self.retry.backoff(attempt))
+                attempt += 1
+
+    def stream(self, prompt: PromptValue, **kwargs: Any) -> Iterator[StreamingChunk]:
+        self._count("requests")
+        attempt = 0
+        # Hosts are leased when a stream opens, so only the attempts need
+        # spreading; the block is left before any chunk reaches the caller.
+        with spread_across_hosts():
+            while True:
+                chunks = self.llm.stream(prompt, **kwargs)
+                try:
+                    first = next(chunks)
+                    break
+                except StopIteration:
+                    return
+                except Exception as e:
+                    chunks.close()
+                    if not self._should_retry(e, attempt):
+                        raise
+                time.sleep(self.retry.backoff(attempt))
+                attempt += 1
+        try:
+            yield first
+            yield from chunks
+        finally:
+            chunks.close()
+
+    # --- Async ---
+    async def _race(
+        self,
+        kind: str,
+        start: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None,
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> T:
+        """
+        Awaits `start()`, launching hedged duplicates per the hedge policy,
+        and returns the first successful result. Losers are cancelled, and
+        results that lost a tie are passed to `discard`.
+        """
+        loop = asyncio.get_running_loop()
+        window = self._latencies.get(kind)
+        if window is None:
+            window = self._latencies[kind] = _LatencyWindow(
+                self.hedge.window if self.hedge else 1
+            )
+        began: Dict[asyncio.Future, float] = {}
+        order: List[asyncio.Future] = []
+
+        def launch() -> None:
+            task = asyncio.ensure_future(start())
+            began[task] = loop.time()
+            order.append(task)
+
+        launch()
+        hedge_at = loop.time() + window.delay(self.hedge) if self.hedge else None
+        pending = set(order)
+        error: Optional[BaseException] = None
+        winner: Optional[asyncio.Future] = None
+        try:
+            while winner is None:
+                if not pending:
+                    # Every request failed; leave the next step to the retry policy.
+                    raise error
+                can_hedge = hedge_at is not None and len(order) <= self.hedge.max_hedges
+                wake = min(
+                    (t for t in (hedge_at if can_hedge else None, deadline) if t is not None),
+                    default=None,
+                )
+                timeout = None if wake is None else max(0.0, wake - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in order:
+                    if task in done and winner is None:
+                        if task.exception() is None:
+                            winner = task
+                        elif error is None:
+                            error = task.exception()
+                if winner is not None:
+                    break
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    self._count("first_token_timeouts")
+                    raise FirstTokenTimeoutError(
+                        f"No first token within {self.first_token_timeout}s"
+                    )
+                if can_hedge and now >= hedge_at:
+                    launch()
+                    pending.add(order[-1])
+                    self._count("hedges_launched")
+                    hedge_at = now + window.delay(self.hedge)
+        finally:
+            for task in order:
+                if task is not winner and not task.done():
+                    task.cancel()
+            losers = [task for task in order if task is not winner]
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+                if discard is not None:
+                    for task in losers:
+                        if not task.cancelled() and task.exception() is None:
+                            await discard(task.result())
+
+        window.add(loop.time() - began[winner])
+        if winner is not order[0]:
+            self._count("hedges_won")
+        return winner.result()
+
+    async def _agenerate(self, prompt: PromptValue, **kwargs: Any) -> LLMResult:
+        self._count("requests")
+        attempt = 0
+        with spread_across_hosts():
+            while True:
+                try:
+                    return await self._race(
+                        "generate", lambda: self.llm._agenerate(prompt, **kwargs)
+                    )
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                await asyncio.sleep(self.retry.backoff(attempt))
+                attempt += 1
+
+    async def _open_stream(
+        self, prompt: PromptValue, kwargs: Dict[str, Any]
+    ) -> Tuple[AsyncIterator[StreamingChunk], Optional[StreamingChunk]]:
+        """Starts a stream of the wrapped LLM and waits for its first chunk."""
+        chunks = self.llm._astream(prompt, **kwargs)
+        try:
+            return chunks, await chunks.__anext__()
+        except StopAsyncIteration:
+            return chunks, None
+        except BaseException:
+            await chunks.aclose()
+            raise
+
+    @staticmethod
+    async def _close_stream(
+        opened: Tuple[AsyncIterator[StreamingChunk], Optional[StreamingChunk]],
+    ) -> None:
+        await opened[0].aclose()
+
+    async def _aopen(
+        self, prompt: PromptValue, kwargs: Dict[str, Any]
+    ) -> Tuple[AsyncIterator[StreamingChunk], Optional[StreamingChunk]]:
+        """Opens a stream with retries and hedging, up to its first chunk."""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        with spread_across_hosts():
+            while True:
+                deadline = (
+                    loop.time() + self.first_token_timeout
+                    if self.first_token_timeout
+                    else None
+                )
+                try:
+                    return await self._race(
+                        "stream",
+                        lambda: self._open_stream(prompt, kwargs),
+                        deadline=deadline,
+                        discard=self._close_stream,
+                    )
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                await asyncio.sleep(self.retry.backoff(attempt))
+                attempt += 1
+
+    async def _astream(
+        self, prompt: PromptValue, **kwargs: Any
+    ) -> AsyncIterator[StreamingChunk]:
+        self._count("requests")
+        chunks, first = await self._aopen(prompt, kwargs)
+        try:
+            if first is None:
+                return
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
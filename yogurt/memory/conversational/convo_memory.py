@@ -1,18 +1,106 @@
-from typing import Dict, Any, List
+from collections import deque
+from typing import Callable, Deque, Dict, Any, List, NamedTuple, Optional
+from yogurt.config.config import get_settings
 from yogurt.memory.base import BaseMemory
 from yogurt.messages.base import BaseMessage, HumanMessage, AIMessage
+from yogurt.utils.tokens import estimate_tokens
+
+
+class ConversationTurn(NamedTuple):
+    """One exchange: the input message, the reply and their token estimate."""
+
+    input: BaseMessage
+    output: BaseMessage
+    tokens: int
 
 
 class ConversationMemory(BaseMemory):
+    """
+    Keeps the most recent turns of a conversation in a ring buffer.
+
+    At most `window` turns are kept (default `memory_window` from the
+    settings; 0 keeps every turn), and appending evicts the oldest turn in
+    O(1). Each turn's token estimate is computed once when it is saved, so
+    `load_memory_variables` can return the newest turns that fit
+    `max_tokens` by walking the window backwards. Subclasses can override
+    `_on_evict` to do something with turns that fall out of the window.
+    """
+
     memory_key: str = "conversation_memory"
-    chat_history: List[BaseMessage] = []
+
+    def __init__(
+        self,
+        memory_key: str = "conversation_memory",
+        window: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        self.memory_key = memory_key
+        self.window = get_settings().memory_window if window is None else window
+        if self.window < 0:
+            raise ValueError("window must be non-negative")
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter
+        self._turns: Deque[ConversationTurn] = deque()
+        self._tokens = 0
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    @property
+    def turns(self) -> List[ConversationTurn]:
+        return list(self._turns)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of every turn in the window."""
+        return self._tokens
+
+    @property
+    def chat_history(self) -> List[BaseMessage]:
+        """Every message in the window, oldest first. A copy; use `save_context` to add."""
+        return [message for turn in self._turns for message in (turn.input, turn.output)]
+
+    def _on_evict(self, turn: ConversationTurn) -> None:
+        """Called with each turn that falls out of the window."""
+        pass
+
+    def add_turn(self, input_message: BaseMessage, output_message: BaseMessage) -> None:
+        tokens = self.token_counter(input_message.content) + self.token_counter(
+            output_message.content
+        )
+        if self.window and len(self._turns) >= self.window:
+            evicted = self._turns.popleft()
+            self._tokens -= evicted.tokens
+            self._on_evict(evicted)
+        self._turns.append(ConversationTurn(input_message, output_message, tokens))
+        self._tokens += tokens
+
+    def messages(self, max_tokens: Optional[int] = None) -> List[BaseMessage]:
+        """
+        The newest turns whose estimated tokens fit `max_tokens` (default
+        `self.max_tokens`; None means no limit), oldest first.
+        """
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        if budget is None or self._tokens <= budget:
+            return self.chat_history
+        selected: List[ConversationTurn] = []
+        for turn in reversed(self._turns):
+            if turn.tokens > budget:
+                break
+            budget -= turn.tokens
+            selected.append(turn)
+        return [message for turn in reversed(selected) for message in (turn.input, turn.output)]
 
     def load_memory_variables(self) -> Dict[str, Any]:
-        return {self.memory_key: self.chat_history}
+        return {self.memory_key: self.messages()}
 
     def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
         # Assuming one input key and one output key for simplicity
         input_str = next(iter(inputs.values()))
         output_str = next(iter(outputs.values()))
-        self.chat_history.append(HumanMessage(content=input_str))
-        self.chat_history.append(AIMessage(content=output_str))
+        self.add_turn(HumanMessage(content=input_str), AIMessage(content=output_str))
+
+    def clear(self) -> None:
+        self._turns.clear()
+        self._tokens = 0
@@ -0,0 +1,438 @@
+import asyncio
+import math
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from yogurt.memory.conversational.convo_memory import ConversationMemory, ConversationTurn
+from yogurt.messages.base import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from yogurt.utils.tokens import estimate_tokens
+
+_ROLE_TO_CLS = {
+    "human": HumanMessage,
+    "ai": AIMessage,
+    "system": SystemMessage,
+}
+
+_Row = Tuple[str, str, str, str, str, int, float]
+"""(session_id, input_role, input, output_role, output, tokens, created_at)"""
+
+
+def _message(role: str, content: str) -> BaseMessage:
+    return _ROLE_TO_CLS.get(role, HumanMessage)(content=content)
+
+
+class PersistentConversationMemory(ConversationMemory):
+    """
+    The window of one session of a `SQLiteConversationStore`. Saved turns
+    go into the window immediately and are written to disk in the
+    background. Get instances from `store.memory(session_id)`.
+    """
+
+    def __init__(
+        self,
+        store: "SQLiteConversationStore",
+        session_id: str,
+        memory_key: str = "conversation_memory",
+        window: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        super().__init__(
+            memory_key=memory_key,
+            window=window,
+            max_tokens=max_tokens,
+            token_counter=token_counter,
+        )
+        self.store = store
+        self.session_id = session_id
+
+    def _restore(self, turns: List[ConversationTurn]) -> None:
+        """Loads turns read from disk without writing them back."""
+        for turn in turns[-self.window :] if self.window else turns:
+            self._turns.append(turn)
+            self._tokens += turn.tokens
+
+    def add_turn(self, input_message: BaseMessage, output_message: BaseMessage) -> None:
+        super().add_turn(input_message, output_message)
+        self.store._enqueue(self.session_id, self._turns[-1])
+
+
+class SQLiteConversationStore:
+    """
+    Conversation history persisted in SQLite and keyed by session id, so it
+    survives restarts and can be shared by several worker processes.
+
+    Writes are write-behind: `save_context` only queues the turn, and a
+    background thread commits queued turns in batches, gathering for up to
+    `flush_interval` seconds or `batch_size` turns per transaction. A batch
+    that fails to commit is retried up to `max_retries` times and then
+    dropped; `flush()` waits for everything queued so far to be written and
+    raises the error of any batch dropped since the last flush.
+
+    Sessions are loaded lazily: `memory(session_id)` reads the last
+    `window` turns on first use and keeps the session in an LRU of
+    `max_sessions` hot sessions. Sessions with turns still waiting to be
+    written are evicted last, so a reload rarely has to wait for the
+    writer; when it does, it waits for that session's turns only. A cached
+    session does not see turns another process adds to it, so route a
+    session to one worker or call `evict(session_id)` to reload it. The
+    database connection has its own lock, so saving a turn or using a hot
+    session never waits for a write or a compaction in progress.
+
+    Every `compact_interval` seconds the writer thread compacts the table:
+    it drops turns older than the newest `retain_turns` of each session,
+    and sessions idle for longer than `session_ttl`, then returns the freed
+    pages to the file system.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".yogurt_memory.db",
+        window: Optional[int] = None,
+        max_sessions: int = 1024,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        retain_turns: Optional[int] = 1000,
+        session_ttl: Optional[float] = None,
+        compact_interval: float = 3600.0,
+        max_retries: int = 3,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = Path(path)
+        self.window = window
+        self.max_sessions = max_sessions
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retain_turns = retain_turns
+        self.session_ttl = session_ttl
+        self.compact_interval = compact_interval
+        self.max_retries = max_retries
+        self.token_counter = token_counter
+        self.last_error: Optional[Exception] = None
+        """The last error the writer thread hit."""
+        self.dropped_turns = 0
+        """Turns discarded after their batch failed `max_retries` times."""
+        self._write_error: Optional[Exception] = None
+        """Error of a dropped batch, raised by the next `flush()`."""
+
+        self._lock = threading.Lock()
+        """Guards the in-memory state; never held while SQL runs."""
+        self._written = threading.Condition(self._lock)
+        """Notified when a session has no more turns waiting to be written."""
+        self._db_lock = threading.Lock()
+        """Guards `_conn`."""
+        self._conn = self._connect()
+        self._create_tables()
+        self._sessions: "OrderedDict[str, PersistentConversationMemory]" = OrderedDict()
+        self._unwritten: Counter = Counter()
+        """Queued turns per session that have not reached disk yet."""
+        self._queue: "queue.Queue[Optional[_Row]]" = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_loop, name="yogurt-memory-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Must precede WAL mode and table creation, or a new file keeps
+        # auto_vacuum=NONE and compaction cannot release pages.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _create_tables(self) -> None:
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversation_turns ("
+            "id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, "
+            "input_role TEXT NOT NULL, input TEXT NOT NULL, "
+            "output_role TEXT NOT NULL, output TEXT NOT NULL, "
+            "tokens INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS conversation_turns_session "
+            "ON conversation_turns (session_id, id)"
+        )
+        self._conn.commit()
+
+    # --- Sessions ---
+    def _load(self, session_id: str) -> PersistentConversationMemory:
+        memory = PersistentConversationMemory(
+            self, session_id, window=self.window, token_counter=self.token_counter
+        )
+        # Turns of a session that left the LRU may still be queued.
+        self._wait_written(session_id)
+        query = (
+            "SELECT input_role, input, output_role, output, tokens "
+            "FROM conversation_turns WHERE session_id = ? ORDER BY id DESC"
+        )
+        params: Tuple[Any, ...] = (session_id,)
+        if memory.window:
+            query += " LIMIT ?"
+            params += (memory.window,)
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+        memory._restore(
+            [
+                ConversationTurn(_message(in_role, text_in), _message(out_role, text_out), tokens)
+                for in_role, text_in, out_role, text_out, tokens in reversed(rows)
+            ]
+        )
+        return memory
+
+    def memory(self, session_id: str) -> PersistentConversationMemory:
+        """The memory of a session, loaded from disk on first use."""
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is not None:
+                self._sessions.move_to_end(session_id)
+                return memory
+        memory = self._load(session_id)
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first.
+            memory = self._sessions.setdefault(session_id, memory)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._evict_one()
+        return memory
+
+    def _evict_one(self) -> None:
+        """Drops the least recently used session, preferring one fully on disk."""
+        for session_id in self._sessions:
+            if not self._unwritten[session_id]:
+                del self._sessions[session_id]
+                return
+        self._sessions.popitem(last=False)
+
+    async def amemory(self, session_id: str) -> PersistentConversationMemory:
+        """`memory`, with a cold load run off the event loop."""
+        with self._lock:
+            memory = self._sessions.get(session_id)
+        if memory is not None:
+            return self.memory(session_id)
+        return await asyncio.to_thread(self.memory, session_id)
+
+    def evict(self, session_id: str) -> None:
+        """Drops a session from the LRU so its next use reloads it from disk."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sessions(self) -> List[str]:
+        """Every session id on disk."""
+        self._queue.join()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT session_id FROM conversation_turns"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete(self, session_id: str) -> None:
+        """Removes a session from memory and disk."""
+        with self._lock:
+            memory = self._sessions.pop(session_id, None)
+        self._wait_written(session_id)
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM conversation_turns WHERE session_id = ?", (session_id,)
+            )
+            self._conn.commit()
+        if memory is not None:
+            memory.clear()
+
+    # --- Write-behind ---
+    def _enqueue(self, session_id: str, turn: ConversationTurn) -> None:
+        if self._closed:
+            raise RuntimeError("SQLiteConversationStore is closed")
+        with self._lock:
+            self._unwritten[session_id] += 1
+        self._queue.put(
+            (
+                session_id,
+                turn.input.role,
+                turn.input.content,
+                turn.output.role,
+                turn.output.content,
+                turn.tokens,
+                time.time(),
+            )
+        )
+
+    def _write(self, rows: List[_Row]) -> None:
+        with self._db_lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO conversation_turns (session_id, input_role, input, "
+                    "output_role, output, tokens, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        with self._lock:
+            self._forget(rows)
+
+    def _forget(self, rows: List[_Row]) -> None:
+        """Marks rows as no longer waiting to be written. Holds `_lock`."""
+        for row in rows:
+            self._unwritten[row[0]] -= 1
+            if not self._unwritten[row[0]]:
+                del self._unwritten[row[0]]
+                self._written.notify_all()
+
+    def _wait_written(self, session_id: str) -> None:
+        """Blocks until no turn of `session_id` is waiting to be written."""
+        with self._written:
+            self._written.wait_for(lambda: not self._unwritten[session_id])
+
+    def _drop(self, rows: List[_Row], error: Exception) -> None:
+        with self._lock:
+            self._forget(rows)
+            self.dropped_turns += len(rows)
+            self._write_error = error
+
+    def _take(self, timeout: Optional[float]) -> Tuple[List[_Row], int, bool]:
+        """
+        Waits up to `timeout` for a turn, then keeps collecting for up to
+        `flush_interval` or until `batch_size` turns are waiting. Returns the
+        rows, the number of queue items taken and whether close was requested.
+        """
+        items: List[Optional[_Row]] = []
+        try:
+            items.append(self._queue.get(timeout=timeout))
+            deadline = time.monotonic() + self.flush_interval
+            while len(items) < self.batch_size and items[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                items.append(self._queue.get(timeout=remaining))
+        except queue.Empty:
+            pass
+        rows = [item for item in items if item is not None]
+        return rows, len(items), len(rows) != len(items)
+
+    def _write_loop(self) -> None:
+        batch: List[_Row] = []
+        unacked = 0
+        """Queue items taken but not yet on disk; `flush()` waits for them."""
+        failures = 0
+        next_compaction = time.monotonic() + self.compact_interval
+        stopping = False
+        while True:
+            # Idle, sleep until compaction is due; with a failed batch, retry soon.
+            timeout = (
+                max(0.0, next_compaction - time.monotonic())
+                if math.isfinite(next_compaction)
+                else None
+            )
+            rows, taken, stop = self._take(self.flush_interval if batch else timeout)
+            batch += rows
+            unacked += taken
+            stopping = stopping or stop
+            if batch:
+                try:
+                    self._write(batch)
+                    batch = []
+                    failures = 0
+                except sqlite3.Error as e:
+                    # Keep the batch and retry it with the next one.
+                    self.last_error = e
+                    failures += 1
+                    if failures > self.max_retries or stopping:
+                        self._drop(batch, e)
+                        batch = []
+                        failures = 0
+            if not batch:
+                for _ in range(unacked):
+                    self._queue.task_done()
+                unacked = 0
+            if stopping:
+                return
+            if time.monotonic() >= next_compaction:
+                next_compaction = time.monotonic() + self.compact_interval
+                try:
+                    self.compact()
+                except sqlite3.Error as e:
+                    self.last_error = e
+
+    def flush(self) -> None:
+        """
+        Blocks until every turn queued so far has been written or dropped.
+        Raises the error of a batch dropped since the last flush.
+        """
+        self._queue.join()
+        with self._lock:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    async def aflush(self) -> None:
+        await asyncio.to_thread(self.flush)
+
+    # --- Compaction ---
+    def compact(self) -> int:
+        """
+        Drops turns beyond `retain_turns` per session and sessions idle for
+        longer than `session_ttl`. Returns the number of turns removed.
+        """
+        removed = 0
+        with self._db_lock:
+            with self._conn:
+                if self.session_ttl is not None:
+                    removed += self._conn.execute(
+                        "DELETE FROM conversation_turns WHERE session_id IN ("
+                        "SELECT session_id FROM conversation_turns "
+                        "GROUP BY session_id HAVING MAX(created_at) < ?)",
+                        (time.time() - self.session_ttl,),
+                    ).rowcount
+                if self.retain_turns is not None:
+                    removed += self._conn.execute(
+                        "DELETE FROM conversation_turns WHERE id IN ("
+                        "SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                        "(PARTITION BY session_id ORDER BY id DESC) AS age "
+                        "FROM conversation_turns) WHERE age > ?)",
+                        (self.retain_turns,),
+                    ).rowcount
+            if removed:
+                # Frees one page per result row, so the cursor must be drained.
+                self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    # --- Lifecycle ---
+    def close(self) -> None:
+        """
+        Writes everything queued, stops the writer and closes the database.
+        Raises the error of any batch that had to be dropped.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._db_lock:
+            self._conn.close()
+        with self._lock:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "SQLiteConversationStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hot_sessions": len(self._sessions),
+                "unwritten_turns": sum(self._unwritten.values()),
+            }
@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from yogurt.constants.memory import SUMMARY_HUMAN, SUMMARY_SYSTEM
+from yogurt.llms.base import BaseLLM
+from yogurt.memory.conversational.convo_memory import ConversationMemory, ConversationTurn
+from yogurt.messages.base import BaseMessage, SystemMessage
+from yogurt.prompts.builders import BasePromptBuilder, ChatPromptBuilder
+from yogurt.prompts.prompt_value import PromptValue
+from yogurt.utils.tokens import estimate_tokens
+
+
+class SummarizingMemory(ConversationMemory):
+    """
+    A conversation window that folds evicted turns into a running summary.
+
+    Turns that fall out of the window are queued and handed to a background
+    asyncio task, which asks `llm` (typically a small, fast model) to fold
+    them into the summary. Saving and loading never wait for it:
+    `load_memory_variables` returns the latest summary, as a leading system
+    message and under `summary_key`, plus the recent window. Turns evicted
+    while a summarization is running are folded in by the same task on its
+    next pass.
+
+    Outside a running event loop no task can be started; evicted turns wait
+    until `flush()` or the next eviction inside a loop. `aflush()` waits for
+    everything queued to be summarized. If the LLM call fails, the turns
+    stay queued, the error is kept in `last_error`, and the next eviction
+    retries.
+    """
+
+    def __init__(
+        self,
+        llm: BaseLLM,
+        memory_key: str = "conversation_memory",
+        summary_key: str = "conversation_summary",
+        window: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        prompt: Optional[BasePromptBuilder] = None,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ):
+        super().__init__(
+            memory_key=memory_key,
+            window=window,
+            max_tokens=max_tokens,
+            token_counter=token_counter,
+        )
+        self.llm = llm
+        self.summary_key = summary_key
+        self.prompt = prompt or ChatPromptBuilder(SUMMARY_SYSTEM, SUMMARY_HUMAN)
+        self.summary = ""
+        self.last_error: Optional[Exception] = None
+        self._summary_tokens = 0
+        self._pending: List[ConversationTurn] = []
+        self._task: Optional[asyncio.Task] = None
+        self._epoch = 0
+        """Bumped by `clear()` so a summary that finishes afterwards is dropped."""
+
+    @property
+    def pending(self) -> int:
+        """Evicted turns not yet folded into the summary."""
+        return len(self._pending)
+
+    # --- Summarizing ---
+    @staticmethod
+    def _format_turns(turns: List[ConversationTurn]) -> str:
+        return "\n".join(
+            f"{message.role}: {message.content}"
+            for turn in turns
+            for message in (turn.input, turn.output)
+        )
+
+    def _summary_prompt(self, turns: List[ConversationTurn]) -> PromptValue:
+        return self.prompt.format_prompt(
+            summary=self.summary or "(empty)", new_lines=self._format_turns(turns)
+        )
+
+    def _apply(self, epoch: int, text: str) -> None:
+        if epoch != self._epoch:
+            return
+        self.summary = text.strip()
+        self._summary_tokens = self.token_counter(self.summary) if self.summary else 0
+        self.last_error = None
+
+    def _take_pending(self) -> List[ConversationTurn]:
+        turns, self._pending = self._pending, []
+        return turns
+
+    def _requeue(self, epoch: int, turns: List[ConversationTurn], error: Exception) -> None:
+        if epoch == self._epoch:
+            self._pending[:0] = turns
+            self.last_error = error
+
+    async def _summarize_pending(self, raise_errors: bool) -> None:
+        while self._pending:
+            epoch, turns = self._epoch, self._take_pending()
+            try:
+                result = await self.llm.agenerate(self._summary_prompt(turns))
+            except Exception as e:
+                self._requeue(epoch, turns, e)
+                if raise_errors:
+                    raise
+                return
+            self._apply(epoch, result.generations[0].text)
+
+    def _schedule(self) -> None:
+        if self._task is not None and not self._task.done():
+            # The running task picks up newly queued turns before it exits.
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._summarize_pending(raise_errors=False))
+
+    def _on_evict(self, turn: ConversationTurn) -> None:
+        self._pending.append(turn)
+        self._schedule()
+
+    def flush(self) -> None:
+        """Summarizes every queued turn now, blocking. For use outside an event loop."""
+        while self._pending:
+            epoch, turns = self._epoch, self._take_pending()
+            try:
+                result = self.llm.generate(self._summary_prompt(turns))
+            except Exception as e:
+                self._requeue(epoch, turns, e)
+                raise
+            self._apply(epoch, result.generations[0].text)
+
+    async def aflush(self) -> None:
+        """Waits until every queued turn has been folded into the summary."""
+        if self._task is not None and not self._task.done():
+            await self._task
+        await self._summarize_pending(raise_errors=True)
+
+    # --- Memory ---
+    def messages(self, max_tokens: Optional[int] = None) -> List[BaseMessage]:
+        """
+        The summary as a system message, followed by the newest turns that
+        fit `max_tokens` together with it.
+        """
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        if not self.summary:
+            return super().messages(budget)
+        if budget is not None:
+            budget = max(0, budget - self._summary_tokens)
+        return [SystemMessage(content=self.summary)] + super().messages(budget)
+
+    def load_memory_variables(self) -> Dict[str, Any]:
+        return {self.memory_key: self.messages(), self.summary_key: self.summary}
+
+    def clear(self) -> None:
+        super().clear()
+        self._epoch += 1
+        self._pending = []
+        self.summary = ""
+        self._summary_tokens = 0
+        self.last_error = None
@@ -0,0 +1,113 @@
+from typing import Any, Dict, Literal, Optional, TypeAlias, Union
+
+from pydantic import BaseModel, Field
+
+from yogurt.agents.models import ToolCall
+from yogurt.prompts.prompt_value import PromptValue
+
+
+class PipeEvent(BaseModel):
+    """
+    Base class of the events yielded by `astream_events`.
+
+    Every event carries the id of the run it belongs to and the time since
+    the run started, so events from concurrent runs can be told apart and
+    laid out on a timeline. `event` names the type for consumers that only
+    see the serialized form.
+    """
+
+    event: str
+    run_id: str
+    elapsed_ms: float
+    """Milliseconds since the pipe started."""
+
+
+class PipeStartEvent(PipeEvent):
+    event: Literal["pipe_start"] = "pipe_start"
+    pipe: str
+    """The pipe's class name."""
+    inputs: Dict[str, Any] = Field(default_factory=dict)
+
+
+class PromptFormattedEvent(PipeEvent):
+    event: Literal["prompt_formatted"] = "prompt_formatted"
+    prompt: PromptValue
+    duration_ms: float
+    """Time spent formatting the prompt."""
+
+
+class FirstTokenEvent(PipeEvent):
+    """The first chunk arrived; `elapsed_ms` is the time to first token."""
+
+    event: Literal["first_token"] = "first_token"
+    llm_ms: float
+    """Time from sending the request to the first chunk."""
+
+
+class TokenDeltaEvent(PipeEvent):
+    event: Literal["token"] = "token"
+    text: str
+    index: int
+    """Position of the chunk in the stream."""
+
+
+class ParsedObjectEvent(PipeEvent):
+    """The output parser completed an object, such as a message."""
+
+    event: Literal["parsed"] = "parsed"
+    value: Any
+    index: int
+    """Position of the object among the parsed outputs."""
+
+
+class ToolCallEvent(PipeEvent):
+    event: Literal["tool_call"] = "tool_call"
+    tool_call: ToolCall
+
+
+class LLMEndEvent(PipeEvent):
+    """
+    The model finished. Counts and durations are Ollama's, with durations in
+    nanoseconds; they are None when the provider does not report them.
+    """
+
+    event: Literal["llm_end"] = "llm_end"
+    text: str
+    chunks: int
+    eval_count: Optional[int] = None
+    eval_duration: Optional[int] = None
+    prompt_eval_count: Optional[int] = None
+    prompt_eval_duration: Optional[int] = None
+    load_duration: Optional[int] = None
+    total_duration: Optional[int] = None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generation speed as reported by the server."""
+        if not self.eval_count or not self.eval_duration:
+            return None
+        return self.eval_count / (self.eval_duration / 1e9)
+
+
+class ErrorEvent(PipeEvent):
+    event: Literal["error"] = "error"
+    error_type: str
+    message: str
+
+
+class PipeEndEvent(PipeEvent):
+    event: Literal["pipe_end"] = "pipe_end"
+    outputs: Dict[str, Any] = Field(default_factory=dict)
+
+
+AnyPipeEvent: TypeAlias = Union[
+    PipeStartEvent,
+    PromptFormattedEvent,
+    FirstTokenEvent,
+    TokenDeltaEvent,
+    ParsedObjectEvent,
+    ToolCallEvent,
+    LLMEndEvent,
+    ErrorEvent,
+    PipeEndEvent,
+]
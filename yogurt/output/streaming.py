@@ -15,6 +15,34 @@ class StreamingChunk(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     """Any additional metadata provided by the LLM for this chunk."""
 
+    @classmethod
+    def trusted(cls, text: str, metadata: Dict[str, Any]) -> "StreamingChunk":
+        """
+        Builds a chunk from provider data without running validation, for
+        per-token streaming paths where the data is already well-formed.
+        """
+        return cls.model_construct(text=text, metadata=metadata)
+
+
+class ParsedStreamingChunk(BaseModel):
+    """
+    A streamed chunk together with what the output parser made of it.
+
+    `parsed` holds the objects this chunk completed, such as whole messages,
+    and `deltas` the partial content it added. The last chunk of a stream is
+    marked `final`; it carries no text and holds whatever only the end of the
+    stream completed, such as a message that was cut off.
+    """
+
+    text: str
+    """The raw text of this chunk."""
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    parsed: List[Any] = Field(default_factory=list)
+    """Objects completed by this chunk."""
+    deltas: List[Any] = Field(default_factory=list)
+    """Partial content added by this chunk."""
+    final: bool = False
+
 
 class StreamingResponse(BaseModel):
     chunks: List[StreamingChunk] = Field(default_factory=list)
@@ -1,3 +1,17 @@
-from .base import BaseOutputParser, OutputParser
+from .base import (
+    BaseOutputParser,
+    ChunkStreamSession,
+    ConversationDelta,
+    LineStreamSession,
+    OutputParser,
+    StreamUpdate,
+)
 
-__all__ = ["BaseOutputParser", "OutputParser"]
+__all__ = [
+    "BaseOutputParser",
+    "ChunkStreamSession",
+    "ConversationDelta",
+    "LineStreamSession",
+    "OutputParser",
+    "StreamUpdate",
+]
@@ -1,9 +1,56 @@
 import re
 from abc import abstractmethod
-from typing import Protocol, Any, List
+from typing import Protocol, Any, List, Optional, Union
+from pydantic import BaseModel, Field
 from yogurt.output.streaming import StreamingChunk
 from yogurt.messages.base import BaseMessage, HumanMessage, AIMessage, SystemMessage
 
+_ROLE_TO_CLS = {
+    "human": HumanMessage,
+    "ai": AIMessage,
+    "system": SystemMessage,
+}
+_MESSAGE_LINE = re.compile(r"^\[(human|ai|system)\]\s*(.+)$", re.MULTILINE | re.IGNORECASE)
+_MESSAGE_PREFIX = re.compile(r"\[(human|ai|system)\]\s*", re.IGNORECASE)
+
+
+class ConversationDelta(BaseModel):
+    """New text for the content of the `index`-th conversation message."""
+
+    index: int
+    role: Optional[str] = None
+    """The message's role, if it appeared before its content."""
+    text: str
+
+
+class StreamUpdate(BaseModel):
+    """What one streamed chunk added: completed messages and content deltas."""
+
+    messages: List[Any] = Field(default_factory=list)
+    deltas: List[ConversationDelta] = Field(default_factory=list)
+
+
+class ChunkStreamSession:
+    """
+    A stream session for parsers without incremental support: every chunk
+    is passed to `parse_chunk`, whose results count as completed messages.
+    """
+
+    def __init__(self, parser: "BaseOutputParser"):
+        self._parser = parser
+        self.messages: List[Any] = []
+
+    def feed(self, chunk: Union[StreamingChunk, str]) -> StreamUpdate:
+        if isinstance(chunk, str):
+            chunk = StreamingChunk(text=chunk)
+        parsed = self._parser.parse_chunk(chunk) or []
+        update = StreamUpdate(messages=list(parsed))
+        self.messages.extend(update.messages)
+        return update
+
+    def finish(self) -> List[Any]:
+        return list(self.messages)
+
 
 class BaseOutputParser(Protocol):
     @abstractmethod
@@ -18,6 +65,71 @@ class BaseOutputParser(Protocol):
     def get_response_format(self) -> str:
         pass
 
+    def start_stream(self) -> Any:
+        """
+        Returns a session with `feed(chunk) -> StreamUpdate` and
+        `finish() -> messages` that parses one streamed response.
+        """
+        return ChunkStreamSession(self)
+
+
+class LineStreamSession:
+    """
+    Parsing state of `OutputParser` for one streamed response.
+
+    Only the unfinished last line is buffered, so each chunk costs time
+    proportional to its own length. A message completes when its line ends;
+    its content is reported as deltas while the line is still arriving.
+    """
+
+    def __init__(self):
+        self._line = ""
+        self._role: Optional[str] = None
+        """Role of the current line, once its `[role]` prefix has arrived."""
+        self.messages: List[BaseMessage] = []
+        """Completed messages so far."""
+
+    def _delta(self, piece: str) -> Optional[ConversationDelta]:
+        if self._role is None:
+            match = _MESSAGE_PREFIX.match(self._line)
+            if match is None or match.end() == len(self._line):
+                return None
+            self._role = match.group(1).lower()
+            piece = self._line[match.end() :]
+        return ConversationDelta(index=len(self.messages), role=self._role, text=piece)
+
+    def _complete_line(self, line: str) -> Optional[BaseMessage]:
+        self._line, self._role = "", None
+        match = _MESSAGE_LINE.match(line.rstrip("\r"))
+        if match is None:
+            return None
+        cls = _ROLE_TO_CLS[match.group(1).lower()]
+        message = cls(content=match.group(2).strip())
+        self.messages.append(message)
+        return message
+
+    def feed(self, chunk: Union[StreamingChunk, str]) -> StreamUpdate:
+        """Reads the next chunk and returns what it completed."""
+        text = chunk if isinstance(chunk, str) else chunk.text
+        update = StreamUpdate()
+        *lines, rest = text.split("\n")
+        for piece in lines:
+            message = self._complete_line(self._line + piece)
+            if message is not None:
+                update.messages.append(message)
+        if rest:
+            self._line += rest
+            delta = self._delta(rest)
+            if delta is not None:
+                update.deltas.append(delta)
+        return update
+
+    def finish(self) -> List[BaseMessage]:
+        """Ends the stream, completing a last line that had no newline."""
+        if self._line:
+            self._complete_line(self._line)
+        return list(self.messages)
+
 
 class OutputParser:
     def parse(self, text: str) -> List[BaseMessage]:
@@ -25,21 +137,12 @@ class OutputParser:
         Parses text into a list of BaseMessage objects.
         Expects messages like: '[role] content'
         """
-        pattern = re.compile(
-            r"^\[(human|ai|system)\]\s*(.+)$", re.MULTILINE | re.IGNORECASE
-        )
         messages: List[BaseMessage] = []
 
-        role_to_cls = {
-            "human": HumanMessage,
-            "ai": AIMessage,
-            "system": SystemMessage,
-        }
-
-        for match in pattern.finditer(text):
+        for match in _MESSAGE_LINE.finditer(text):
             role = match.group(1).lower()
             content = match.group(2).strip()
-            cls = role_to_cls.get(role, BaseMessage)
+            cls = _ROLE_TO_CLS.get(role, BaseMessage)
             if cls:
                 messages.append(cls(content=content))
 
@@ -48,6 +151,10 @@ class OutputParser:
     def parse_chunk(self, text: StreamingChunk) -> List[BaseMessage]:
         return self.parse(text.text)
 
+    def start_stream(self) -> LineStreamSession:
+        """Returns a new, independent parsing session for one streamed response."""
+        return LineStreamSession()
+
     def get_response_format(self) -> str:
         return (
             "Format messages with role names in brackets, e.g.:\n"
@@ -1,22 +1,89 @@
-import json
-import re
-from typing import List, Any
+from typing import Any, Dict, List, Optional, Union
 
 from yogurt.constants.json_format import JSON_RESPONSE
 from yogurt.output.streaming import StreamingChunk
-from yogurt.parsers.output_parsers.base import BaseOutputParser
+from yogurt.parsers.output_parsers.base import (
+    BaseOutputParser,
+    ConversationDelta,
+    StreamUpdate,
+)
 from yogurt.messages.base import SystemMessage, HumanMessage, AIMessage, BaseMessage
-from yogurt.utils.json_parsing import parse_json_markdown, parse_partial_json
+from yogurt.utils.json_parsing import parse_json_markdown
+from yogurt.utils.json_stream import JsonStreamReader
+
+_ROLE_TO_CLS = {
+    "system": SystemMessage,
+    "human": HumanMessage,
+    "ai": AIMessage,
+}
+
+
+class JsonStreamSession:
+    """
+    Parsing state for one streamed response.
+
+    Each chunk is read once by an incremental JSON reader, so parsing the
+    whole stream takes time linear in its length. Create one per stream with
+    `JsonResponseParser.start_stream()`; sessions share nothing, so one
+    parser can serve many concurrent streams.
+    """
+
+    def __init__(self, parser: "JsonResponseParser"):
+        self._parser = parser
+        self._reader = JsonStreamReader(
+            watch=[("conversation", "*")],
+            deltas=[("conversation", "*", "content")],
+        )
+        self.messages: List[BaseMessage] = []
+        """Completed messages so far."""
+
+    def _role(self, index: int) -> Optional[str]:
+        root = self._reader.value
+        try:
+            return root["conversation"][index].get("role")
+        except (TypeError, KeyError, IndexError, AttributeError):
+            return None
+
+    def feed(self, chunk: Union[StreamingChunk, str]) -> StreamUpdate:
+        """Reads the next chunk and returns what it completed."""
+        text = chunk if isinstance(chunk, str) else chunk.text
+        update = StreamUpdate()
+        for event in self._reader.feed(text):
+            if event.kind == "delta":
+                index = event.path[1]
+                update.deltas.append(
+                    ConversationDelta(index=index, role=self._role(index), text=event.value)
+                )
+            else:
+                message = self._parser._to_message(event.value)
+                if message is not None:
+                    update.messages.append(message)
+        self.messages.extend(update.messages)
+        return update
+
+    def finish(self) -> List[BaseMessage]:
+        """
+        Ends the stream and returns every message, including a best-effort
+        final one if the stream was cut off mid-message.
+        """
+        parsed = self._reader.finish()
+        if not isinstance(parsed, dict) or "conversation" not in parsed:
+            return list(self.messages)
+        return self._parser._parse_json_to_messages(parsed)
 
 
 class JsonResponseParser(BaseOutputParser):
     """
     Parses a JSON string from an LLM into a list of Message objects.
+
+    For streamed responses, use `start_stream()` to get a session per
+    stream. `parse_chunk` keeps a single built-in session for callers that
+    parse one stream at a time; call `reset()` before reusing it.
     """
 
     def __init__(self):
-        self.buffer = ""
         self.parsed_message_count = 0
+        self._session: Optional[JsonStreamSession] = None
 
     def parse_response(self, text: str) -> List[BaseMessage]:
         """
@@ -30,30 +97,25 @@ class JsonResponseParser(BaseOutputParser):
 
         return self._parse_json_to_messages(parsed_json)
 
+    def start_stream(self) -> JsonStreamSession:
+        """Returns a new, independent parsing session for one streamed response."""
+        return JsonStreamSession(self)
+
     def parse_streaming_chunk(self, chunk: StreamingChunk) -> Any:
         """
-        Accumulates text from a chunk and parses the buffer to find
-        any new, complete messages.
+        Reads a chunk into the built-in stream session and returns any
+        messages it completed.
         """
-        self.buffer += chunk.text
-
-        parsed_json = parse_partial_json(self.buffer)
-
-        # Attempt to parse the current buffer as partial JSON
-        parsed_json = parse_partial_json(self.buffer)
-
-        if parsed_json is None or "conversation" not in parsed_json:
-            return []
-
-        all_messages = self._parse_json_to_messages(parsed_json)
-
-        # Check if we have found more complete messages than we've already yielded
-        if len(all_messages) > self.parsed_message_count:
-            new_messages = all_messages[self.parsed_message_count :]
-            self.parsed_message_count = len(all_messages)
-            return new_messages
-
-        return []
+        if self._session is None:
+            self._session = self.start_stream()
+        new_messages = self._session.feed(chunk).messages
+        self.parsed_message_count += len(new_messages)
+        return new_messages
+
+    def reset(self) -> None:
+        """Discards the built-in stream session."""
+        self._session = None
+        self.parsed_message_count = 0
 
     def parse(self, text: str) -> List[BaseMessage]:
         return self.parse_response(text)
@@ -61,22 +123,24 @@ class JsonResponseParser(BaseOutputParser):
     def parse_chunk(self, text: StreamingChunk) -> Any:
         return self.parse_streaming_chunk(text)
 
-    def _parse_json_to_messages(self, parsed_json: dict) -> List[BaseMessage]:
+    @staticmethod
+    def _to_message(msg_data: Any) -> Optional[BaseMessage]:
+        """Converts one conversation entry to a message, if it is a valid one."""
+        if not isinstance(msg_data, dict):
+            return None
+        cls = _ROLE_TO_CLS.get(msg_data.get("role"))
+        content = msg_data.get("content")
+        if cls and content is not None:
+            return cls(content=content)
+        return None
+
+    def _parse_json_to_messages(self, parsed_json: Dict[str, Any]) -> List[BaseMessage]:
         """Helper function to convert a parsed JSON dict to message objects."""
         messages: List[BaseMessage] = []
-        role_to_cls = {
-            "system": SystemMessage,
-            "human": HumanMessage,
-            "ai": AIMessage,
-        }
-
         for msg_data in parsed_json.get("conversation", []):
-            role = msg_data.get("role")
-            content = msg_data.get("content")
-            cls = role_to_cls.get(role)
-
-            if cls and content is not None:
-                messages.append(cls(content=content))
+            message = self._to_message(msg_data)
+            if message is not None:
+                messages.append(message)
 
         return messages
 
@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List
 
 
 class BasePipe(ABC):
     """Base interface for all pipes."""
 
+    @property
+    def input_keys(self) -> List[str]:
+        """Keys this pipe reads from its inputs. Empty means it takes everything."""
+        return []
+
+    @property
+    def output_keys(self) -> List[str]:
+        """Keys of the dict this pipe returns."""
+        return []
+
     @abstractmethod
     def run(self, **kwargs: Any) -> Any:
         """The main execution method of the pipe."""
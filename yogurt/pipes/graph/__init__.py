@@ -0,0 +1,10 @@
+from .dag_pipe import DAGPipe, DAGRun, NodeResult, NodeTiming
+from .sequential_pipe import SequentialPipe
+
+__all__ = [
+    "DAGPipe",
+    "DAGRun",
+    "NodeResult",
+    "NodeTiming",
+    "SequentialPipe",
+]
@@ -0,0 +1,375 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel, Field
+
+from yogurt.callback_handlers.base import BaseCallbackHandler
+from yogurt.config.config import get_settings
+from yogurt.pipes.base import BasePipe
+from yogurt.tracing.base import Tracer, get_tracer
+
+
+class NodeTiming(BaseModel):
+    """Where one node's time went, in milliseconds since the run started."""
+
+    node: str
+    ready_ms: float
+    """When all of the node's inputs were available."""
+    start_ms: float
+    """When the node acquired a concurrency slot and started running."""
+    duration_ms: float
+
+    @property
+    def wait_ms(self) -> float:
+        """Time spent waiting for a concurrency slot."""
+        return self.start_ms - self.ready_ms
+
+
+class NodeResult(BaseModel):
+    """The outputs of one node, yielded by `stream`/`astream` as it finishes."""
+
+    node: str
+    outputs: Dict[str, Any]
+    timing: NodeTiming
+
+
+class DAGRun(BaseModel):
+    """The outputs of a whole run with its per-node timing breakdown."""
+
+    outputs: Dict[str, Any]
+    timings: List[NodeTiming] = Field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def critical_path_ms(self) -> float:
+        """The latest node finish time, i.e. the run time excluding overhead."""
+        return max((t.start_ms + t.duration_ms for t in self.timings), default=0.0)
+
+
+class _Run:
+    """Scheduling state of one execution: values produced so far and what is ready."""
+
+    def __init__(self, dag: "DAGPipe", inputs: Dict[str, Any]):
+        self.dag = dag
+        self.state = dict(inputs)
+        self.start = time.perf_counter()
+        self.waiting = {name: len(deps) for name, deps in dag.dependencies.items()}
+        self.ready = [name for name, count in self.waiting.items() if count == 0]
+        self.ready_at = {name: self.start for name in self.ready}
+        self.remaining = len(dag.nodes)
+
+    @property
+    def done(self) -> bool:
+        return self.remaining == 0
+
+    def take_ready(self) -> List[str]:
+        ready, self.ready = self.ready, []
+        return ready
+
+    def node_inputs(self, name: str) -> Dict[str, Any]:
+        keys = self.dag.nodes[name].input_keys
+        if not keys:
+            return dict(self.state)
+        return {key: self.state[key] for key in keys}
+
+    def complete(self, name: str, outputs: Dict[str, Any]) -> None:
+        self.state.update(outputs)
+        self.remaining -= 1
+        now = time.perf_counter()
+        for dependent in self.dag.dependents[name]:
+            self.waiting[dependent] -= 1
+            if self.waiting[dependent] == 0:
+                self.ready.append(dependent)
+                self.ready_at[dependent] = now
+
+    def ms(self, t: float) -> float:
+        return (t - self.start) * 1000
+
+
+class DAGPipe(BasePipe):
+    """
+    Runs a graph of pipes, each as soon as its inputs are available.
+
+    A node depends on whichever node lists one of its `input_keys` among its
+    `output_keys`; keys nobody produces must be passed to `run`. Extra
+    ordering can be added with `depends_on`. Nodes without `input_keys`
+    receive every value produced so far, so give them explicit dependencies.
+
+    Ready nodes run concurrently: on asyncio for `arun`/`astream`, on a
+    thread pool for `run`/`stream`, with at most `max_concurrency` nodes
+    running at once. A flow that fans out to N independent calls therefore
+    takes about as long as the depth of the graph rather than N round
+    trips. `stream`/`astream` yield each node's `NodeResult` as it finishes;
+    `execute`/`aexecute` return the outputs with a per-node timing breakdown.
+    """
+
+    _shadow_outputs = False
+    """
+    Whether a node may produce a key an earlier node already produced. Only
+    safe when nodes run in declaration order; each then reads the latest
+    earlier value of the key.
+    """
+
+    def __init__(
+        self,
+        nodes: Union[Mapping[str, BasePipe], Sequence[BasePipe]],
+        depends_on: Optional[Mapping[str, Sequence[str]]] = None,
+        output_keys: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        callbacks: Optional[List[BaseCallbackHandler]] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        if not isinstance(nodes, Mapping):
+            nodes = {f"{i}:{type(pipe).__name__}": pipe for i, pipe in enumerate(nodes)}
+        self.nodes: Dict[str, BasePipe] = dict(nodes)
+        self.max_concurrency = max_concurrency
+        self.callbacks = callbacks or []
+        self.tracer = tracer
+        self._output_keys = output_keys
+        self.dependencies: Dict[str, Set[str]] = {name: set() for name in self.nodes}
+        self.dependents: Dict[str, Set[str]] = {name: set() for name in self.nodes}
+        self._wire(depends_on or {})
+
+    def _wire(self, depends_on: Mapping[str, Sequence[str]]) -> None:
+        producers: Dict[str, str] = {}
+        external: Set[str] = set()
+        if self._shadow_outputs:
+            for name, pipe in self.nodes.items():
+                for key in pipe.input_keys:
+                    producer = producers.get(key)
+                    if producer is None:
+                        external.add(key)
+                    else:
+                        self._add_edge(producer, name)
+                producers.update((key, name) for key in pipe.output_keys)
+        else:
+            for name, pipe in self.nodes.items():
+                for key in pipe.output_keys:
+                    if key in producers:
+                        raise ValueError(
+                            f"Output key '{key}' is produced by both "
+                            f"'{producers[key]}' and '{name}'"
+                        )
+                    producers[key] = name
+            for name, pipe in self.nodes.items():
+                for key in pipe.input_keys:
+                    producer = producers.get(key)
+                    if producer is None:
+                        external.add(key)
+                    elif producer != name:
+                        self._add_edge(producer, name)
+        for name, deps in depends_on.items():
+            for dep in deps:
+                self._add_edge(dep, name)
+        self._check_acyclic()
+        self._producers = producers
+        self._external_inputs = external
+
+    def _add_edge(self, source: str, target: str) -> None:
+        for node in (source, target):
+            if node not in self.nodes:
+                raise ValueError(f"Unknown node '{node}'")
+        self.dependencies[target].add(source)
+        self.dependents[source].add(target)
+
+    def _check_acyclic(self) -> None:
+        waiting = {name: len(deps) for name, deps in self.dependencies.items()}
+        ready = [name for name, count in waiting.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in self.dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self.nodes):
+            cyclic = sorted(name for name, count in waiting.items() if count > 0)
+            raise ValueError(f"Pipe graph has a cycle through {cyclic}")
+
+    @property
+    def input_keys(self) -> List[str]:
+        """Keys some node reads that no node produces (before it, in a sequence)."""
+        return sorted(self._external_inputs)
+
+    @property
+    def output_keys(self) -> List[str]:
+        if self._output_keys is not None:
+            return list(self._output_keys)
+        return sorted(self._producers)
+
+    def _limit(self) -> int:
+        return self.max_concurrency or get_settings().max_concurrent_requests
+
+    def _get_tracer(self) -> Tracer:
+        return self.tracer if self.tracer is not None else get_tracer()
+
+    def _start(self, inputs: Dict[str, Any]) -> _Run:
+        missing = [key for key in self.input_keys if key not in inputs]
+        if missing:
+            raise ValueError(f"Missing inputs for {type(self).__name__}: {missing}")
+        for handler in self.callbacks:
+            handler.on_pipe_start(self, inputs=inputs)
+        return _Run(self, inputs)
+
+    def _result(
+        self, run: _Run, name: str, result: Any, started: float, ended: float
+    ) -> NodeResult:
+        pipe = self.nodes[name]
+        if isinstance(result, dict):
+            outputs = result
+        elif len(pipe.output_keys) == 1:
+            outputs = {pipe.output_keys[0]: result}
+        else:
+            raise TypeError(
+                f"Node '{name}' returned {type(result).__name__}; "
+                "pipes in a graph must return a dict of their output keys"
+            )
+        run.complete(name, outputs)
+        return NodeResult(
+            node=name,
+            outputs=outputs,
+            timing=NodeTiming(
+                node=name,
+                ready_ms=run.ms(run.ready_at[name]),
+                start_ms=run.ms(started),
+                duration_ms=(ended - started) * 1000,
+            ),
+        )
+
+    def _finish(self, run: _Run, timings: List[NodeTiming]) -> DAGRun:
+        outputs = {key: run.state[key] for key in self.output_keys if key in run.state}
+        duration = time.perf_counter() - run.start
+        with self._get_tracer().start_trace(
+            "pipe.dag", nodes=len(self.nodes)
+        ) as trace:
+            for timing in timings:
+                trace.add_span(
+                    timing.node,
+                    run.start + timing.start_ms / 1000,
+                    timing.duration_ms / 1000,
+                    wait_ms=timing.wait_ms,
+                )
+        for handler in self.callbacks:
+            handler.on_pipe_end(outputs=outputs)
+        return DAGRun(outputs=outputs, timings=timings, duration_ms=duration * 1000)
+
+    def _error(self, error: Exception) -> None:
+        for handler in self.callbacks:
+            handler.on_pipe_error(error)
+
+    # --- Sync ---
+    def _iter_results(self, run: _Run) -> Iterator[NodeResult]:
+        def execute(name: str) -> Tuple[float, Any, float]:
+            started = time.perf_counter()
+            result = self.nodes[name].run(**run.node_inputs(name))
+            return started, result, time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self._limit()) as executor:
+            futures: Dict[Future, str] = {}
+            try:
+                while not run.done:
+                    for name in run.take_ready():
+                        futures[executor.submit(execute, name)] = name
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = futures.pop(future)
+                        started, result, ended = future.result()
+                        yield self._result(run, name, result, started, ended)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def stream(self, **kwargs: Any) -> Iterator[NodeResult]:
+        """Runs the graph, yielding each node's result as it finishes."""
+        run = self._start(kwargs)
+        timings = []
+        try:
+            for result in self._iter_results(run):
+                timings.append(result.timing)
+                yield result
+        except Exception as e:
+            self._error(e)
+            raise
+        self._finish(run, timings)
+
+    def execute(self, **kwargs: Any) -> DAGRun:
+        """Runs the graph and returns its outputs with per-node timings."""
+        run = self._start(kwargs)
+        try:
+            timings = [result.timing for result in self._iter_results(run)]
+        except Exception as e:
+            self._error(e)
+            raise
+        return self._finish(run, timings)
+
+    def run(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.execute(**kwargs).outputs
+
+    # --- Async ---
+    async def _aiter_results(self, run: _Run) -> AsyncIterator[NodeResult]:
+        semaphore = asyncio.Semaphore(self._limit())
+
+        async def execute(name: str) -> Tuple[float, Any, float]:
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.nodes[name].arun(**run.node_inputs(name))
+                return started, result, time.perf_counter()
+
+        tasks: Dict[asyncio.Task, str] = {}
+        try:
+            while not run.done:
+                for name in run.take_ready():
+                    tasks[asyncio.create_task(execute(name))] = name
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks.pop(task)
+                    started, result, ended = task.result()
+                    yield self._result(run, name, result, started, ended)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def astream(self, **kwargs: Any) -> AsyncIterator[NodeResult]:
+        """Runs the graph concurrently, yielding each node's result as it finishes."""
+        run = self._start(kwargs)
+        timings = []
+        try:
+            async for result in self._aiter_results(run):
+                timings.append(result.timing)
+                yield result
+        except Exception as e:
+            self._error(e)
+            raise
+        self._finish(run, timings)
+
+    async def aexecute(self, **kwargs: Any) -> DAGRun:
+        """Runs the graph concurrently and returns its outputs with per-node timings."""
+        run = self._start(kwargs)
+        timings = []
+        try:
+            async for result in self._aiter_results(run):
+                timings.append(result.timing)
+        except Exception as e:
+            self._error(e)
+            raise
+        return self._finish(run, timings)
+
+    async def arun(self, **kwargs: Any) -> Dict[str, Any]:
+        return (await self.aexecute(**kwargs)).outputs
@@ -0,0 +1,33 @@
+from typing import List, Optional, Sequence
+
+from yogurt.callback_handlers.base import BaseCallbackHandler
+from yogurt.pipes.base import BasePipe
+from yogurt.pipes.graph.dag_pipe import DAGPipe
+from yogurt.tracing.base import Tracer
+
+
+class SequentialPipe(DAGPipe):
+    """
+    Runs pipes one after another. Each pipe receives the original inputs
+    plus everything earlier pipes returned, narrowed to its `input_keys`.
+    Pipes may reuse an output key; the latest value wins.
+    """
+
+    _shadow_outputs = True
+
+    def __init__(
+        self,
+        pipes: Sequence[BasePipe],
+        output_keys: Optional[List[str]] = None,
+        callbacks: Optional[List[BaseCallbackHandler]] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        names = [f"{i}:{type(pipe).__name__}" for i, pipe in enumerate(pipes)]
+        super().__init__(
+            nodes=dict(zip(names, pipes)),
+            depends_on={later: [earlier] for earlier, later in zip(names, names[1:])},
+            output_keys=output_keys,
+            max_concurrency=1,
+            callbacks=callbacks,
+            tracer=tracer,
+        )
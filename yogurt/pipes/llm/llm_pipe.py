@@ -1,12 +1,43 @@
-from typing import Any, List, Optional, Iterator, AsyncIterator, Dict
+import time
+import uuid
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from yogurt.pipes import BasePipe
 from yogurt.llms import BaseLLM
 from yogurt.prompts.builders import BasePromptBuilder
 from yogurt.callback_handlers.base import BaseCallbackHandler
-from yogurt.parsers.output_parsers import OutputParser
-from yogurt.output.streaming import StreamingChunk
+from yogurt.parsers.output_parsers import ChunkStreamSession, OutputParser
+from yogurt.output.streaming import ParsedStreamingChunk, StreamingChunk
 from yogurt.output.base import LLMResult, Generation
+from yogurt.output.events import (
+    AnyPipeEvent,
+    ErrorEvent,
+    FirstTokenEvent,
+    LLMEndEvent,
+    ParsedObjectEvent,
+    PipeEndEvent,
+    PipeStartEvent,
+    PromptFormattedEvent,
+    TokenDeltaEvent,
+    ToolCallEvent,
+)
+from yogurt.agents.models import ToolCall
+from yogurt.utils.concurrency import (
+    bounded_as_completed,
+    bounded_gather,
+    bounded_in_order,
+    bounded_map_threaded,
+)
 
 
 class LLMPipe(BasePipe):
@@ -105,6 +136,80 @@ class LLMPipe(BasePipe):
         result = await self.arun(**kwargs)
         return result[self.output_key]
 
+    # --- Batch methods ---
+    def map(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        ordered: bool = False,
+    ) -> Iterator[Tuple[int, Dict[str, Any] | Exception]]:
+        """
+        Runs the pipe over many input dicts on a bounded thread pool and
+        yields `(index, output)` pairs as they complete, or in input order
+        with `ordered`. Inputs are pulled lazily, so a large generator is
+        never materialized. With `return_exceptions` (the default), a failed
+        input yields its exception instead of stopping the run.
+        """
+        yield from bounded_map_threaded(
+            lambda item: self.run(**item),
+            inputs,
+            self.llm.batch_concurrency(max_concurrency),
+            return_exceptions=return_exceptions,
+            ordered=ordered,
+        )
+
+    def batch(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+    ) -> List[Dict[str, Any] | Exception]:
+        """Runs the pipe over many input dicts and returns the outputs in input order."""
+        return [
+            output
+            for _, output in self.map(
+                inputs, max_concurrency, return_exceptions, ordered=True
+            )
+        ]
+
+    async def amap(
+        self,
+        inputs: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        ordered: bool = False,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any] | Exception]]:
+        """
+        Asynchronously runs the pipe over many input dicts with at most
+        `max_concurrency` LLM calls in flight, yielding `(index, output)`
+        pairs as they complete, or in input order with `ordered`. Inputs may
+        be an async iterable and are pulled lazily, so memory stays bounded
+        by the concurrency limit rather than the dataset size.
+        """
+        run_all = bounded_in_order if ordered else bounded_as_completed
+        async for index, output in run_all(
+            lambda item: self.arun(**item),
+            inputs,
+            self.llm.batch_concurrency(max_concurrency),
+            return_exceptions=return_exceptions,
+        ):
+            yield index, output
+
+    async def abatch(
+        self,
+        inputs: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+    ) -> List[Dict[str, Any] | Exception]:
+        """Asynchronously runs the pipe over many input dicts, returning outputs in input order."""
+        return await bounded_gather(
+            lambda item: self.arun(**item),
+            inputs,
+            self.llm.batch_concurrency(max_concurrency),
+            return_exceptions=return_exceptions,
+        )
+
     def stream(self, **kwargs: Any) -> Iterator[StreamingChunk]:
         for handler in self.callbacks:
             handler.on_pipe_start(self, inputs=kwargs)
@@ -142,19 +247,262 @@ class LLMPipe(BasePipe):
                 yield chunk
 
             final_text = "".join(final_result_parts)
-            if final_chunk:
-                final_generation = Generation(
-                    text=final_text, metadata=final_chunk.metadata
-                )
-                llm_result = LLMResult(
-                    generations=[final_generation], llm_output=final_chunk.metadata
-                )
+            self._end_stream(final_text, final_chunk, {"result": final_text})
+        except Exception as e:
+            for handler in self.callbacks:
+                handler.on_pipe_error(e)
+            raise e
+
+    # --- Parsed streaming ---
+    def _end_stream(
+        self,
+        final_text: str,
+        final_chunk: Optional[StreamingChunk],
+        outputs: Dict[str, Any],
+    ) -> None:
+        if final_chunk:
+            final_generation = Generation(text=final_text, metadata=final_chunk.metadata)
+            llm_result = LLMResult(
+                generations=[final_generation], llm_output=final_chunk.metadata
+            )
+            for handler in self.callbacks:
+                handler.on_llm_end(llm_result)
+
+        for handler in self.callbacks:
+            handler.on_pipe_end(outputs=outputs)
+
+    def _start_parsing(self) -> Any:
+        if self.output_parser is None:
+            raise ValueError(
+                f"{type(self).__name__} needs an output_parser to stream parsed output"
+            )
+        start_stream = getattr(self.output_parser, "start_stream", None)
+        if start_stream is None:
+            return ChunkStreamSession(self.output_parser)
+        return start_stream()
+
+    def _parsed_chunk(
+        self, session: Any, chunk: StreamingChunk, parsed_only: bool
+    ) -> Optional[ParsedStreamingChunk]:
+        update = session.feed(chunk)
+        if parsed_only and not update.messages:
+            return None
+        return ParsedStreamingChunk(
+            text=chunk.text,
+            metadata=chunk.metadata,
+            parsed=update.messages,
+            deltas=update.deltas,
+        )
+
+    def _final_parsed(
+        self, session: Any, emitted: int, final_chunk: Optional[StreamingChunk]
+    ) -> Tuple[ParsedStreamingChunk, List[Any]]:
+        parsed = session.finish()
+        final = ParsedStreamingChunk(
+            text="",
+            metadata=final_chunk.metadata if final_chunk else {},
+            parsed=parsed[emitted:],
+            final=True,
+        )
+        return final, parsed
+
+    def stream_parsed(
+        self, parsed_only: bool = False, **kwargs: Any
+    ) -> Iterator[ParsedStreamingChunk]:
+        """
+        Streams the response through the output parser, yielding each chunk
+        with the objects it completed, so consumers can act on the first
+        parsed message while the model is still generating. With
+        `parsed_only`, only chunks that completed something are yielded. The
+        stream always ends with a `final` chunk holding anything only the end
+        of the response completed.
+        """
+        for handler in self.callbacks:
+            handler.on_pipe_start(self, inputs=kwargs)
+        try:
+            session = self._start_parsing()
+            prompt_value = self.prompt.format_prompt(**kwargs)
+            for handler in self.callbacks:
+                handler.on_llm_start(serialized={}, inputs={"prompt": prompt_value})
+
+            parts: List[str] = []
+            final_chunk = None
+            emitted = 0
+            for chunk in self.llm.stream(prompt_value):
+                parts.append(chunk.text)
+                final_chunk = chunk
                 for handler in self.callbacks:
-                    handler.on_llm_end(llm_result)
+                    handler.on_llm_stream(chunk)
+                parsed_chunk = self._parsed_chunk(session, chunk, parsed_only)
+                if parsed_chunk is not None:
+                    emitted += len(parsed_chunk.parsed)
+                    yield parsed_chunk
 
+            final, parsed = self._final_parsed(session, emitted, final_chunk)
+            yield final
+            self._end_stream("".join(parts), final_chunk, {self.output_key: parsed})
+        except Exception as e:
             for handler in self.callbacks:
-                handler.on_pipe_end(outputs={"result": final_text})
+                handler.on_pipe_error(e)
+            raise e
+
+    async def astream_parsed(
+        self, parsed_only: bool = False, **kwargs: Any
+    ) -> AsyncIterator[ParsedStreamingChunk]:
+        """Asynchronous version of `stream_parsed`."""
+        for handler in self.callbacks:
+            handler.on_pipe_start(self, inputs=kwargs)
+        try:
+            session = self._start_parsing()
+            prompt_value = self.prompt.format_prompt(**kwargs)
+            for handler in self.callbacks:
+                handler.on_llm_start(serialized={}, inputs={"prompt": prompt_value})
+
+            parts: List[str] = []
+            final_chunk = None
+            emitted = 0
+            async for chunk in self.llm.astream(prompt_value):
+                parts.append(chunk.text)
+                final_chunk = chunk
+                for handler in self.callbacks:
+                    handler.on_llm_stream(chunk)
+                parsed_chunk = self._parsed_chunk(session, chunk, parsed_only)
+                if parsed_chunk is not None:
+                    emitted += len(parsed_chunk.parsed)
+                    yield parsed_chunk
+
+            final, parsed = self._final_parsed(session, emitted, final_chunk)
+            yield final
+            self._end_stream("".join(parts), final_chunk, {self.output_key: parsed})
         except Exception as e:
             for handler in self.callbacks:
                 handler.on_pipe_error(e)
             raise e
+
+    # --- Events ---
+    @staticmethod
+    def _tool_calls(chunk: StreamingChunk) -> List[ToolCall]:
+        """Tool calls in an Ollama chat chunk, if any."""
+        message = chunk.metadata.get("message")
+        if not isinstance(message, dict):
+            return []
+        calls = []
+        for call in message.get("tool_calls") or []:
+            function = call.get("function") or {}
+            calls.append(
+                ToolCall(
+                    tool_name=function.get("name", ""),
+                    arguments=function.get("arguments") or {},
+                )
+            )
+        return calls
+
+    @staticmethod
+    def _llm_end_event(
+        run_id: str,
+        elapsed_ms: float,
+        text: str,
+        chunks: int,
+        final_chunk: Optional[StreamingChunk],
+    ) -> LLMEndEvent:
+        metadata = final_chunk.metadata if final_chunk else {}
+        stats = {
+            key: metadata[key]
+            for key in LLMEndEvent.model_fields
+            if key.endswith(("_count", "_duration")) and isinstance(metadata.get(key), int)
+        }
+        return LLMEndEvent(
+            run_id=run_id, elapsed_ms=elapsed_ms, text=text, chunks=chunks, **stats
+        )
+
+    async def astream_events(self, **kwargs: Any) -> AsyncIterator[AnyPipeEvent]:
+        """
+        Runs the pipe with a streaming LLM call and yields typed events:
+        pipe start, prompt formatted, first token, a delta per chunk, each
+        object the output parser completes, tool calls, LLM end with the
+        server's token counts and timings, and pipe end. A failure yields an
+        `ErrorEvent` before the exception is raised. Callbacks are invoked as
+        in `astream`.
+        """
+        run_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        yield PipeStartEvent(
+            run_id=run_id, elapsed_ms=0.0, pipe=type(self).__name__, inputs=kwargs
+        )
+        for handler in self.callbacks:
+            handler.on_pipe_start(self, inputs=kwargs)
+
+        try:
+            session = self._start_parsing() if self.output_parser else None
+            formatting = time.perf_counter()
+            prompt_value = self.prompt.format_prompt(**kwargs)
+            requested = time.perf_counter()
+            yield PromptFormattedEvent(
+                run_id=run_id,
+                elapsed_ms=(requested - start) * 1000,
+                prompt=prompt_value,
+                duration_ms=(requested - formatting) * 1000,
+            )
+            for handler in self.callbacks:
+                handler.on_llm_start(serialized={}, inputs={"prompt": prompt_value})
+
+            parts: List[str] = []
+            final_chunk = None
+            parsed_count = 0
+            async for chunk in self.llm.astream(prompt_value):
+                now = time.perf_counter()
+                elapsed_ms = (now - start) * 1000
+                if final_chunk is None:
+                    yield FirstTokenEvent(
+                        run_id=run_id,
+                        elapsed_ms=elapsed_ms,
+                        llm_ms=(now - requested) * 1000,
+                    )
+                final_chunk = chunk
+                for handler in self.callbacks:
+                    handler.on_llm_stream(chunk)
+                if chunk.text:
+                    yield TokenDeltaEvent(
+                        run_id=run_id, elapsed_ms=elapsed_ms, text=chunk.text, index=len(parts)
+                    )
+                parts.append(chunk.text)
+                for call in self._tool_calls(chunk):
+                    yield ToolCallEvent(run_id=run_id, elapsed_ms=elapsed_ms, tool_call=call)
+                if session is not None:
+                    for value in session.feed(chunk).messages:
+                        yield ParsedObjectEvent(
+                            run_id=run_id, elapsed_ms=elapsed_ms, value=value, index=parsed_count
+                        )
+                        parsed_count += 1
+
+            final_text = "".join(parts)
+            yield self._llm_end_event(
+                run_id, (time.perf_counter() - start) * 1000, final_text, len(parts), final_chunk
+            )
+            output: Any = final_text
+            if session is not None:
+                output = session.finish()
+                for value in output[parsed_count:]:
+                    yield ParsedObjectEvent(
+                        run_id=run_id,
+                        elapsed_ms=(time.perf_counter() - start) * 1000,
+                        value=value,
+                        index=parsed_count,
+                    )
+                    parsed_count += 1
+
+            outputs = {self.output_key: output}
+            self._end_stream(final_text, final_chunk, outputs)
+            yield PipeEndEvent(
+                run_id=run_id, elapsed_ms=(time.perf_counter() - start) * 1000, outputs=outputs
+            )
+        except Exception as e:
+            for handler in self.callbacks:
+                handler.on_pipe_error(e)
+            yield ErrorEvent(
+                run_id=run_id,
+                elapsed_ms=(time.perf_counter() - start) * 1000,
+                error_type=type(e).__name__,
+                message=str(e),
+            )
+            raise e
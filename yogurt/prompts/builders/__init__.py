@@ -1,4 +1,5 @@
 from .base import BasePromptBuilder, PromptBuilder
 from .chat import ChatPromptBuilder
+from .compiled import CompiledTemplate, RenderCache
 
-__all__ = ["BasePromptBuilder", "PromptBuilder", "ChatPromptBuilder"]
+__all__ = ["BasePromptBuilder", "PromptBuilder", "ChatPromptBuilder", "CompiledTemplate", "RenderCache"]
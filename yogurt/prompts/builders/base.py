@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from yogurt.prompts.builders.compiled import CompiledTemplate, RenderCache, cached_format
 from yogurt.prompts.prompt_value import PromptValue
 
 
@@ -11,12 +12,49 @@ class BasePromptBuilder(ABC):
         """Create a PromptValue from user input."""
         pass
 
+    def format_prompts(self, inputs: Iterable[Mapping[str, Any]]) -> List[PromptValue]:
+        """Create a PromptValue for each input dict."""
+        return [self.format_prompt(**values) for values in inputs]
+
 
 class PromptBuilder(BasePromptBuilder):
-    """A simple prompt builder that takes a single input and returns a PromptValue."""
+    """
+    A simple prompt builder that takes a single input and returns a PromptValue.
+
+    The template is compiled once. `partial` binds variables up front, and
+    with `cache_size` rendered PromptValues are kept in an LRU keyed by the
+    input values; cached values are shared, so treat them as read-only.
+    """
 
-    def __init__(self, template: str):
+    def __init__(
+        self,
+        template: str,
+        partial_variables: Optional[Dict[str, Any]] = None,
+        cache_size: int = 0,
+    ):
         self.template = template
+        self.partial_variables = dict(partial_variables or {})
+        self.cache_size = cache_size
+        self._compiled = CompiledTemplate(template).partial(**self.partial_variables)
+        self.input_variables: List[str] = self._compiled.variables
+        self.cache = RenderCache(cache_size) if cache_size else None
+
+    def partial(self, **kwargs: Any) -> "PromptBuilder":
+        """Returns a builder with the given variables bound."""
+        return type(self)(
+            self.template,
+            partial_variables={**self.partial_variables, **kwargs},
+            cache_size=self.cache_size,
+        )
+
+    def _render(self, values: Dict[str, Any]) -> PromptValue:
+        return PromptValue.model_construct(text=self._compiled.render(values))
 
     def format_prompt(self, **kwargs: Any) -> PromptValue:
-        return PromptValue(text=self.template.format(**kwargs))
+        return cached_format(self.cache, self.input_variables, kwargs, self._render)
+
+    def format_prompts(self, inputs: Iterable[Mapping[str, Any]]) -> List[PromptValue]:
+        if self.cache is not None:
+            return [self.format_prompt(**values) for values in inputs]
+        render = self._compiled.render
+        return [PromptValue.model_construct(text=render(values)) for values in inputs]
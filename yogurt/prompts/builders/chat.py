@@ -1,21 +1,42 @@
-import re
-from typing import List, Any
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 from yogurt.prompts.builders.base import BasePromptBuilder
+from yogurt.prompts.builders.compiled import CompiledTemplate, RenderCache, cached_format
 from yogurt.prompts.prompt_value import PromptValue
 from yogurt.messages.base import BaseMessage, SystemMessage, HumanMessage
 
 
 class ChatPromptBuilder(BasePromptBuilder):
-    """A prompt template for creating conversational message lists."""
+    """
+    A prompt template for creating conversational message lists.
+
+    Both templates are compiled once. A message whose template has no
+    variables left, such as a large static system prompt or one completed
+    with `partial`, is built once and reused by every PromptValue. With
+    `cache_size`, rendered PromptValues are kept in an LRU keyed by the input
+    values. Shared messages and cached values must be treated as read-only.
+    """
 
     system_template: str
     human_template: str
     input_variables: List[str]
 
-    def __init__(self, system_msg: str, human_msg: str):
+    def __init__(
+        self,
+        system_msg: str,
+        human_msg: str,
+        partial_variables: Optional[Dict[str, Any]] = None,
+        cache_size: int = 0,
+    ):
         self.system_template = system_msg
         self.human_template = human_msg
-        self.input_variables = self._get_variables(system_msg + human_msg)
+        self.partial_variables = dict(partial_variables or {})
+        self.cache_size = cache_size
+        self._system = CompiledTemplate(system_msg).partial(**self.partial_variables)
+        self._human = CompiledTemplate(human_msg).partial(**self.partial_variables)
+        self.input_variables = sorted(set(self._system.variables + self._human.variables))
+        self._static_system = self._static_message(self._system, SystemMessage)
+        self._static_human = self._static_message(self._human, HumanMessage)
+        self.cache = RenderCache(cache_size) if cache_size else None
 
     def __repr__(self) -> str:
         """Provides a developer-friendly string representation of the object."""
@@ -27,14 +48,38 @@ class ChatPromptBuilder(BasePromptBuilder):
             f")"
         )
 
-    def _get_variables(self, template: str) -> List[str]:
-        """Uses regex to find all unique variables in a f-string template."""
-        return sorted(list(set(re.findall(r"\{(\w+)\}", template))))
+    @staticmethod
+    def _static_message(
+        template: CompiledTemplate, message_cls: type[BaseMessage]
+    ) -> Optional[BaseMessage]:
+        if not template.is_static:
+            return None
+        return message_cls(content=template.render({}))
+
+    def partial(self, **kwargs: Any) -> "ChatPromptBuilder":
+        """Returns a builder with the given variables bound."""
+        return type(self)(
+            self.system_template,
+            self.human_template,
+            partial_variables={**self.partial_variables, **kwargs},
+            cache_size=self.cache_size,
+        )
+
+    def _render(self, values: Mapping[str, Any]) -> PromptValue:
+        system_message = self._static_system or SystemMessage.model_construct(
+            content=self._system.render(values)
+        )
+        human_message = self._static_human or HumanMessage.model_construct(
+            content=self._human.render(values)
+        )
+        return PromptValue.model_construct(messages=[system_message, human_message])
 
     def format_prompt(self, **kwargs: Any) -> PromptValue:
         """Formats the templates into a list of messages."""
-        system_message = SystemMessage(content=self.system_template.format(**kwargs))
-        human_message = HumanMessage(content=self.human_template.format(**kwargs))
+        return cached_format(self.cache, self.input_variables, kwargs, self._render)
 
-        # Returns a PromptValue containing the list of messages
-        return PromptValue(messages=[system_message, human_message])
+    def format_prompts(self, inputs: Iterable[Mapping[str, Any]]) -> List[PromptValue]:
+        """Formats the templates for each input dict."""
+        if self.cache is not None:
+            return [self.format_prompt(**values) for values in inputs]
+        return [self._render(values) for values in inputs]
@@ -0,0 +1,177 @@
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from yogurt.prompts.prompt_value import PromptValue
+
+_formatter = Formatter()
+
+
+class _Slot:
+    """A replacement field of a template."""
+
+    __slots__ = ("name", "render")
+
+    def __init__(self, field: str, format_spec: str, conversion: Optional[str]):
+        # The variable a field such as "user.name" or "items[0]" reads.
+        self.name = field.split(".", 1)[0].split("[", 1)[0]
+        if field == self.name and not format_spec and not conversion:
+            self.render: Callable[[Mapping[str, Any]], str] = self._plain
+        else:
+            # Attribute access, indexing, conversions and format specs keep
+            # the exact semantics of `str.format`.
+            source = "{" + field
+            if conversion:
+                source += "!" + conversion
+            if format_spec:
+                source += ":" + format_spec
+            source += "}"
+            self.render = lambda values: source.format_map(values)
+
+    def _plain(self, values: Mapping[str, Any]) -> str:
+        return format(values[self.name])
+
+
+class CompiledTemplate:
+    """
+    A `str.format` template parsed once into literal text and slots.
+
+    Rendering joins the literals with the formatted slot values, so the
+    template is not re-parsed on every call. `partial` bakes values into the
+    literals and returns a new template; a template whose slots are all bound
+    renders to a constant string.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._literals: List[str] = [""]
+        self._slots: List[_Slot] = []
+        for literal, field, format_spec, conversion in _formatter.parse(template):
+            self._literals[-1] += literal
+            if field is None:
+                continue
+            if not field:
+                raise ValueError(
+                    f"Template {template!r} has a positional field; name every field"
+                )
+            self._slots.append(_Slot(field, format_spec, conversion))
+            self._literals.append("")
+
+    @property
+    def variables(self) -> List[str]:
+        """The names of the variables still to be supplied, sorted."""
+        return sorted({slot.name for slot in self._slots})
+
+    @property
+    def is_static(self) -> bool:
+        return not self._slots
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Formats the template; raises KeyError for a missing variable."""
+        literals = self._literals
+        if not self._slots:
+            return literals[0]
+        parts = [literals[0]]
+        for slot, literal in zip(self._slots, literals[1:]):
+            parts.append(slot.render(values))
+            parts.append(literal)
+        return "".join(parts)
+
+    def partial(self, **values: Any) -> "CompiledTemplate":
+        """Returns a copy with the given variables rendered into the literal text."""
+        compiled = CompiledTemplate.__new__(CompiledTemplate)
+        compiled.template = self.template
+        compiled._literals = [self._literals[0]]
+        compiled._slots = []
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            if slot.name in values:
+                compiled._literals[-1] += slot.render(values) + literal
+            else:
+                compiled._slots.append(slot)
+                compiled._literals.append(literal)
+        return compiled
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.template!r})"
+
+
+class RenderCache:
+    """
+    A thread-safe LRU of rendered PromptValues keyed by the values of a
+    builder's input variables.
+
+    Cached PromptValues are shared between callers and must be treated as
+    read-only. Inputs with unhashable values are rendered but not cached.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], PromptValue]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(variables: List[str], values: Mapping[str, Any]) -> Optional[Tuple[Hashable, ...]]:
+        """The cache key of an input, or None if it cannot be hashed."""
+        # A missing variable gets a sentinel so rendering still raises KeyError.
+        # Types are part of the key: True, 1 and 1.0 are equal but render
+        # differently.
+        key = tuple(
+            (type(value), value)
+            for value in (values.get(name, _MISSING) for name in variables)
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[PromptValue]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Tuple[Hashable, ...], value: PromptValue) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_MISSING = object()
+
+
+def cached_format(
+    cache: Optional[RenderCache],
+    variables: List[str],
+    values: Dict[str, Any],
+    render: Callable[[Dict[str, Any]], PromptValue],
+) -> PromptValue:
+    """Renders through `cache` when one is configured."""
+    if cache is None:
+        return render(values)
+    key = cache.key(variables, values)
+    if key is None:
+        return render(values)
+    prompt_value = cache.get(key)
+    if prompt_value is None:
+        prompt_value = render(values)
+        cache.set(key, prompt_value)
+    return prompt_value
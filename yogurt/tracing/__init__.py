@@ -0,0 +1,22 @@
+from .base import (
+    BaseTraceSink,
+    SpanRecord,
+    Trace,
+    TraceRecord,
+    Tracer,
+    get_tracer,
+    set_tracer,
+)
+from .sinks import InMemoryTraceSink, LoggingTraceSink
+
+__all__ = [
+    "BaseTraceSink",
+    "SpanRecord",
+    "Trace",
+    "TraceRecord",
+    "Tracer",
+    "get_tracer",
+    "set_tracer",
+    "InMemoryTraceSink",
+    "LoggingTraceSink",
+]
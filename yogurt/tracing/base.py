@@ -0,0 +1,242 @@
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SpanRecord(BaseModel):
+    """A finished, timed step within a trace."""
+
+    name: str
+    start_ms: float
+    """Milliseconds since the start of the trace."""
+    duration_ms: float
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+class TraceRecord(BaseModel):
+    """A finished trace of one request, as delivered to a sink."""
+
+    trace_id: str
+    name: str
+    start_time: float
+    """Unix timestamp at which the trace started."""
+    duration_ms: float
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+    spans: List[SpanRecord] = Field(default_factory=list)
+    payloads: Dict[str, Any] = Field(default_factory=dict)
+    """Captured request/response bodies, kept as raw objects until a sink serializes them."""
+    error: Optional[str] = None
+
+
+class BaseTraceSink(ABC):
+    """Interface for receiving finished traces."""
+
+    @abstractmethod
+    def emit(self, record: TraceRecord) -> None:
+        pass
+
+
+class Span:
+    """A running span. Use as a context manager, or call `end()` explicitly."""
+
+    __slots__ = ("_trace", "name", "attributes", "_start")
+
+    def __init__(self, trace: "Trace", name: str, attributes: Dict[str, Any]):
+        self._trace = trace
+        self.name = name
+        self.attributes = attributes
+        self._start = time.perf_counter()
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self._trace._record(self.name, self._start, time.perf_counter(), self.attributes)
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.end()
+
+
+class Trace:
+    """Collects the spans of one request and hands them to the sink on `end()`."""
+
+    enabled = True
+
+    def __init__(
+        self,
+        sink: BaseTraceSink,
+        name: str,
+        attributes: Dict[str, Any],
+        capture_payloads: bool,
+    ):
+        self._sink = sink
+        self.name = name
+        self.attributes = attributes
+        self.capture_payloads = capture_payloads
+        self.trace_id = os.urandom(8).hex()
+        self._start_time = time.time()
+        self._start = time.perf_counter()
+        self._spans: List[SpanRecord] = []
+        self._payloads: Dict[str, Any] = {}
+        self._ended = False
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        return Span(self, name, attributes)
+
+    def add_span(
+        self, name: str, start: float, duration: float, **attributes: Any
+    ) -> None:
+        """Records a span measured elsewhere, e.g. time summed over many chunks."""
+        self._record(name, start, start + duration, attributes)
+
+    def _record(
+        self, name: str, start: float, end: float, attributes: Dict[str, Any]
+    ) -> None:
+        self._spans.append(
+            SpanRecord(
+                name=name,
+                start_ms=(start - self._start) * 1000,
+                duration_ms=(end - start) * 1000,
+                attributes=attributes,
+            )
+        )
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def capture(self, key: str, payload: Any) -> None:
+        """
+        Keeps a reference to `payload` if this trace was sampled for payload
+        capture. Nothing is copied or serialized here; sinks do that.
+        """
+        if self.capture_payloads:
+            self._payloads[key] = payload
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        self._sink.emit(
+            TraceRecord(
+                trace_id=self.trace_id,
+                name=self.name,
+                start_time=self._start_time,
+                duration_ms=(time.perf_counter() - self._start) * 1000,
+                attributes=self.attributes,
+                spans=self._spans,
+                payloads=self._payloads,
+                error=repr(error) if error is not None else None,
+            )
+        )
+
+    def __enter__(self) -> "Trace":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        # A consumer abandoning a stream raises GeneratorExit; that is not an error.
+        self.end(exc if isinstance(exc, Exception) else None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _NoopTrace:
+    """Stands in for a Trace when tracing is off; every method does nothing."""
+
+    __slots__ = ()
+    enabled = False
+    capture_payloads = False
+
+    def span(self, name: str, **attributes: Any) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def add_span(self, name: str, start: float, duration: float, **attributes: Any) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def capture(self, key: str, payload: Any) -> None:
+        pass
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopTrace":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+NOOP_TRACE = _NoopTrace()
+
+
+class Tracer:
+    """
+    Creates traces and delivers them to a sink.
+
+    Without a sink the tracer is off and `start_trace` returns a shared no-op
+    trace, so instrumented code pays for little more than a method call.
+    Payload capture is opt-in and sampled per trace.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[BaseTraceSink] = None,
+        capture_payloads: bool = False,
+        payload_sample_rate: float = 1.0,
+    ):
+        if not 0.0 <= payload_sample_rate <= 1.0:
+            raise ValueError("payload_sample_rate must be between 0.0 and 1.0")
+        self.sink = sink
+        self.capture_payloads = capture_payloads
+        self.payload_sample_rate = payload_sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def start_trace(self, name: str, **attributes: Any) -> Trace | _NoopTrace:
+        if self.sink is None:
+            return NOOP_TRACE
+        capture = self.capture_payloads and (
+            self.payload_sample_rate >= 1.0
+            or random.random() < self.payload_sample_rate
+        )
+        return Trace(self.sink, name, attributes, capture)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer. It is off until a sink is configured."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replaces the process-wide tracer."""
+    global _tracer
+    _tracer = tracer
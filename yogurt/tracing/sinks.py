@@ -0,0 +1,36 @@
+import logging
+from collections import deque
+from typing import Deque, List
+
+from yogurt.tracing.base import BaseTraceSink, TraceRecord
+
+
+class LoggingTraceSink(BaseTraceSink):
+    """
+    Writes each trace as one JSON log line. Records are only serialized when
+    the logger would actually emit them.
+    """
+
+    def __init__(self, logger_name: str = "yogurt.tracing", level: int = logging.DEBUG):
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+
+    def emit(self, record: TraceRecord) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, record.model_dump_json())
+
+
+class InMemoryTraceSink(BaseTraceSink):
+    """Keeps the most recent traces in memory, for tests and debugging."""
+
+    def __init__(self, maxlen: int = 1000):
+        self.records: Deque[TraceRecord] = deque(maxlen=maxlen)
+
+    def emit(self, record: TraceRecord) -> None:
+        self.records.append(record)
+
+    def clear(self) -> List[TraceRecord]:
+        """Removes and returns all stored traces."""
+        records = list(self.records)
+        self.records.clear()
+        return records
@@ -0,0 +1,340 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def _aenumerate(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[Tuple[int, T]]:
+    """Enumerates a sync or async iterable as an async iterator."""
+    index = 0
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for item in items:
+            yield index, item
+            index += 1
+
+
+async def bounded_as_completed(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    limit: int,
+    return_exceptions: bool = False,
+) -> AsyncIterator[Tuple[int, R | BaseException]]:
+    """
+    Applies `func` to every item with at most `limit` calls in flight and
+    yields `(index, result)` pairs as they complete.
+
+    Items are pulled from `items` lazily, only when a slot frees up, so an
+    arbitrarily large (or infinite) generator never has more than `limit`
+    items materialized at once. With `return_exceptions`, a failing item
+    yields its exception instead of aborting the whole run. Closing the
+    iterator early cancels everything still in flight.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = _aenumerate(items)
+    pending: Set[asyncio.Task] = set()
+    indices: dict[asyncio.Task, int] = {}
+    exhausted = False
+
+    async def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(pending) < limit:
+            try:
+                index, item = await anext(source)
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            task = asyncio.ensure_future(func(item))
+            pending.add(task)
+            indices[task] = index
+
+    try:
+        await fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                index = indices.pop(task)
+                error = (
+                    asyncio.CancelledError() if task.cancelled() else task.exception()
+                )
+                if error is not None:
+                    if not return_exceptions:
+                        raise error
+                    yield index, error
+                else:
+                    yield index, task.result()
+            await fill()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
+
+
+async def bounded_in_order(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    limit: int,
+    return_exceptions: bool = False,
+) -> AsyncIterator[Tuple[int, R | BaseException]]:
+    """
+    Like `bounded_as_completed`, but yields results in input order.
+
+    At most `limit` items are in flight or finished-but-not-yet-yielded, so
+    memory stays bounded; the price is that a slow item holds back the ones
+    after it.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = _aenumerate(items)
+    queue: Deque[Tuple[int, asyncio.Task]] = deque()
+    exhausted = False
+
+    async def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(queue) < limit:
+            try:
+                index, item = await anext(source)
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            queue.append((index, asyncio.ensure_future(func(item))))
+
+    try:
+        await fill()
+        while queue:
+            index, task = queue[0]
+            await asyncio.wait([task])
+            queue.popleft()
+            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            if error is not None:
+                if not return_exceptions:
+                    raise error
+                yield index, error
+            else:
+                yield index, task.result()
+            await fill()
+    finally:
+        for _, task in queue:
+            task.cancel()
+        if queue:
+            await asyncio.gather(*(task for _, task in queue), return_exceptions=True)
+        await source.aclose()
+
+
+def bounded_map_threaded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    limit: int,
+    return_exceptions: bool = False,
+    ordered: bool = False,
+) -> Iterator[Tuple[int, R | BaseException]]:
+    """
+    Runs `func` over `items` on a pool of `limit` threads and yields
+    `(index, result)` pairs, as they complete or, with `ordered`, in input
+    order. Items are pulled lazily; at most `limit` are submitted and not
+    yet yielded at any time.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = enumerate(items)
+    queue: Deque[Tuple[int, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+
+        def fill() -> None:
+            while len(queue) < limit:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    return
+                queue.append((index, executor.submit(func, item)))
+
+        try:
+            fill()
+            while queue:
+                if ordered:
+                    index, future = queue.popleft()
+                    wait([future])
+                else:
+                    done, _ = wait([f for _, f in queue], return_when=FIRST_COMPLETED)
+                    position = next(i for i, (_, f) in enumerate(queue) if f in done)
+                    index, future = queue[position]
+                    del queue[position]
+                error = future.exception()
+                if error is not None:
+                    if not return_exceptions:
+                        raise error
+                    yield index, error
+                else:
+                    yield index, future.result()
+                fill()
+        finally:
+            for _, future in queue:
+                future.cancel()
+
+
+async def bounded_gather(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    limit: int,
+    return_exceptions: bool = False,
+) -> list[R | BaseException]:
+    """Like `bounded_as_completed`, but collects the results in input order."""
+    results: dict[int, Any] = {}
+    async for index, result in bounded_as_completed(
+        func, items, limit, return_exceptions=return_exceptions
+    ):
+        results[index] = result
+    return [results[i] for i in range(len(results))]
+
+
+class _Flight:
+    """One in-flight upstream call and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class _Broadcast:
+    """
+    One in-flight upstream stream. Every item is buffered so subscribers that
+    join late still replay the stream from the start.
+    """
+
+    def __init__(self):
+        self.items: list[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self) -> None:
+        await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key into a single upstream
+    execution.
+
+    The first caller for a key starts the work in a separate task and later
+    callers with the same key attach to it; all of them receive the same
+    result (or exception). The upstream work is only cancelled once every
+    caller waiting on it has been cancelled. A key is forgotten as soon as
+    its call finishes, so this never serves stale results.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._broadcasts: Dict[str, _Broadcast] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights or key in self._broadcasts
+
+    @staticmethod
+    def _joinable(task: Optional[asyncio.Task]) -> bool:
+        return task is not None and not task.done() and not task.cancelling()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[R]]) -> R:
+        """Runs `fn()` unless a call for `key` is already in flight, then awaits it."""
+        flight = self._flights.get(key)
+        if flight is None or not self._joinable(flight.task):
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(self._flights, key, flight))
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forget it now, so a caller arriving before the task finishes
+                # cancelling starts a fresh call instead of inheriting the cancel.
+                self._forget(self._flights, key, flight)
+                flight.task.cancel()
+
+    async def stream(
+        self, key: str, fn: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """
+        Iterates `fn()` unless a stream for `key` is already in flight, and
+        fans the same items out to every subscriber.
+        """
+        broadcast = self._broadcasts.get(key)
+        if broadcast is None or broadcast.done or not self._joinable(broadcast.task):
+            broadcast = _Broadcast()
+            self._broadcasts[key] = broadcast
+            broadcast.task = asyncio.ensure_future(self._pump(key, broadcast, fn))
+        broadcast.waiters += 1
+        try:
+            index = 0
+            while True:
+                while index < len(broadcast.items):
+                    yield broadcast.items[index]
+                    index += 1
+                if broadcast.done:
+                    if broadcast.error is not None:
+                        raise broadcast.error
+                    return
+                await broadcast.wait()
+        finally:
+            broadcast.waiters -= 1
+            if broadcast.waiters == 0 and not broadcast.done:
+                self._forget(self._broadcasts, key, broadcast)
+                broadcast.task.cancel()
+
+    async def _pump(
+        self, key: str, broadcast: _Broadcast, fn: Callable[[], AsyncIterator[T]]
+    ) -> None:
+        try:
+            async for item in fn():
+                broadcast.items.append(item)
+                broadcast.publish()
+        except BaseException as e:
+            broadcast.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            broadcast.done = True
+            self._forget(self._broadcasts, key, broadcast)
+            broadcast.publish()
+
+    @staticmethod
+    def _forget(registry: Dict[str, Any], key: str, entry: Any) -> None:
+        if registry.get(key) is entry:
+            del registry[key]
@@ -0,0 +1,33 @@
+import hashlib
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, bytes):
+        return obj.hex()
+    return repr(obj)
+
+
+def stable_hash(obj: Any) -> str:
+    """
+    Returns a deterministic SHA-256 hex digest of a JSON-like object.
+
+    Dict keys are sorted and separators fixed, so two payloads that are equal
+    as data always hash the same regardless of insertion order. Pydantic
+    models are hashed by their dumped fields.
+    """
+    encoded = json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_default,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -1,88 +1,40 @@
 import json
-import re
 from typing import Any, Callable
 
-
-def _replace_newline(match: re.Match[str]) -> str:
-    """Replaces unescaped newlines, tabs, and quotes in a string."""
-    value = match.group(2)
-    value = re.sub(r"\n", r"\\n", value)
-    value = re.sub(r"\r", r"\\r", value)
-    value = re.sub(r"\t", r"\\t", value)
-    value = re.sub(r'(?<!\\)"', r'\\"', value)
-    return match.group(1) + value + match.group(3)
-
-
-def _custom_parser(multiline_string: str) -> str:
-    """
-    Applies the custom newline and quote replacement to the action_input
-    field within a JSON string.
-    """
-    if isinstance(multiline_string, (bytes, bytearray)):
-        multiline_string = multiline_string.decode()
-
-    return re.sub(
-        r'("action_input"\:\s*")(.*?)(")',
-        _replace_newline,
-        multiline_string,
-        flags=re.DOTALL,
-    )
+from yogurt.utils.json_stream import JsonStreamReader
 
 
 def parse_partial_json(s: str, *, strict: bool = False) -> Any:
     """
-    Parses a JSON string that may be missing closing braces by attempting
-    to fix it.
+    Parses a JSON string that may be truncated or slightly malformed.
+
+    Valid JSON goes straight to `json.loads`. Anything else is read once by
+    a tolerant reader that closes open strings, arrays and objects, accepts
+    raw newlines and trailing commas, keeps unescaped quotes that do not end
+    a string, and skips text around the outermost object or array. Returns
+    None if no object or array is found. `strict` applies to the
+    `json.loads` attempt only.
     """
     try:
         return json.loads(s, strict=strict)
     except json.JSONDecodeError:
         pass
 
-    new_chars = []
-    stack = []
-    is_inside_string = False
-    escaped = False
-
-    for char in s:
-        new_char = char
-        if is_inside_string:
-            if char == '"' and not escaped:
-                is_inside_string = False
-            elif char == "\\n" and not escaped:
-                new_char = "\\\\n"
-            elif char == "\\":
-                escaped = not escaped
-            else:
-                escaped = False
-        elif char == '"':
-            is_inside_string = True
-            escaped = False
-        elif char == "{":
-            stack.append("}")
-        elif char == "[":
-            stack.append("]")
-        elif char in {"}", "]"}:
-            if stack and stack[-1] == char:
-                stack.pop()
-            else:
-                return None
-        new_chars.append(new_char)
+    reader = JsonStreamReader(repair_quotes=True)
+    reader.feed(s)
+    return reader.finish()
 
-    if is_inside_string:
-        if escaped:
-            new_chars.pop()
-        new_chars.append('"')
 
-    stack.reverse()
-    # Attempt to parse by progressively removing characters from the end
-    while new_chars:
-        try:
-            return json.loads("".join(new_chars + stack), strict=strict)
-        except json.JSONDecodeError:
-            new_chars.pop()
-
-    return None  # Return None if parsing fails completely
+def _extract_fenced(text: str) -> str:
+    """Returns the body of the first ``` fence, or `text` if there is none."""
+    start = text.find("```")
+    if start == -1:
+        return text
+    body = text.find("\n", start)
+    if body == -1:
+        return text[start + 3 :]
+    end = text.find("```", body)
+    return text[body + 1 : end if end != -1 else len(text)]
 
 
 def parse_json_markdown(
@@ -92,18 +44,11 @@ def parse_json_markdown(
     Parses a JSON string from a Markdown string, cleaning it up and
     handling partial JSON.
     """
-    # Find JSON string within triple backticks
-    match = re.search(r"```(json)?\s*\n(.*?)\n```", json_string, re.DOTALL)
-    if match:
-        json_str = match.group(2)
-    else:
-        json_str = json_string
+    # Find JSON string within triple backticks; an unclosed fence runs to the end.
+    json_str = _extract_fenced(json_string)
 
     # Strip whitespace, newlines, and backticks
     json_str = json_str.strip(" \n\r\t`")
 
-    # Handle special characters inside the value
-    json_str = _custom_parser(json_str)
-
     # Parse the cleaned string
     return parser(json_str)
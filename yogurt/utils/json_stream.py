@@ -0,0 +1,381 @@
+import json
+import re
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+PathItem = Union[str, int]
+Path = Tuple[PathItem, ...]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_RUN = re.compile(r'[^"\\]+')
+_LITERAL_RUN = re.compile(r"[^ \t\n\r,\]}:]+")
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_LITERALS = {"true": True, "false": False, "null": None}
+
+# Parser modes.
+_START = 0
+_VALUE = 1
+_KEY = 2
+_COLON = 3
+_AFTER_VALUE = 4
+_STRING = 5
+_LITERAL = 6
+_DONE = 7
+
+
+class JsonStreamEvent(NamedTuple):
+    """
+    Something the reader found. `kind` is "delta" for a piece of a string
+    that is still arriving, or "value" for a value that has just completed.
+    """
+
+    kind: str
+    path: Path
+    value: Any
+
+
+def _matches(path: Path, patterns: Sequence[Path]) -> bool:
+    for pattern in patterns:
+        if len(pattern) == len(path) and all(
+            p == "*" or p == c for p, c in zip(pattern, path)
+        ):
+            return True
+    return False
+
+
+class JsonStreamReader:
+    """
+    An incremental JSON reader for text that arrives in chunks.
+
+    Tokenizer and container state persist between `feed` calls, so every
+    character is examined once no matter how the text is split. The value is
+    built as it is read: `value` is always the best-effort result so far,
+    and `finish()` closes whatever is still open.
+
+    `watch` and `deltas` select what `feed` reports, as paths of keys and
+    list indices where "*" matches anything. A value at a `watch` path is
+    reported when it completes; a string at a `deltas` path is reported
+    piece by piece as it arrives. For example, `watch=[("items", "*")]`
+    reports each element of the top-level "items" list.
+
+    Text before the first `{` or `[` and after the top-level value closes is
+    ignored, so markdown fences and surrounding prose are skipped. Raw
+    newlines inside strings are accepted. With `repair_quotes`, an unescaped
+    quote inside a string value is kept as text unless it is followed by
+    `,`, `}`, `]`, `:` or the end of the input.
+    """
+
+    def __init__(
+        self,
+        watch: Iterable[Sequence[PathItem]] = (),
+        deltas: Iterable[Sequence[PathItem]] = (),
+        repair_quotes: bool = False,
+    ):
+        self._watch = [tuple(p) for p in watch]
+        self._deltas = [tuple(p) for p in deltas]
+        self._depths = {len(p) for p in self._watch + self._deltas}
+        self._mode = _START
+        self._root: Any = None
+        self._containers: List[Any] = []
+        self._path: List[PathItem] = []
+        """Path of each open container below the root."""
+        self._keys: List[Optional[str]] = []
+        """Pending key of each open container (None for lists)."""
+        self._string: List[str] = []
+        self._string_is_key = False
+        self._string_path: Optional[Path] = None
+        self._escape = ""
+        self._high_surrogate: Optional[int] = None
+        """A `\\uD800`-`\\uDBFF` escape waiting for the low half of its pair."""
+        self._repair_quotes = repair_quotes
+        self._quote: Optional[str] = None
+        """Whitespace after a quote whose meaning is not known yet."""
+        self._literal: List[str] = []
+        self._events: List[JsonStreamEvent] = []
+
+    @property
+    def value(self) -> Any:
+        """The value read so far. Open strings and literals are not included yet."""
+        return self._root
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value has been closed."""
+        return self._mode == _DONE
+
+    # --- Path helpers ---
+    def _slot(self) -> Optional[PathItem]:
+        """The key or index the next value will occupy in the open container."""
+        container = self._containers[-1]
+        if isinstance(container, list):
+            return len(container)
+        return self._keys[-1]
+
+    def _slot_path(self) -> Optional[Path]:
+        """Path of the next value, or None when no pattern has that depth."""
+        if len(self._path) + 1 not in self._depths:
+            return None
+        return (*self._path, self._slot())
+
+    # --- Building ---
+    def _attach(self, value: Any) -> None:
+        if not self._containers:
+            self._root = value
+            return
+        container = self._containers[-1]
+        if isinstance(container, list):
+            container.append(value)
+        elif self._keys[-1] is not None:
+            container[self._keys[-1]] = value
+            self._keys[-1] = None
+
+    def _complete(self, value: Any, path: Optional[Path]) -> None:
+        self._attach(value)
+        if path is not None and _matches(path, self._watch):
+            self._events.append(JsonStreamEvent("value", path, value))
+        self._mode = _AFTER_VALUE if self._containers else _DONE
+
+    def _open(self, container: Any) -> None:
+        slot = self._slot() if self._containers else None
+        self._attach(container)
+        if self._containers:
+            self._path.append(slot)
+        self._containers.append(container)
+        self._keys.append(None)
+        self._mode = _KEY if isinstance(container, dict) else _VALUE
+
+    def _close(self) -> None:
+        container = self._containers.pop()
+        self._keys.pop()
+        if self._containers:
+            path = tuple(self._path)
+            self._path.pop()
+            if len(path) in self._depths and _matches(path, self._watch):
+                self._events.append(JsonStreamEvent("value", path, container))
+            self._mode = _AFTER_VALUE
+        else:
+            self._mode = _DONE
+
+    def _start_string(self, is_key: bool) -> None:
+        self._mode = _STRING
+        self._string = []
+        self._string_is_key = is_key
+        self._high_surrogate = None
+        path = None if is_key else self._slot_path()
+        self._string_path = path if path is not None and _matches(path, self._deltas) else None
+
+    def _string_piece(self, piece: str) -> None:
+        if self._high_surrogate is not None:
+            # The high surrogate was not followed by a low one.
+            self._high_surrogate = None
+            piece = "\ufffd" + piece
+        self._string.append(piece)
+        if self._string_path is not None:
+            self._events.append(JsonStreamEvent("delta", self._string_path, piece))
+
+    def _end_string(self) -> None:
+        if self._high_surrogate is not None:
+            self._string_piece("")
+        text = "".join(self._string)
+        self._string = []
+        if self._string_is_key:
+            self._keys[-1] = text
+            self._mode = _COLON
+        else:
+            self._complete(text, self._string_path or self._slot_path())
+
+    def _end_literal(self) -> None:
+        token = "".join(self._literal)
+        self._literal = []
+        path = self._slot_path()
+        if token in _LITERALS:
+            self._complete(_LITERALS[token], path)
+            return
+        try:
+            value = json.loads(token)
+        except ValueError:
+            # Not JSON; keep the bare word rather than lose it.
+            value = token
+        self._complete(value, path)
+
+    # --- Reading ---
+    def _read_escape(self, text: str, i: int, n: int) -> int:
+        """Consumes an escape sequence, which may be split across chunks."""
+        if len(self._escape) == 1 and i < n:
+            self._escape += text[i]
+            i += 1
+        if self._escape[1:2] == "u" and len(self._escape) < 6:
+            take = min(6 - len(self._escape), n - i)
+            self._escape += text[i : i + take]
+            i += take
+        if len(self._escape) < 2 or (self._escape[1] == "u" and len(self._escape) < 6):
+            return i
+        escape, self._escape = self._escape, ""
+        if escape[1] != "u":
+            self._string_piece(_ESCAPES.get(escape[1], escape[1]))
+            return i
+        try:
+            code = int(escape[2:], 16)
+        except ValueError:
+            self._string_piece(escape)
+            return i
+        if 0xD800 <= code <= 0xDBFF:
+            # Held back so deltas never carry half of a surrogate pair.
+            if self._high_surrogate is not None:
+                self._string_piece("")
+            self._high_surrogate = code
+        elif 0xDC00 <= code <= 0xDFFF:
+            high, self._high_surrogate = self._high_surrogate, None
+            if high is None:
+                self._string_piece("\ufffd")
+            else:
+                self._string_piece(chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)))
+        else:
+            self._string_piece(chr(code))
+        return i
+
+    def _resolve_quote(self, text: str, i: int, n: int) -> int:
+        """
+        Decides whether a quote inside a string closes it: only if the next
+        non-whitespace character could follow a value. Until that character
+        arrives, the quote and the whitespace after it are held back.
+        """
+        j = _WHITESPACE.match(text, i).end()
+        self._quote += text[i:j]
+        if j >= n:
+            return j
+        if text[j] in ",}]:":
+            self._quote = None
+            self._end_string()
+        else:
+            self._string_piece('"' + self._quote)
+            self._quote = None
+        return j
+
+    def feed(self, text: str) -> List[JsonStreamEvent]:
+        """Reads the next chunk and returns the events it produced."""
+        i, n = 0, len(text)
+        while i < n:
+            mode = self._mode
+            if mode == _STRING:
+                if self._quote is not None:
+                    i = self._resolve_quote(text, i, n)
+                    continue
+                if self._escape:
+                    i = self._read_escape(text, i, n)
+                    continue
+                match = _STRING_RUN.match(text, i)
+                if match:
+                    self._string_piece(match.group())
+                    i = match.end()
+                    continue
+                if text[i] == '"':
+                    i += 1
+                    if self._repair_quotes and not self._string_is_key:
+                        self._quote = ""
+                        i = self._resolve_quote(text, i, n)
+                    else:
+                        self._end_string()
+                else:
+                    self._escape = "\\"
+                    i = self._read_escape(text, i + 1, n)
+                continue
+
+            if mode == _LITERAL:
+                match = _LITERAL_RUN.match(text, i)
+                if match:
+                    self._literal.append(match.group())
+                    i = match.end()
+                if i < n:
+                    self._end_literal()
+                continue
+
+            if mode == _DONE:
+                break
+
+            i = _WHITESPACE.match(text, i).end()
+            if i >= n:
+                break
+            char = text[i]
+
+            if mode == _START:
+                if char == "{":
+                    self._open({})
+                elif char == "[":
+                    self._open([])
+                i += 1
+            elif mode == _VALUE:
+                if char == '"':
+                    self._start_string(is_key=False)
+                elif char == "{":
+                    self._open({})
+                elif char == "[":
+                    self._open([])
+                elif char in "]}":
+                    # Empty list or a trailing comma.
+                    self._close()
+                elif char in ",:":
+                    pass
+                else:
+                    self._mode = _LITERAL
+                    continue
+                i += 1
+            elif mode == _KEY:
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char in "}]":
+                    self._close()
+                i += 1
+            elif mode == _COLON:
+                if char == ":":
+                    self._mode = _VALUE
+                elif char in "}]":
+                    self._close()
+                i += 1
+            elif mode == _AFTER_VALUE:
+                if char == ",":
+                    container = self._containers[-1]
+                    self._mode = _KEY if isinstance(container, dict) else _VALUE
+                elif char in "}]":
+                    self._close()
+                i += 1
+
+        events, self._events = self._events, []
+        return events
+
+    def finish(self) -> Any:
+        """
+        Ends the input and returns the best-effort value: an open string or
+        literal is kept and every open container is closed.
+        """
+        if self._mode == _STRING and not self._string_is_key:
+            self._string_path = None
+            self._quote = None
+            self._end_string()
+        elif self._mode == _LITERAL:
+            token = "".join(self._literal)
+            self._literal = []
+            if token in _LITERALS or _is_number(token):
+                self._attach(_LITERALS[token] if token in _LITERALS else json.loads(token))
+        self._containers.clear()
+        self._path.clear()
+        self._keys.clear()
+        self._events = []
+        self._mode = _DONE
+        return self._root
+
+
+def _is_number(token: str) -> bool:
+    try:
+        json.loads(token)
+    except ValueError:
+        return False
+    return True
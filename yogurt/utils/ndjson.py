@@ -0,0 +1,78 @@
+import json
+from typing import Any, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class NDJSONDecoder:
+    """
+    Incrementally splits a newline-delimited JSON byte stream into values.
+
+    Works on raw bytes, never decoding lines to text first. Only a trailing
+    partial line is kept between calls to `feed`. With orjson installed each
+    complete line is parsed in place through a memoryview slice, without
+    copying. With the standard library, all complete lines of a read are
+    parsed in a single `json.loads` call as one JSON array, which avoids
+    paying the per-call overhead for every token.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self):
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Returns every value completed by `data`, in order."""
+        end = data.rfind(b"\n")
+        if end == -1:
+            self._pending += data
+            return []
+        if self._pending:
+            self._pending += data[: end + 1]
+            complete = bytes(self._pending)
+            self._pending.clear()
+        else:
+            complete = data if end == len(data) - 1 else data[: end + 1]
+        if end < len(data) - 1:
+            self._pending += data[end + 1 :]
+        return _decode_lines(complete)
+
+    def flush(self) -> List[Any]:
+        """Decodes whatever is left once the stream ends without a newline."""
+        if not self._pending:
+            return []
+        data = bytes(self._pending) + b"\n"
+        self._pending.clear()
+        return _decode_lines(data)
+
+
+def _decode_lines_per_line(data: bytes) -> List[Any]:
+    """Parses each newline-terminated line of `data`, skipping blank lines."""
+    values = []
+    view = memoryview(data) if orjson is not None else data
+    loads = orjson.loads if orjson is not None else json.loads
+    start = 0
+    while True:
+        end = data.find(b"\n", start)
+        if end == -1:
+            break
+        # Skip blank lines, including the bare "\r" of a CRLF blank line.
+        if end - start > 1 or (end > start and data[start] not in b" \t\r"):
+            values.append(loads(view[start:end]))
+        start = end + 1
+    return values
+
+
+def _decode_lines_bulk(data: bytes) -> List[Any]:
+    """Parses newline-terminated lines as one JSON array with the stdlib decoder."""
+    try:
+        return json.loads(b"[" + data[:-1].replace(b"\n", b",") + b"]")
+    except json.JSONDecodeError:
+        # Blank lines leave empty array elements; take the slow path.
+        return _decode_lines_per_line(data)
+
+
+_decode_lines = _decode_lines_per_line if orjson is not None else _decode_lines_bulk
@@ -0,0 +1,7 @@
+def estimate_tokens(text: str) -> int:
+    """
+    A cheap token estimate for budgeting: about four characters per token,
+    which is close for English text with common BPE tokenizers. Never below
+    one, so empty messages still count against a budget.
+    """
+    return max(1, (len(text) + 3) // 4)
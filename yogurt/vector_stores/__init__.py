@@ -1,5 +1,13 @@
-from .base import BaseVectorStore
+from .base import BaseVectorStore, EmbeddingVectorStore
+from .ivf_store import IVFVectorStore
+from .metadata_index import Filters, MetadataIndex
+from .numpy_store import NumpyVectorStore
 
 __all__ = [
     "BaseVectorStore",
+    "EmbeddingVectorStore",
+    "Filters",
+    "IVFVectorStore",
+    "MetadataIndex",
+    "NumpyVectorStore",
 ]
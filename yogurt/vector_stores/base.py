@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Sequence
 
-from yogurt.documents.base import DocumentList
+from yogurt.documents.base import Document, DocumentList
+from yogurt.embeddings.base import BaseEmbedder
+from yogurt.retrieval.base import RetrieverQuery, SearchResult
+from yogurt.vector_stores.metadata_index import Filters
 
 
 class BaseVectorStore(ABC):
@@ -13,3 +17,91 @@ class BaseVectorStore(ABC):
     @abstractmethod
     def similarity_search(self, query: str, k: int = 4) -> DocumentList | None:
         pass
+
+
+class EmbeddingVectorStore(BaseVectorStore):
+    """
+    A vector store that embeds text with `embedder` and searches by vector.
+
+    Subclasses implement `add_embeddings` and `batch_search_by_vector`; the
+    text-level and async methods are built on those. Every search accepts
+    `filters` on document metadata (see `MetadataIndex`), applied before
+    ranking so that `k` results are returned whenever enough documents match.
+    """
+
+    embedder: Optional[BaseEmbedder] = None
+
+    @abstractmethod
+    def add_embeddings(self, documents: Sequence[Document], embeddings: Any) -> None:
+        """Adds documents with precomputed embeddings, one row per document."""
+        pass
+
+    @abstractmethod
+    def batch_search_by_vector(
+        self, embeddings: Any, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[List[SearchResult]]:
+        """Searches for several query embeddings at once."""
+        pass
+
+    def _require_embedder(self) -> BaseEmbedder:
+        if self.embedder is None:
+            raise ValueError(f"{type(self).__name__} needs an embedder to embed text")
+        return self.embedder
+
+    def search_by_vector(
+        self, embedding: Any, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[SearchResult]:
+        return self.batch_search_by_vector([embedding], k, filters)[0]
+
+    def add_documents(self, documents: DocumentList) -> None:
+        if not documents:
+            return
+        embeddings = self._require_embedder().embed_documents([d.content for d in documents])
+        self.add_embeddings(documents, embeddings)
+
+    async def aadd_documents(self, documents: DocumentList) -> None:
+        if not documents:
+            return
+        embedder = self._require_embedder()
+        embeddings = await embedder.aembed_documents([d.content for d in documents])
+        self.add_embeddings(documents, embeddings)
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[SearchResult]:
+        return self.search_by_vector(self._require_embedder().embed_query(query), k, filters)
+
+    def similarity_search(
+        self, query: str, k: int = 4, filters: Optional[Filters] = None
+    ) -> DocumentList | None:
+        return [result.document for result in self.similarity_search_with_score(query, k, filters)]
+
+    def batch_similarity_search(
+        self, queries: List[str], k: int = 4, filters: Optional[Filters] = None
+    ) -> List[List[SearchResult]]:
+        """Embeds and searches several queries at once."""
+        if not queries:
+            return []
+        embeddings = self._require_embedder().embed_documents(queries)
+        return self.batch_search_by_vector(embeddings, k, filters)
+
+    def retrieve(self, query: RetrieverQuery, k: int = 4) -> List[SearchResult]:
+        """Searches for `query.query_text`, restricted by `query.filters`."""
+        return self.similarity_search_with_score(query.query_text, k, query.filters)
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[SearchResult]:
+        embedding = await self._require_embedder().aembed_query(query)
+        return self.search_by_vector(embedding, k, filters)
+
+    async def abatch_similarity_search(
+        self, queries: List[str], k: int = 4, filters: Optional[Filters] = None
+    ) -> List[List[SearchResult]]:
+        if not queries:
+            return []
+        embeddings = await self._require_embedder().aembed_documents(queries)
+        return self.batch_search_by_vector(embeddings, k, filters)
+
+    async def aretrieve(self, query: RetrieverQuery, k: int = 4) -> List[SearchResult]:
+        return await self.asimilarity_search_with_score(query.query_text, k, query.filters)
@@ -0,0 +1,628 @@
+import json
+import mmap
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from yogurt.documents.base import Document
+from yogurt.embeddings.base import BaseEmbedder
+from yogurt.retrieval.base import SearchResult
+from yogurt.vector_stores.base import EmbeddingVectorStore
+from yogurt.vector_stores.metadata_index import Filters, MetadataIndex
+from yogurt.vector_stores.numpy_store import normalize_rows, top_k
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_FORMAT_VERSION = 1
+_ASSIGN_BLOCK = 1 << 24
+"""Upper bound on the rows-by-centroids score matrix computed at once (64 MB)."""
+_POINTER = "current.json"
+"""Names the version directory `load` opens, and the one saved before it."""
+_FILES = (
+    "vectors.npy",
+    "offsets.npy",
+    "centroids.npy",
+    "document_offsets.npy",
+    "documents.jsonl",
+    "ids.json",
+    "meta.json",
+)
+
+
+def spherical_kmeans(
+    vectors: "np.ndarray", nlist: int, iterations: int = 10, seed: int = 0
+) -> "np.ndarray":
+    """
+    Clusters unit vectors by cosine similarity and returns `nlist`
+    unit-length centroids. Empty clusters are re-seeded with random points.
+    """
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = assign_lists(vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=nlist)
+        filled = counts > 0
+        sums = np.empty_like(centroids)
+        sums[filled] = np.add.reduceat(
+            vectors[order], (np.cumsum(counts) - counts)[filled], axis=0
+        )
+        if not filled.all():
+            sums[~filled] = vectors[rng.choice(len(vectors), int((~filled).sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def assign_lists(vectors: "np.ndarray", centroids: "np.ndarray") -> "np.ndarray":
+    """The index of the closest centroid of each row, computed in blocks."""
+    block = max(1, _ASSIGN_BLOCK // max(1, len(centroids)))
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block):
+        scores = vectors[start : start + block] @ centroids.T
+        assignment[start : start + block] = np.argmax(scores, axis=1)
+    return assignment
+
+
+def _read_pointer(path: Path) -> Optional[Dict[str, Optional[str]]]:
+    """The version pointer of a saved index, or None for an unversioned one."""
+    try:
+        return json.loads((path / _POINTER).read_text())
+    except FileNotFoundError:
+        return None
+
+
+class _StoredDocuments:
+    """
+    Documents of a saved index, read on access from a memory-mapped JSON
+    lines file, so opening an index does not parse every document. Only the
+    ids are read up front.
+    """
+
+    def __init__(self, path: Path):
+        self._offsets = np.load(path / "document_offsets.npy", mmap_mode="r")
+        with open(path / "documents.jsonl", "rb") as f:
+            empty = os.fstat(f.fileno()).st_size == 0
+            self._map = b"" if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(path / "ids.json", "rb") as f:
+            self._ids: List[str] = json.load(f)
+
+    def ids(self) -> List[str]:
+        return self._ids
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> Document:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return Document.model_validate_json(self._map[start:end])
+
+    def __iter__(self) -> Iterator[Document]:
+        for row in range(len(self)):
+            yield self[row]
+
+
+class IVFVectorStore(EmbeddingVectorStore):
+    """
+    An approximate vector store using an inverted-file (IVF-Flat) index.
+
+    Vectors are clustered around `nlist` centroids with spherical k-means,
+    and each cluster's vectors are stored contiguously. A search scores the
+    query against the centroids, then exactly scores only the vectors of the
+    `nprobe` closest clusters; raising `nprobe` trades speed for recall, and
+    `nprobe = nlist` is an exact search. Scores are cosine similarities.
+
+    Inserts go to a small unclustered buffer that every search scans
+    exhaustively; once it outgrows `merge_ratio` of the index (or the index
+    has not been trained yet and has `min_train_size` vectors) it is merged
+    in. Deletes and replacements mark rows as dead until the next merge.
+
+    `save` writes plain `.npy` files and `load` memory-maps them, so an index
+    of any size opens in milliseconds and workers on one machine share its
+    pages through the OS page cache. Documents are read lazily from disk.
+    Each save goes to a new version directory that is published atomically,
+    so a concurrent `load` never mixes files of two saves.
+
+    Searches accept metadata `filters`. A selective filter is answered
+    exactly by scoring only the matching rows; a broad one restricts the
+    probed lists, and a query whose lists hold fewer than `k` matches falls
+    back to scoring every match.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[BaseEmbedder] = None,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_size: int = 10_000,
+        train_sample: int = 64,
+        kmeans_iterations: int = 10,
+        merge_ratio: float = 0.1,
+        seed: int = 0,
+        metadata_fields: Optional[List[str]] = None,
+    ):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for IVFVectorStore. Install with `pip install numpy`."
+            )
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        self.embedder = embedder
+        self.nlist = nlist
+        """Number of clusters; defaults to about sqrt(n) when trained."""
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.train_sample = train_sample
+        """Vectors per cluster sampled to train k-means."""
+        self.kmeans_iterations = kmeans_iterations
+        self.merge_ratio = merge_ratio
+        self.seed = seed
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._centroids: Optional["np.ndarray"] = None
+        # Clustered rows, grouped by list: rows offsets[l]:offsets[l + 1].
+        self._main = np.empty((0, 0), dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._main_docs: Sequence[Document] = []
+        # Unclustered buffer; its row r is global row len(main) + r.
+        self._buffer = np.empty((0, 0), dtype=np.float32)
+        self._buffer_size = 0
+        self._buffer_docs: List[Document] = []
+        # Tombstones over main rows followed by the buffer's capacity.
+        self._dead = np.zeros(0, dtype=bool)
+        self._live = 0
+        self._rows: Optional[Dict[str, int]] = None
+        """Row of each live document id; built on first use after a load."""
+        self.metadata_fields = metadata_fields
+        self._metadata: Optional[MetadataIndex] = None
+        """Built on the first filtered search, and again after a merge renumbers rows."""
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def _row_map(self) -> Dict[str, int]:
+        if self._rows is None:
+            self._rows = {}
+            main_docs = self._main_docs
+            ids = (
+                main_docs.ids()
+                if isinstance(main_docs, _StoredDocuments)
+                else [d.id for d in main_docs]
+            )
+            for row, doc_id in enumerate(ids):
+                if not self._dead[row]:
+                    self._rows[doc_id] = row
+            base = len(main_docs)
+            for row, document in enumerate(self._buffer_docs):
+                if not self._dead[base + row]:
+                    self._rows[document.id] = base + row
+        return self._rows
+
+    def _metadata_index(self) -> MetadataIndex:
+        if self._metadata is None:
+            self._metadata = MetadataIndex(self.metadata_fields)
+            for row in range(len(self._main_docs) + self._buffer_size):
+                if not self._dead[row]:
+                    self._metadata.add(row, self._document(row).metadata)
+        return self._metadata
+
+    def _document(self, row: int) -> Document:
+        base = len(self._main_docs)
+        return self._main_docs[row] if row < base else self._buffer_docs[row - base]
+
+    # --- Writing ---
+    def _reserve(self, extra: int) -> None:
+        needed = self._buffer_size + extra
+        if needed > len(self._buffer):
+            capacity = max(needed, 2 * len(self._buffer), 1024)
+            grown = np.empty((capacity, self._dim), dtype=np.float32)
+            if self._buffer_size:
+                grown[: self._buffer_size] = self._buffer[: self._buffer_size]
+            self._buffer = grown
+            dead = np.zeros(len(self._main_docs) + capacity, dtype=bool)
+            dead[: len(self._dead)] = self._dead
+            self._dead = dead
+
+    def add_embeddings(self, documents: Sequence[Document], embeddings: Any) -> None:
+        matrix = normalize_rows(embeddings)
+        if len(matrix) != len(documents):
+            raise ValueError(
+                f"Got {len(documents)} documents but {len(matrix)} embeddings"
+            )
+        with self._lock:
+            if self._dim is None:
+                self._dim = matrix.shape[1]
+            elif matrix.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match the store's {self._dim}"
+                )
+            rows = self._row_map()
+            self._reserve(len(documents))
+            base = len(self._main_docs) + self._buffer_size
+            for i, document in enumerate(documents):
+                old = rows.get(document.id)
+                if old is not None:
+                    self._dead[old] = True
+                    self._live -= 1
+                    if self._metadata is not None:
+                        self._metadata.remove(old)
+                rows[document.id] = base + i
+                if self._metadata is not None:
+                    self._metadata.add(base + i, document.metadata)
+            self._buffer[self._buffer_size : self._buffer_size + len(documents)] = matrix
+            self._buffer_size += len(documents)
+            self._buffer_docs.extend(documents)
+            self._live += len(documents)
+            self._maybe_merge()
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Marks documents as deleted. Returns how many were found."""
+        removed = 0
+        with self._lock:
+            rows = self._row_map()
+            for doc_id in ids:
+                row = rows.pop(doc_id, None)
+                if row is not None:
+                    self._dead[row] = True
+                    if self._metadata is not None:
+                        self._metadata.remove(row)
+                    removed += 1
+            self._live -= removed
+        return removed
+
+    def get(self, doc_id: str) -> Optional[Document]:
+        with self._lock:
+            row = self._row_map().get(doc_id)
+            return None if row is None else self._document(row)
+
+    # --- Index maintenance ---
+    def _maybe_merge(self) -> None:
+        if self._centroids is None:
+            if self._buffer_size >= self.min_train_size:
+                self.train()
+        elif self._buffer_size > max(1024, self.merge_ratio * len(self._main_docs)):
+            self.merge()
+
+    def _all_live(self) -> Tuple["np.ndarray", List[Document]]:
+        """Every live vector and its document, main rows first."""
+        main_count = len(self._main_docs)
+        vectors = np.concatenate(
+            [self._main[:main_count], self._buffer[: self._buffer_size]]
+        ) if main_count else self._buffer[: self._buffer_size]
+        documents = list(self._main_docs) + self._buffer_docs
+        alive = ~self._dead[: len(documents)]
+        return vectors[alive], [d for d, keep in zip(documents, alive) if keep]
+
+    def _pack(
+        self, vectors: "np.ndarray", documents: List[Document], assignment: "np.ndarray"
+    ) -> None:
+        """Stores vectors grouped by list and empties the buffer."""
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=len(self._centroids))
+        self._main = np.ascontiguousarray(vectors[order])
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._main_docs = [documents[i] for i in order.tolist()]
+        self._buffer = np.empty((0, self._dim), dtype=np.float32)
+        self._buffer_size = 0
+        self._buffer_docs = []
+        self._dead = np.zeros(len(self._main_docs), dtype=bool)
+        self._live = len(self._main_docs)
+        self._rows = None
+        self._metadata = None
+
+    def train(self, nlist: Optional[int] = None) -> None:
+        """
+        (Re)clusters every stored vector. Call after bulk loading, or when
+        the data has drifted far from the centroids it was trained on.
+        """
+        with self._lock:
+            vectors, documents = self._all_live()
+            if not len(vectors):
+                return
+            nlist = nlist or self.nlist or max(1, int(np.sqrt(len(vectors))))
+            rng = np.random.default_rng(self.seed)
+            sample_size = min(len(vectors), nlist * self.train_sample)
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+            self._centroids = spherical_kmeans(
+                sample, nlist, self.kmeans_iterations, self.seed
+            )
+            self._pack(vectors, documents, assign_lists(vectors, self._centroids))
+
+    def merge(self) -> None:
+        """Assigns buffered vectors to their lists and drops deleted rows."""
+        with self._lock:
+            if self._centroids is None:
+                self.train()
+                return
+            main_count = len(self._main_docs)
+            alive = ~self._dead[: main_count + self._buffer_size]
+            main_alive = alive[:main_count]
+            main_lists = np.repeat(
+                np.arange(len(self._centroids), dtype=np.int32), np.diff(self._offsets)
+            )
+            buffered = self._buffer[: self._buffer_size]
+            vectors = np.concatenate([self._main[main_alive], buffered[alive[main_count:]]])
+            assignment = np.concatenate(
+                [
+                    main_lists[main_alive],
+                    assign_lists(buffered[alive[main_count:]], self._centroids),
+                ]
+            )
+            documents = [d for d, keep in zip(self._main_docs, main_alive) if keep] + [
+                d for d, keep in zip(self._buffer_docs, alive[main_count:]) if keep
+            ]
+            self._pack(vectors, documents, assignment)
+
+    # --- Searching ---
+    def _candidates(
+        self, queries: "np.ndarray", nprobe: int, blocked: "np.ndarray"
+    ) -> Tuple[List[List["np.ndarray"]], List[List["np.ndarray"]]]:
+        """
+        Scores and global rows of every vector each query has to consider.
+        Rows flagged in `blocked` score -inf.
+        """
+        scores: List[List["np.ndarray"]] = [[] for _ in range(len(queries))]
+        rows: List[List["np.ndarray"]] = [[] for _ in range(len(queries))]
+        if self._centroids is not None and len(self._main_docs):
+            probes = top_k(queries @ self._centroids.T, nprobe)
+            # Group (query, list) pairs by list so each list is scored once.
+            flat_lists = probes.ravel()
+            flat_queries = np.repeat(np.arange(len(queries)), probes.shape[1])
+            order = np.argsort(flat_lists, kind="stable")
+            flat_lists, flat_queries = flat_lists[order], flat_queries[order]
+            splits = np.flatnonzero(np.diff(flat_lists)) + 1
+            for group_lists, group_queries in zip(
+                np.split(flat_lists, splits), np.split(flat_queries, splits)
+            ):
+                list_id = int(group_lists[0])
+                start, end = int(self._offsets[list_id]), int(self._offsets[list_id + 1])
+                if start == end:
+                    continue
+                block = queries[group_queries] @ self._main[start:end].T
+                dead = blocked[start:end]
+                if dead.any():
+                    block[:, dead] = -np.inf
+                list_rows = np.arange(start, end)
+                for query, query_scores in zip(group_queries.tolist(), block):
+                    scores[query].append(query_scores)
+                    rows[query].append(list_rows)
+        if self._buffer_size:
+            base = len(self._main_docs)
+            block = queries @ self._buffer[: self._buffer_size].T
+            dead = blocked[base : base + self._buffer_size]
+            if dead.any():
+                block[:, dead] = -np.inf
+            buffer_rows = np.arange(base, base + self._buffer_size)
+            for query in range(len(queries)):
+                scores[query].append(block[query])
+                rows[query].append(buffer_rows)
+        return scores, rows
+
+    def _results(self, rows: "np.ndarray", scores: "np.ndarray") -> List[SearchResult]:
+        return [
+            SearchResult(document=self._document(row), score=score)
+            for row, score in zip(rows.tolist(), scores.tolist())
+            if score != -np.inf
+        ]
+
+    def _exact(self, queries: "np.ndarray", rows: "np.ndarray", k: int) -> List[List[SearchResult]]:
+        """Scores `queries` against exactly the given global rows."""
+        base = len(self._main_docs)
+        parts = []
+        if base:
+            parts.append(self._main[rows[rows < base]])
+        if self._buffer_size:
+            parts.append(self._buffer[rows[rows >= base] - base])
+        vectors = np.concatenate(parts)
+        scores = queries @ vectors.T
+        indices = top_k(scores, k)
+        best = np.take_along_axis(scores, indices, axis=1)
+        return [self._results(rows[i], row_scores) for i, row_scores in zip(indices, best)]
+
+    def _search(
+        self,
+        queries: "np.ndarray",
+        k: int,
+        nprobe: int,
+        filters: Optional[Filters] = None,
+    ) -> List[List[SearchResult]]:
+        with self._lock:
+            if self._live == 0 or k <= 0:
+                return [[] for _ in range(len(queries))]
+            if queries.shape[1] != self._dim:
+                raise ValueError(
+                    f"Query dimension {queries.shape[1]} does not match the store's {self._dim}"
+                )
+            blocked = self._dead
+            if filters:
+                main_count = len(self._main_docs)
+                mask = self._metadata_index().match(filters, main_count + self._buffer_size)
+                count = int(np.count_nonzero(mask))
+                if count == 0:
+                    return [[] for _ in range(len(queries))]
+                probed = self._buffer_size + main_count
+                if self._centroids is not None:
+                    probed -= main_count * max(0, len(self._centroids) - nprobe) // len(self._centroids)
+                if count <= probed:
+                    # Fewer matches than probing would score: rank them all exactly.
+                    return self._exact(queries, np.flatnonzero(mask), k)
+                # Removed rows are not in the metadata index, so they are blocked too.
+                blocked = ~mask
+            all_scores, all_rows = self._candidates(queries, nprobe, blocked)
+            results = []
+            for scores, rows in zip(all_scores, all_rows):
+                if not scores:
+                    results.append([])
+                    continue
+                scores = np.concatenate(scores)
+                rows = np.concatenate(rows)
+                best = top_k(scores[None, :], k)[0]
+                results.append(self._results(rows[best], scores[best]))
+            if filters:
+                short = [i for i, found in enumerate(results) if len(found) < min(k, count)]
+                if short:
+                    # The probed lists held too few matches: rank them all exactly.
+                    exact = self._exact(queries[short], np.flatnonzero(mask), k)
+                    for i, found in zip(short, exact):
+                        results[i] = found
+            return results
+
+    def search_by_vector(
+        self,
+        embedding: Any,
+        k: int = 4,
+        filters: Optional[Filters] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[SearchResult]:
+        return self._search(normalize_rows(embedding), k, nprobe or self.nprobe, filters)[0]
+
+    def batch_search_by_vector(
+        self,
+        embeddings: Any,
+        k: int = 4,
+        filters: Optional[Filters] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Searches several queries, scoring each probed list once for all of
+        them. Filters matching fewer rows than the probed lists hold, and
+        queries whose probed lists hold fewer than `k` matches, are answered
+        by an exact search over just the matches.
+        """
+        return self._search(normalize_rows(embeddings), k, nprobe or self.nprobe, filters)
+
+    # --- Persistence ---
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Merges pending changes and writes the index to the directory `path`.
+
+        The files go to a new version directory inside `path`, which is then
+        published by atomically replacing the `current.json` pointer. The
+        previous version is kept, so processes that have it mapped keep
+        reading it; older versions are removed, and a `load` that was opening
+        one of them retries with the current version.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._centroids is None:
+                self.train()
+            else:
+                self.merge()
+            ids = [document.id for document in self._main_docs]
+            offsets = [0]
+            encoded = []
+            for document in self._main_docs:
+                line = document.model_dump_json().encode("utf-8") + b"\n"
+                encoded.append(line)
+                offsets.append(offsets[-1] + len(line))
+            arrays = {
+                "vectors.npy": self._main,
+                "offsets.npy": self._offsets,
+                "centroids.npy": (
+                    self._centroids
+                    if self._centroids is not None
+                    else np.empty((0, self._dim or 0), dtype=np.float32)
+                ),
+                "document_offsets.npy": np.asarray(offsets, dtype=np.int64),
+            }
+            meta = {
+                "version": _FORMAT_VERSION,
+                "dim": self._dim,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "count": len(self._main_docs),
+            }
+        version = path / f"v-{uuid.uuid4().hex}"
+        version.mkdir()
+        for name, array in arrays.items():
+            with open(version / name, "wb") as f:
+                np.save(f, array)
+        with open(version / "documents.jsonl", "wb") as f:
+            f.writelines(encoded)
+        (version / "ids.json").write_text(json.dumps(ids))
+        (version / "meta.json").write_text(json.dumps(meta))
+
+        previous = _read_pointer(path)
+        temp = path / f".{_POINTER}.{version.name}.tmp"
+        temp.write_text(
+            json.dumps(
+                {"current": version.name, "previous": previous and previous["current"]}
+            )
+        )
+        os.replace(temp, path / _POINTER)
+        if previous is None:
+            # An index saved before versioning keeps its files at the top.
+            for name in _FILES:
+                (path / name).unlink(missing_ok=True)
+        elif previous.get("previous"):
+            shutil.rmtree(path / previous["previous"], ignore_errors=True)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        embedder: Optional[BaseEmbedder] = None,
+        mmap_mode: Optional[str] = "r",
+        **kwargs: Any,
+    ) -> "IVFVectorStore":
+        """
+        Opens an index written by `save`. With the default `mmap_mode`,
+        vectors are memory-mapped rather than read; changes made afterwards
+        live in memory until the next `save`.
+        """
+        path = Path(path)
+        while True:
+            pointer = _read_pointer(path)
+            try:
+                return cls._open(
+                    path / pointer["current"] if pointer else path,
+                    embedder,
+                    mmap_mode,
+                    dict(kwargs),
+                )
+            except FileNotFoundError:
+                # Saves made while this one was opening removed its version;
+                # open the one they published instead.
+                if pointer is None or _read_pointer(path) == pointer:
+                    raise
+
+    @classmethod
+    def _open(
+        cls,
+        path: Path,
+        embedder: Optional[BaseEmbedder],
+        mmap_mode: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> "IVFVectorStore":
+        """Opens the index files in `path`."""
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version {meta.get('version')}")
+        kwargs.setdefault("nlist", meta.get("nlist"))
+        kwargs.setdefault("nprobe", meta.get("nprobe", 8))
+        store = cls(embedder=embedder, **kwargs)
+        store._dim = meta["dim"]
+        centroids = np.load(path / "centroids.npy")
+        store._centroids = centroids if len(centroids) else None
+        store._main = np.load(path / "vectors.npy", mmap_mode=mmap_mode)
+        store._offsets = np.load(path / "offsets.npy")
+        store._main_docs = _StoredDocuments(path)
+        store._buffer = np.empty((0, store._dim or 0), dtype=np.float32)
+        store._dead = np.zeros(meta["count"], dtype=bool)
+        store._live = meta["count"]
+        return store
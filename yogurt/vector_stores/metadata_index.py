@@ -0,0 +1,204 @@
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Filters = Mapping[str, Any]
+"""
+Conditions on metadata fields, all of which must hold. A plain value
+matches by equality (or membership, when the stored value is a list);
+a dict applies operators, e.g. `{"year": {"$gte": 2020, "$lt": 2024}}`.
+"""
+
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+_OPERATORS = _RANGE_OPERATORS | {"$eq", "$ne", "$in"}
+
+
+def _key(value: Any) -> Hashable:
+    # Keeps True from matching 1, which Python considers equal.
+    return (True, value) if isinstance(value, bool) else (False, value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Postings:
+    """The rows holding one field value, with a cached sorted row array."""
+
+    __slots__ = ("rows", "_array")
+
+    def __init__(self) -> None:
+        self.rows: Set[int] = set()
+        self._array: Optional["np.ndarray"] = None
+
+    def add(self, row: int) -> None:
+        self.rows.add(row)
+        self._array = None
+
+    def discard(self, row: int) -> None:
+        self.rows.discard(row)
+        self._array = None
+
+    def array(self) -> "np.ndarray":
+        if self._array is None:
+            self._array = np.fromiter(self.rows, dtype=np.intp, count=len(self.rows))
+        return self._array
+
+
+class MetadataIndex:
+    """
+    An inverted index over document metadata, addressed by row number.
+
+    Scalar values (and each element of list values) are indexed for
+    equality, `$in` and `$ne`; numeric values are also kept in a column per
+    field for `$gt`, `$gte`, `$lt` and `$lte`. `match` turns a filter into a
+    boolean mask over rows, which vector stores use to restrict a search to
+    the candidates. Only top-level fields are indexed, and unhashable values
+    such as nested dicts are skipped.
+    """
+
+    def __init__(self, fields: Optional[List[str]] = None):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for MetadataIndex. Install with `pip install numpy`."
+            )
+        self.fields = None if fields is None else set(fields)
+        """Fields to index; None indexes every field."""
+        self._postings: Dict[str, Dict[Hashable, _Postings]] = {}
+        self._columns: Dict[str, "np.ndarray"] = {}
+        self._metadata: Dict[int, Mapping[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def _values(self, metadata: Mapping[str, Any]) -> List[Tuple[str, Any]]:
+        pairs = []
+        for field, value in metadata.items():
+            if self.fields is not None and field not in self.fields:
+                continue
+            for item in value if isinstance(value, (list, tuple, set)) else (value,):
+                if isinstance(item, Hashable):
+                    pairs.append((field, item))
+        return pairs
+
+    def _set_number(self, field: str, row: int, value: float) -> None:
+        column = self._columns.get(field)
+        if column is None or row >= len(column):
+            grown = np.full(max(row + 1, 2 * (0 if column is None else len(column)), 1024), np.nan)
+            if column is not None:
+                grown[: len(column)] = column
+            self._columns[field] = column = grown
+        column[row] = value
+
+    def add(self, row: int, metadata: Mapping[str, Any]) -> None:
+        """Indexes `metadata` as the contents of `row`, replacing what was there."""
+        if row in self._metadata:
+            self.remove(row)
+        self._metadata[row] = metadata
+        for field, value in self._values(metadata):
+            self._postings.setdefault(field, {}).setdefault(_key(value), _Postings()).add(row)
+        for field, value in metadata.items():
+            if _is_number(value) and (self.fields is None or field in self.fields):
+                self._set_number(field, row, value)
+
+    def remove(self, row: int) -> None:
+        metadata = self._metadata.pop(row, None)
+        if metadata is None:
+            return
+        for field, value in self._values(metadata):
+            values = self._postings[field]
+            postings = values.get(_key(value))
+            if postings is not None:
+                postings.discard(row)
+                if not postings.rows:
+                    del values[_key(value)]
+        for field, column in self._columns.items():
+            if row < len(column):
+                column[row] = np.nan
+
+    def move(self, source: int, target: int) -> None:
+        """Re-indexes the contents of `source` under `target`."""
+        metadata = self._metadata.get(source)
+        self.remove(source)
+        if metadata is not None:
+            self.add(target, metadata)
+        else:
+            self.remove(target)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._columns.clear()
+        self._metadata.clear()
+
+    # --- Matching ---
+    def _equal(self, field: str, values: List[Any], size: int) -> "np.ndarray":
+        mask = np.zeros(size, dtype=bool)
+        postings = self._postings.get(field, {})
+        for value in values:
+            if not isinstance(value, Hashable):
+                raise ValueError(f"Cannot filter {field!r} on unhashable value {value!r}")
+            rows = postings.get(_key(value))
+            if rows is not None:
+                mask[rows.array()] = True
+        return mask
+
+    def _range(self, field: str, operator: str, bound: Any, size: int) -> "np.ndarray":
+        if not _is_number(bound):
+            raise ValueError(f"{operator} on {field!r} needs a number, got {bound!r}")
+        column = self._columns.get(field)
+        mask = np.zeros(size, dtype=bool)
+        if column is None:
+            return mask
+        values = column[: min(size, len(column))]
+        with np.errstate(invalid="ignore"):
+            if operator == "$gt":
+                mask[: len(values)] = values > bound
+            elif operator == "$gte":
+                mask[: len(values)] = values >= bound
+            elif operator == "$lt":
+                mask[: len(values)] = values < bound
+            else:
+                mask[: len(values)] = values <= bound
+        return mask
+
+    def _condition(self, field: str, condition: Any, size: int) -> "np.ndarray":
+        if not isinstance(condition, Mapping):
+            return self._equal(field, [condition], size)
+        mask = np.ones(size, dtype=bool)
+        for operator, operand in condition.items():
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator {operator!r} on {field!r}")
+            if operator == "$eq":
+                mask &= self._equal(field, [operand], size)
+            elif operator == "$ne":
+                mask &= ~self._equal(field, [operand], size)
+            elif operator == "$in":
+                if not isinstance(operand, (list, tuple, set)):
+                    raise ValueError(f"$in on {field!r} needs a list, got {operand!r}")
+                mask &= self._equal(field, list(operand), size)
+            else:
+                mask &= self._range(field, operator, operand, size)
+        return mask
+
+    def match(self, filters: Filters, size: int) -> "np.ndarray":
+        """
+        A boolean mask over rows `0..size-1` that satisfy every condition in
+        `filters`. Rows that were never added do not match, even for `$ne`.
+        """
+        if self.fields is not None:
+            unknown = set(filters) - self.fields
+            if unknown:
+                raise ValueError(f"Fields {sorted(unknown)} are not indexed")
+        mask: Optional["np.ndarray"] = None
+        for field, condition in filters.items():
+            condition_mask = self._condition(field, condition, size)
+            mask = condition_mask if mask is None else mask & condition_mask
+        if mask is None or (mask.any() and len(self._metadata) < size):
+            present = np.zeros(size, dtype=bool)
+            rows = np.fromiter(self._metadata, dtype=np.intp, count=len(self._metadata))
+            present[rows[rows < size]] = True
+            mask = present if mask is None else mask & present
+        return mask
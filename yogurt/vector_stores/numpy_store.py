@@ -0,0 +1,228 @@
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from yogurt.documents.base import Document
+from yogurt.embeddings.base import BaseEmbedder
+from yogurt.retrieval.base import SearchResult
+from yogurt.vector_stores.base import EmbeddingVectorStore
+from yogurt.vector_stores.metadata_index import Filters, MetadataIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_SCORE_BLOCK = 1 << 24
+"""Upper bound on the query-by-row score matrix computed at once (64 MB)."""
+
+
+def normalize_rows(vectors: Any) -> "np.ndarray":
+    """Returns `vectors` as a 2-D float32 matrix with unit-length rows."""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a vector or a matrix, got shape {matrix.shape}")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """
+    Column indices of the `k` highest scores in each row, best first. Uses
+    `argpartition`, so only the selected columns are sorted.
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(scores, n - k, axis=1)[:, n - k :]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class NumpyVectorStore(EmbeddingVectorStore):
+    """
+    An exact in-memory vector store.
+
+    Embeddings are kept as unit-length rows of one contiguous float32 matrix
+    whose capacity doubles as it fills, so appends are amortized O(1) and a
+    search is a single matrix multiply followed by `argpartition`. Scores
+    are cosine similarities. Documents are keyed by id: adding an existing
+    id replaces it, and `delete` moves the last row into the freed slot.
+
+    Queries are embedded with `embedder`; use the `*_by_vector` methods to
+    search with precomputed embeddings. The metadata index used by `filters`
+    is built on the first filtered search and kept up to date afterwards;
+    pass `metadata_fields` to index only the fields you filter on.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[BaseEmbedder] = None,
+        initial_capacity: int = 1024,
+        metadata_fields: Optional[List[str]] = None,
+    ):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for NumpyVectorStore. Install with `pip install numpy`."
+            )
+        self.embedder = embedder
+        self.initial_capacity = max(1, initial_capacity)
+        self._vectors: Optional["np.ndarray"] = None
+        self._size = 0
+        self._documents: List[Document] = []
+        self._rows: Dict[str, int] = {}
+        self.metadata_fields = metadata_fields
+        self._metadata: Optional[MetadataIndex] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    @property
+    def vectors(self) -> "np.ndarray":
+        """A read-only view of the stored, normalized embeddings."""
+        if self._vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        view = self._vectors[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def _metadata_index(self) -> MetadataIndex:
+        if self._metadata is None:
+            self._metadata = MetadataIndex(self.metadata_fields)
+            for row, document in enumerate(self._documents):
+                self._metadata.add(row, document.metadata)
+        return self._metadata
+
+    # --- Writing ---
+    def _reserve(self, extra: int, dim: int) -> None:
+        if self._vectors is None:
+            capacity = max(self.initial_capacity, extra)
+            self._vectors = np.empty((capacity, dim), dtype=np.float32)
+            return
+        if dim != self._vectors.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match the store's {self._vectors.shape[1]}"
+            )
+        needed = self._size + extra
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            grown = np.empty((capacity, dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+
+    def add_embeddings(self, documents: Sequence[Document], embeddings: Any) -> None:
+        """Adds documents with precomputed embeddings, one row per document."""
+        matrix = normalize_rows(embeddings)
+        if len(matrix) != len(documents):
+            raise ValueError(
+                f"Got {len(documents)} documents but {len(matrix)} embeddings"
+            )
+        with self._lock:
+            self._reserve(len(documents), matrix.shape[1])
+            rows = np.empty(len(documents), dtype=np.intp)
+            for i, document in enumerate(documents):
+                row = self._rows.get(document.id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._documents.append(document)
+                    self._rows[document.id] = row
+                else:
+                    self._documents[row] = document
+                if self._metadata is not None:
+                    self._metadata.add(row, document.metadata)
+                rows[i] = row
+            self._vectors[rows] = matrix
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Removes documents by id. Returns how many were found."""
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    self._vectors[row] = self._vectors[last]
+                    moved = self._documents[last]
+                    self._documents[row] = moved
+                    self._rows[moved.id] = row
+                    if self._metadata is not None:
+                        self._metadata.move(last, row)
+                elif self._metadata is not None:
+                    self._metadata.remove(row)
+                self._documents.pop()
+                self._size -= 1
+                removed += 1
+        return removed
+
+    def get(self, doc_id: str) -> Optional[Document]:
+        row = self._rows.get(doc_id)
+        return None if row is None else self._documents[row]
+
+    # --- Searching ---
+    def _search(
+        self, queries: "np.ndarray", k: int, filters: Optional[Filters] = None
+    ) -> List[List[SearchResult]]:
+        results: List[List[SearchResult]] = []
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return [[] for _ in range(len(queries))]
+            if queries.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Query dimension {queries.shape[1]} does not match "
+                    f"the store's {self._vectors.shape[1]}"
+                )
+            vectors = self._vectors[: self._size]
+            candidates = excluded = None
+            if filters:
+                mask = self._metadata_index().match(filters, self._size)
+                count = int(np.count_nonzero(mask))
+                if count == 0:
+                    return [[] for _ in range(len(queries))]
+                if count <= self._size // 2:
+                    # Copying out a few rows beats scoring every row.
+                    candidates = np.flatnonzero(mask)
+                    vectors = vectors[candidates]
+                elif count < self._size:
+                    excluded = ~mask
+            block = max(1, _SCORE_BLOCK // len(vectors))
+            for start in range(0, len(queries), block):
+                scores = queries[start : start + block] @ vectors.T
+                if excluded is not None:
+                    scores[:, excluded] = -np.inf
+                indices = top_k(scores, k)
+                best = np.take_along_axis(scores, indices, axis=1)
+                if candidates is not None:
+                    indices = candidates[indices]
+                for rows, row_scores in zip(indices.tolist(), best.tolist()):
+                    results.append(
+                        [
+                            SearchResult(document=self._documents[row], score=score)
+                            for row, score in zip(rows, row_scores)
+                            if score != -np.inf
+                        ]
+                    )
+        return results
+
+    def search_by_vector(
+        self, embedding: Any, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[SearchResult]:
+        return self._search(normalize_rows(embedding), k, filters)[0]
+
+    def batch_search_by_vector(
+        self, embeddings: Any, k: int = 4, filters: Optional[Filters] = None
+    ) -> List[List[SearchResult]]:
+        """Searches for several query embeddings with one matrix multiply."""
+        return self._search(normalize_rows(embeddings), k, filters)